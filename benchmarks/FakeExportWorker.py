@@ -0,0 +1,46 @@
+import json
+import os
+import sys
+import time
+
+srcDir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+sys.path.append(srcDir)
+from WorkerPool import EmitWorkerMessage
+
+# Stands in for FBXExportWorker.py without maya: python FakeExportWorker.py <job.json>
+# Every clip "bakes" for a time that grows with its frame count and writes a small placeholder fbx, which is enough
+# to test and time how the pool schedules clips.
+#   FAKE_WORKER_SECONDS_PER_FRAME    bake time per frame, 0.001 by default
+#   FAKE_WORKER_FAIL_CLIP            subfix of a clip to fail on, the worker then exits with 1
+
+def ExportClips(job):
+    secondsPerFrame = float(os.environ.get("FAKE_WORKER_SECONDS_PER_FRAME", "0.001"))
+    failClip = os.environ.get("FAKE_WORKER_FAIL_CLIP")
+    EmitWorkerMessage("progress", stage="start", pid=os.getpid(), time=time.time())
+    for clip in job["clips"]:
+        EmitWorkerMessage("progress", clip=clip["subfix"], stage="bake")
+        if clip["subfix"] == failClip:
+            raise Exception(f"failed to bake {clip['subfix']}")
+
+        time.sleep(secondsPerFrame * (clip["frameMax"] - clip["frameMin"] + 1))
+        with open(clip["path"], 'wb') as clipFile:
+            clipFile.write(json.dumps({"objects": job["objects"], "clip": clip}).encode("utf-8"))
+
+        EmitWorkerMessage("result", clip=clip["subfix"], path=clip["path"], bytes=os.path.getsize(clip["path"]))
+
+    EmitWorkerMessage("progress", stage="end", pid=os.getpid(), time=time.time())
+
+def Main(jobPath):
+    with open(jobPath, 'r') as jobFile:
+        job = json.load(jobFile)
+
+    try:
+        ExportClips(job)
+    except Exception as e:
+        EmitWorkerMessage("error", message=f"{e}")
+        return 1
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(Main(sys.argv[1]))
@@ -0,0 +1,1158 @@
+import ast
+import math
+import os
+import re
+import sys
+import types
+from collections import Counter
+
+# An in-memory stand-in for maya.cmds, maya.mel and the parts of the OpenMaya api the plugins use, so the tools can
+# be timed without a maya license. Only commands that exist in the vendor/mayaSDK stubs can be called on it, a typo or
+# a command maya does not have fails here the same way it would in maya.
+
+benchmarksDir = os.path.dirname(os.path.abspath(__file__))
+pluginDir = os.path.dirname(benchmarksDir)
+mayaCmdsStubDir = os.path.join(pluginDir, "vendor", "mayaSDK", "maya", "cmds")
+
+# plugin commands are not in the stubs, fbxmaya is always loaded for the exporter
+PLUGIN_COMMAND_PREFIXES = ["FBX"]
+
+def LoadStubCommandNames(stubDir = mayaCmdsStubDir):
+    commandNames = set()
+    for stubFileName in os.listdir(stubDir):
+        if not stubFileName.endswith(".py"):
+            continue
+
+        with open(os.path.join(stubDir, stubFileName), 'r') as stubFile:
+            stubTree = ast.parse(stubFile.read())
+
+        commandNames.update(node.name for node in stubTree.body if isinstance(node, ast.FunctionDef))
+
+    return commandNames
+
+class FakeMesh:
+    def __init__(self, points, faceVertCounts, faceVerts, uValues = None, vValues = None, faceUVCounts = None, faceUVIds = None):
+        self.faceShadingEngines = None
+        self.points = list(points)
+        self.faceVertCounts = list(faceVertCounts)
+        self.faceVerts = list(faceVerts)
+        self.uValues = list(uValues or [])
+        self.vValues = list(vValues or [])
+        self.faceUVCounts = list(faceUVCounts or [])
+        self.faceUVIds = list(faceUVIds or [])
+
+    def Copy(self):
+        copy = FakeMesh(self.points, self.faceVertCounts, self.faceVerts, self.uValues, self.vValues, self.faceUVCounts, self.faceUVIds)
+        copy.faceShadingEngines = list(self.faceShadingEngines) if self.faceShadingEngines else None
+        return copy
+
+    def GetFaces(self):
+        faces = []
+        faceVertStart = 0
+        for faceVertCount in self.faceVertCounts:
+            faces.append(self.faceVerts[faceVertStart:faceVertStart + faceVertCount])
+            faceVertStart += faceVertCount
+
+        return faces
+
+    def GetFaceUVs(self):
+        faceUVs = []
+        faceUVStart = 0
+        for faceUVCount in self.faceUVCounts:
+            faceUVs.append(self.faceUVIds[faceUVStart:faceUVStart + faceUVCount])
+            faceUVStart += faceUVCount
+
+        return faceUVs
+
+    def GetTriangleCount(self):
+        return sum(faceVertCount - 2 for faceVertCount in self.faceVertCounts)
+
+    def GetArea(self):
+        area = 0.0
+        for face in self.GetFaces():
+            # fan triangulation, fine for the flat convex faces the fake builds
+            origin = self.points[face[0]]
+            for i in range(1, len(face) - 1):
+                edgeA = [self.points[face[i]][axis] - origin[axis] for axis in range(3)]
+                edgeB = [self.points[face[i + 1]][axis] - origin[axis] for axis in range(3)]
+                cross = (edgeA[1] * edgeB[2] - edgeA[2] * edgeB[1], edgeA[2] * edgeB[0] - edgeA[0] * edgeB[2], edgeA[0] * edgeB[1] - edgeA[1] * edgeB[0])
+                area += math.sqrt(sum(value * value for value in cross)) / 2
+
+        return area
+
+    def KeepFaces(self, facesToKeep):
+        # drops every other face and the verts no kept face uses, the way deleting faces does in maya
+        faces = self.GetFaces()
+        faceUVs = self.GetFaceUVs()
+        vertRemap = {}
+        points = []
+        self.faceVertCounts = []
+        self.faceVerts = []
+        self.faceUVCounts = []
+        self.faceUVIds = []
+        for face in sorted(facesToKeep):
+            self.faceVertCounts.append(len(faces[face]))
+            for vert in faces[face]:
+                if vert not in vertRemap:
+                    vertRemap[vert] = len(points)
+                    points.append(self.points[vert])
+                self.faceVerts.append(vertRemap[vert])
+
+            if faceUVs:
+                self.faceUVCounts.append(len(faceUVs[face]))
+                self.faceUVIds.extend(faceUVs[face])
+
+        if self.faceShadingEngines:
+            self.faceShadingEngines = [self.faceShadingEngines[face] for face in sorted(facesToKeep)]
+        self.points = points
+
+class FakeNode:
+    def __init__(self, name, nodeType, parent = None):
+        self.name = name
+        self.type = nodeType
+        self.parent = parent
+        self.attrs = {}
+
+class FakeScene:
+    def __init__(self):
+        self.nodes = {}
+        self.meshes = {}
+        self.skins = {}
+        self.sources = {}
+        self.destinations = {}
+        self.animCurveKeys = {}
+        self.selection = []
+        self.undoChunkDepth = 0
+        self.undoChunkCommands = 0
+        self.undoChunkName = ""
+        self.undoName = ""
+        self.exports = []
+        self.fbxExportOptions = {}
+        # every frame the scene is evaluated at by a bake, the real cost of exporting animation
+        self.evaluatedFrames = 0
+        self.sceneName = ""
+        self.playbackRange = [1.0, 120.0]
+        self.cmdsCalls = Counter()
+        self.apiCalls = Counter()
+
+    def GetUniqueName(self, name):
+        if name not in self.nodes:
+            return name
+
+        baseName = name.rstrip("0123456789")
+        suffix = 1
+        while f"{baseName}{suffix}" in self.nodes:
+            suffix += 1
+
+        return f"{baseName}{suffix}"
+
+    def CreateNode(self, name, nodeType, parent = None):
+        name = self.GetUniqueName(name)
+        self.nodes[name] = FakeNode(name, nodeType, parent)
+        self.sources[name] = []
+        self.destinations[name] = []
+        return name
+
+    def CreateTransformWithShape(self, name, shapeType, shapeName = None):
+        transform = self.CreateNode(name, "transform")
+        shape = self.CreateNode(shapeName or transform + "Shape", shapeType, transform)
+        return transform, shape
+
+    def DeleteNode(self, name):
+        for child in self.GetChildren(name):
+            self.DeleteNode(child)
+
+        for source in self.sources.pop(name, []):
+            self.destinations[source] = [dest for dest in self.destinations[source] if dest != name]
+        for dest in self.destinations.pop(name, []):
+            self.sources[dest] = [source for source in self.sources[dest] if source != name]
+
+        self.nodes.pop(name, None)
+        self.meshes.pop(name, None)
+        self.skins.pop(name, None)
+        self.selection = [selected for selected in self.selection if selected != name]
+
+    def RenameNode(self, name, newName):
+        newName = self.GetUniqueName(newName)
+        node = self.nodes.pop(name)
+        node.name = newName
+        self.nodes[newName] = node
+        for other in self.nodes.values():
+            if other.parent == name:
+                other.parent = newName
+
+        self.sources[newName] = self.sources.pop(name)
+        self.destinations[newName] = self.destinations.pop(name)
+        for connections in (self.sources, self.destinations):
+            for key, names in connections.items():
+                connections[key] = [newName if other == name else other for other in names]
+
+        for store in (self.meshes, self.skins):
+            if name in store:
+                store[newName] = store.pop(name)
+
+        return newName
+
+    def Connect(self, source, dest):
+        self.destinations[source].append(dest)
+        self.sources[dest].append(source)
+
+    def GetChildren(self, name):
+        return [node.name for node in self.nodes.values() if node.parent == name]
+
+    def GetDescendants(self, name):
+        descendants = []
+        for child in self.GetChildren(name):
+            descendants.append(child)
+            descendants.extend(self.GetDescendants(child))
+
+        return descendants
+
+    def GetShape(self, name):
+        if name in self.meshes:
+            return name
+
+        for child in self.GetChildren(name):
+            if child in self.meshes:
+                return child
+
+        return None
+
+    def GetTranslate(self, name):
+        return list(self.nodes[name].attrs.get("t", [0.0, 0.0, 0.0]))
+
+def BuildGridMesh(scene: FakeScene, name, vertCount, length = 100.0):
+    # a flat grid of quads along x, one uv per vertex
+    columnCount = max(2, int(math.ceil(math.sqrt(vertCount))))
+    rowCount = max(2, int(math.ceil(vertCount / columnCount)))
+    points = [(length * column / (columnCount - 1), length * row / (rowCount - 1), 0.0) for row in range(rowCount) for column in range(columnCount)]
+
+    faceVerts = []
+    for row in range(rowCount - 1):
+        for column in range(columnCount - 1):
+            corner = row * columnCount + column
+            faceVerts.extend([corner, corner + 1, corner + columnCount + 1, corner + columnCount])
+
+    faceCount = len(faceVerts) // 4
+    uValues = [point[0] / length for point in points]
+    vValues = [point[1] / length for point in points]
+    transform, shape = scene.CreateTransformWithShape(name, "mesh")
+    scene.meshes[shape] = FakeMesh(points, [4] * faceCount, faceVerts, uValues, vValues, [4] * faceCount, faceVerts)
+    return transform, shape
+
+def BuildJointChain(scene: FakeScene, prefix, jointCount, length = 100.0, parent = None):
+    joints = []
+    for i in range(jointCount):
+        joint = scene.CreateNode(f"{prefix}_{i}", "joint", joints[-1] if joints else parent)
+        scene.nodes[joint].attrs["t"] = [length * i / max(1, jointCount - 1), 0.0, 0.0]
+        if joints:
+            scene.Connect(joints[-1], joint) # parent scale to child inverseScale
+        joints.append(joint)
+
+    return joints
+
+def BuildLimbChain(scene: FakeScene, prefix, parent = None, jointNames = ("shoulder", "elbow", "wrist")):
+    joints = BuildJointChain(scene, prefix, len(jointNames), parent=parent)
+    return [scene.RenameNode(joint, f"{prefix}_{jointName}") for joint, jointName in zip(joints, jointNames)]
+
+def BuildSkinCluster(scene: FakeScene, joints, shape, name = "skinCluster1"):
+    # each vertex is split between the two joints closest to it along x, like a smooth bind of a straight chain
+    skin = scene.CreateNode(name, "skinCluster")
+    tweak = scene.CreateNode("tweak1", "tweak")
+    groupParts = scene.CreateNode("groupParts1", "groupParts")
+    bindPose = scene.CreateNode("bindPose1", "dagPose")
+    scene.Connect(tweak, groupParts)
+    scene.Connect(groupParts, skin)
+    for joint in joints:
+        scene.Connect(joint, skin)
+        scene.Connect(joint, bindPose)
+    scene.Connect(bindPose, skin)
+    scene.Connect(skin, shape)
+
+    jointXs = [scene.GetTranslate(joint)[0] for joint in joints]
+    spacing = (jointXs[-1] - jointXs[0]) / max(1, len(joints) - 1) or 1.0
+    weights = []
+    for point in scene.meshes[shape].points:
+        row = [0.0] * len(joints)
+        position = min(max((point[0] - jointXs[0]) / spacing, 0.0), len(joints) - 1)
+        lower = min(int(position), len(joints) - 1)
+        upper = min(lower + 1, len(joints) - 1)
+        row[lower] += 1.0 - (position - lower)
+        row[upper] += position - lower
+        weights.extend(row)
+
+    scene.skins[skin] = {"shape": shape, "influences": list(joints), "weights": weights}
+    return skin
+
+def BuildSkinnedMesh(scene: FakeScene, name, vertCount, jointCount):
+    joints = BuildJointChain(scene, name + "_jnt", jointCount)
+    transform, shape = BuildGridMesh(scene, name, vertCount)
+    skin = BuildSkinCluster(scene, joints, shape)
+    return transform, joints, skin
+
+def BuildAnimCurves(scene: FakeScene, joints, frameCount, attrs = ("rotateX", "rotateY", "rotateZ")):
+    for joint in joints:
+        for attr in attrs:
+            curve = scene.CreateNode(f"{joint}_{attr}", "animCurveTA")
+            scene.Connect(curve, joint)
+            scene.animCurveKeys[curve] = [(float(frame), math.sin(frame * 0.1)) for frame in range(1, frameCount + 1)]
+
+def SplitComponent(componentName):
+    # "body.vtx[2:5]" -> ("body", "vtx", 2, 5), "[*]" comes back as None, None
+    obj, component = componentName.split(".", 1)
+    componentType, indices = component[:-1].split("[")
+    if indices == "*":
+        return obj, componentType, None, None
+
+    if ":" in indices:
+        start, end = indices.split(":")
+        return obj, componentType, int(start), int(end)
+
+    return obj, componentType, int(indices), int(indices)
+
+def Flatten(names):
+    if isinstance(names, str):
+        names = [names]
+
+    flattened = []
+    for name in names:
+        if "[" not in name:
+            flattened.append(name)
+            continue
+
+        obj, componentType, start, end = SplitComponent(name)
+        if start is None:
+            mesh = _scene.meshes[_scene.GetShape(obj)]
+            start, end = 0, (len(mesh.points) if componentType == "vtx" else len(mesh.faceVertCounts)) - 1
+
+        flattened.extend(f"{obj}.{componentType}[{index}]" for index in range(start, end + 1))
+
+    return flattened
+
+def GetFlagValue(kwargs, *flagNames, default = None):
+    for flagName in flagNames:
+        if flagName in kwargs:
+            return kwargs[flagName]
+
+    return default
+
+class FakeCmds:
+    def __init__(self):
+        self.commandNames = LoadStubCommandNames()
+
+    def __getattr__(self, commandName):
+        # everything the fake does not model is a counted no-op, as long as maya has the command
+        if commandName.startswith("_"):
+            raise AttributeError(commandName)
+
+        if commandName not in self.commandNames and not any(commandName.startswith(prefix) for prefix in PLUGIN_COMMAND_PREFIXES):
+            raise AttributeError(f"maya.cmds has no command {commandName}")
+
+        def Command(*args, **kwargs):
+            CountCommand(commandName)
+            return None
+
+        return Command
+
+    def Count(self, commandName):
+        CountCommand(commandName)
+
+    def about(self, **kwargs):
+        self.Count("about")
+        return True if GetFlagValue(kwargs, "batch", "b") else ""
+
+    def ls(self, *args, **kwargs):
+        self.Count("ls")
+        if GetFlagValue(kwargs, "sl", "selection"):
+            names = list(_scene.selection)
+        elif args:
+            names = args[0] if isinstance(args[0], (list, tuple, set)) else list(args)
+            names = [name for name in names if name.split(".")[0] in _scene.nodes]
+        else:
+            names = list(_scene.nodes)
+
+        if GetFlagValue(kwargs, "fl", "flatten"):
+            names = Flatten(names)
+
+        nodeType = GetFlagValue(kwargs, "type", "typ")
+        if nodeType:
+            names = [name for name in names if _scene.nodes[name].type == nodeType or _scene.nodes[name].type.startswith(nodeType)]
+
+        if GetFlagValue(kwargs, "showType", "st"):
+            return [item for name in names for item in (name, _scene.nodes[name.split(".")[0]].type)]
+
+        return list(names)
+
+    def objExists(self, name):
+        self.Count("objExists")
+        return name.split(".")[0] in _scene.nodes
+
+    def objectType(self, name, **kwargs):
+        self.Count("objectType")
+        return _scene.nodes[name].type
+
+    def nodeType(self, name, **kwargs):
+        self.Count("nodeType")
+        return _scene.nodes[name].type
+
+    def listRelatives(self, names, **kwargs):
+        self.Count("listRelatives")
+        if isinstance(names, str):
+            names = [names]
+
+        relatives = []
+        for name in names:
+            if GetFlagValue(kwargs, "p", "parent"):
+                parent = _scene.nodes[name].parent
+                relatives.extend([parent] if parent else [])
+            elif GetFlagValue(kwargs, "ad", "allDescendents"):
+                relatives.extend(_scene.GetDescendants(name))
+            else:
+                relatives.extend(_scene.GetChildren(name))
+
+        if GetFlagValue(kwargs, "s", "shapes"):
+            relatives = [relative for relative in relatives if _scene.nodes[relative].type in ("mesh", "nurbsCurve", "locator")]
+
+        nodeType = GetFlagValue(kwargs, "type", "typ")
+        if nodeType:
+            relatives = [relative for relative in relatives if _scene.nodes[relative].type == nodeType]
+
+        return relatives or None
+
+    def listConnections(self, names, **kwargs):
+        self.Count("listConnections")
+        if isinstance(names, str):
+            names = [names]
+
+        connected = []
+        for name in names:
+            name = name.split(".")[0]
+            if GetFlagValue(kwargs, "s", "source", default=True):
+                connected.extend(_scene.sources.get(name, []))
+            if GetFlagValue(kwargs, "d", "destination", default=True):
+                connected.extend(_scene.destinations.get(name, []))
+
+        nodeType = GetFlagValue(kwargs, "type", "t")
+        if nodeType:
+            connected = [node for node in connected if _scene.nodes[node].type == nodeType]
+
+        return connected or None
+
+    def sets(self, *args, **kwargs):
+        self.Count("sets")
+        shadingEngine = GetFlagValue(kwargs, "forceElement", "fe")
+        if not shadingEngine:
+            return None
+
+        # only face assignment is modeled, enough to check materials survive on the proxies
+        members = args[0] if args and isinstance(args[0], list) else list(args)
+        for member in members:
+            if "." not in member:
+                shape = _scene.GetShape(member)
+                if shape:
+                    _scene.meshes[shape].faceShadingEngines = [shadingEngine] * len(_scene.meshes[shape].faceVertCounts)
+                continue
+
+            obj, componentType, start, end = SplitComponent(member)
+            mesh = _scene.meshes[_scene.GetShape(obj)]
+            if not mesh.faceShadingEngines:
+                mesh.faceShadingEngines = ["initialShadingGroup"] * len(mesh.faceVertCounts)
+            for face in range(start, end + 1):
+                mesh.faceShadingEngines[face] = shadingEngine
+
+    def select(self, *args, **kwargs):
+        self.Count("select")
+        if GetFlagValue(kwargs, "cl", "clear"):
+            _scene.selection = []
+            return
+
+        names = args[0] if args and isinstance(args[0], (list, tuple, set)) else list(args)
+        _scene.selection = list(names)
+
+    def rename(self, name, newName, **kwargs):
+        self.Count("rename")
+        return _scene.RenameNode(name.lstrip("|"), newName)
+
+    def duplicate(self, name, **kwargs):
+        self.Count("duplicate")
+        transform = _scene.CreateNode(GetFlagValue(kwargs, "n", "name", default=name), "transform")
+        _scene.nodes[transform].attrs = dict(_scene.nodes[name].attrs)
+        shape = _scene.GetShape(name)
+        if shape:
+            dupShape = _scene.CreateNode(transform + "Shape", "mesh", transform)
+            _scene.meshes[dupShape] = _scene.meshes[shape].Copy()
+
+        return [transform]
+
+    def delete(self, *args, **kwargs):
+        self.Count("delete")
+        names = args[0] if args and isinstance(args[0], (list, tuple, set)) else list(args)
+        if GetFlagValue(kwargs, "constraints", "cn"):
+            return
+
+        facesToDelete = {}
+        for name in names:
+            if "[" in name:
+                obj, componentType, start, end = SplitComponent(name)
+                facesToDelete.setdefault(obj, set()).update(range(start, end + 1))
+            elif name in _scene.nodes:
+                _scene.DeleteNode(name)
+
+        for obj, faces in facesToDelete.items():
+            mesh = _scene.meshes[_scene.GetShape(obj)]
+            mesh.KeepFaces(set(range(len(mesh.faceVertCounts))) - faces)
+
+    def polyEvaluate(self, name, **kwargs):
+        self.Count("polyEvaluate")
+        mesh = _scene.meshes[_scene.GetShape(name)]
+        if GetFlagValue(kwargs, "f", "face"):
+            return len(mesh.faceVertCounts)
+
+        if GetFlagValue(kwargs, "t", "triangle"):
+            return mesh.GetTriangleCount()
+
+        if GetFlagValue(kwargs, "a", "area", "wa", "worldArea"):
+            return mesh.GetArea()
+
+        return len(mesh.points)
+
+    def polyReduce(self, name, **kwargs):
+        # keeps an even spread of faces, close enough in size to what a real reduction leaves
+        self.Count("polyReduce")
+        mesh = _scene.meshes[_scene.GetShape(name)]
+        faceCount = len(mesh.faceVertCounts)
+        if GetFlagValue(kwargs, "trm", "termination") == 2:
+            keepRatio = GetFlagValue(kwargs, "tct", "triangleCount") / max(1, mesh.GetTriangleCount())
+        else:
+            keepRatio = 1 - GetFlagValue(kwargs, "p", "percentage", default=50) / 100
+
+        keepCount = min(faceCount, max(1, int(faceCount * keepRatio)))
+        mesh.KeepFaces({int(i * faceCount / keepCount) for i in range(keepCount)})
+
+    def exactWorldBoundingBox(self, name, **kwargs):
+        self.Count("exactWorldBoundingBox")
+        points = _scene.meshes[_scene.GetShape(name)].points
+        return [min(point[axis] for point in points) for axis in range(3)] + [max(point[axis] for point in points) for axis in range(3)]
+
+    def polyCube(self, **kwargs):
+        self.Count("polyCube")
+        width, height, depth = (GetFlagValue(kwargs, flag, default=1.0) for flag in ("w", "h", "d"))
+        transform, shape = _scene.CreateTransformWithShape(GetFlagValue(kwargs, "n", "name", default="pCube1"), "mesh")
+        points = [(x * width / 2, y * height / 2, z * depth / 2) for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)]
+        faceVerts = [0, 1, 3, 2, 4, 6, 7, 5, 0, 4, 5, 1, 2, 3, 7, 6, 0, 2, 6, 4, 1, 5, 7, 3]
+        _scene.meshes[shape] = FakeMesh(points, [4] * 6, faceVerts)
+        return [transform, "polyCube1"]
+
+    def polyListComponentConversion(self, components, **kwargs):
+        self.Count("polyListComponentConversion")
+        vertsByObj = {}
+        for vert in Flatten(components):
+            obj, componentType, index, _ = SplitComponent(vert)
+            vertsByObj.setdefault(obj, set()).add(index)
+
+        faces = []
+        for obj, verts in vertsByObj.items():
+            mesh = _scene.meshes[_scene.GetShape(obj)]
+            for faceId, faceVerts in enumerate(mesh.GetFaces()):
+                if not verts.isdisjoint(faceVerts):
+                    faces.append(f"{obj}.f[{faceId}]")
+
+        return faces
+
+    def skinPercent(self, skin, vert, **kwargs):
+        self.Count("skinPercent")
+        skinData = _scene.skins[skin]
+        if "t" in kwargs or "transform" in kwargs:
+            return list(skinData["influences"])
+
+        influenceCount = len(skinData["influences"])
+        vertId = SplitComponent(vert)[2]
+        return skinData["weights"][vertId * influenceCount:(vertId + 1) * influenceCount]
+
+    def skinCluster(self, *args, **kwargs):
+        self.Count("skinCluster")
+        objects = []
+        for arg in args:
+            objects.extend(arg if isinstance(arg, (list, tuple)) else [arg])
+
+        influences, geometry = objects[:-1], objects[-1]
+        shape = _scene.GetShape(geometry)
+        skin = _scene.CreateNode(GetFlagValue(kwargs, "n", "name", default="skinCluster1"), "skinCluster")
+        for influence in influences:
+            _scene.Connect(influence, skin)
+        _scene.Connect(skin, shape)
+
+        weights = [0.0] * (len(_scene.meshes[shape].points) * len(influences))
+        weights[::len(influences)] = [1.0] * len(_scene.meshes[shape].points)
+        _scene.skins[skin] = {"shape": shape, "influences": list(influences), "weights": weights}
+        return [skin]
+
+    def xform(self, name, **kwargs):
+        self.Count("xform")
+        if not GetFlagValue(kwargs, "q", "query"):
+            translate = GetFlagValue(kwargs, "t", "translation")
+            if translate:
+                _scene.nodes[name].attrs["t"] = list(translate)
+            matrix = GetFlagValue(kwargs, "m", "matrix")
+            if matrix:
+                # only the rotation is kept apart, the translate still lives in t
+                _scene.nodes[name].attrs["m"] = list(matrix)
+                _scene.nodes[name].attrs["t"] = list(matrix[12:15])
+            return None
+
+        if GetFlagValue(kwargs, "m", "matrix"):
+            matrix = list(_scene.nodes[name].attrs.get("m", [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0]))
+            matrix[12:15] = _scene.GetTranslate(name)
+            return matrix
+
+        return _scene.GetTranslate(name)
+
+    def listAttr(self, name, **kwargs):
+        # the fake keeps only the attributes something set, and never connects single attributes
+        self.Count("listAttr")
+        return [attrName for attrName, value in _scene.nodes[name].attrs.items() if isinstance(value, (bool, int, float))]
+
+    def getAttr(self, attr, **kwargs):
+        self.Count("getAttr")
+        name, attrName = attr.split(".", 1)
+        if attrName == "poleVector":
+            return [(0.0, 0.0, 1.0)]
+
+        if attrName.startswith("bindPreMatrix[") and attrName not in _scene.nodes[name].attrs:
+            # the inverse of where the influence was when it got bound, joints are only ever translated here
+            influence = _scene.skins[name]["influences"][int(attrName[len("bindPreMatrix["):-1])]
+            matrix = [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0]
+            matrix[12:15] = [-value for value in _scene.GetTranslate(influence)]
+            return matrix
+
+        return _scene.nodes[name].attrs.get(attrName, 0.0)
+
+    def setAttr(self, attr, *values, **kwargs):
+        self.Count("setAttr")
+        name, attrName = attr.split(".", 1)
+        attrName = "t" if attrName in ("t", "translate") else attrName
+        _scene.nodes[name].attrs[attrName] = list(values) if len(values) > 1 else values[0]
+
+    def addAttr(self, name, **kwargs):
+        self.Count("addAttr")
+        attrName = GetFlagValue(kwargs, "ln", "longName")
+        _scene.nodes[name].attrs[attrName] = GetFlagValue(kwargs, "dv", "defaultValue", default=0.0)
+
+    def connectAttr(self, source, dest, **kwargs):
+        self.Count("connectAttr")
+        _scene.Connect(source.split(".")[0], dest.split(".")[0])
+
+    def createNode(self, nodeType, **kwargs):
+        self.Count("createNode")
+        return _scene.CreateNode(GetFlagValue(kwargs, "n", "name", default=nodeType + "1"), nodeType, GetFlagValue(kwargs, "p", "parent"))
+
+    def group(self, *args, **kwargs):
+        self.Count("group")
+        names = args[0] if args and isinstance(args[0], (list, tuple)) else list(args)
+        group = _scene.CreateNode(GetFlagValue(kwargs, "n", "name", default="group1"), "transform")
+        for name in names:
+            _scene.nodes[group].parent = _scene.nodes[name].parent
+            _scene.nodes[name].parent = group
+
+        return group
+
+    def parent(self, child, parent = None, **kwargs):
+        self.Count("parent")
+        _scene.nodes[child].parent = parent
+        return [child]
+
+    def matchTransform(self, name, target, **kwargs):
+        self.Count("matchTransform")
+        _scene.nodes[name].attrs["t"] = _scene.GetTranslate(target)
+
+    def spaceLocator(self, **kwargs):
+        self.Count("spaceLocator")
+        transform, shape = _scene.CreateTransformWithShape(GetFlagValue(kwargs, "n", "name", default="locator1"), "locator")
+        return [transform]
+
+    def circle(self, **kwargs):
+        self.Count("circle")
+        transform, shape = _scene.CreateTransformWithShape(GetFlagValue(kwargs, "n", "name", default="nurbsCircle1"), "nurbsCurve")
+        return [transform, _scene.CreateNode("makeNurbCircle1", "makeNurbCircle")]
+
+    def curve(self, **kwargs):
+        self.Count("curve")
+        transform, shape = _scene.CreateTransformWithShape(GetFlagValue(kwargs, "n", "name", default="curve1"), "nurbsCurve")
+        return transform
+
+    def joint(self, **kwargs):
+        self.Count("joint")
+        return _scene.CreateNode(GetFlagValue(kwargs, "n", "name", default="joint1"), "joint")
+
+    def CreateConstraint(self, commandName, constraintType, args, kwargs):
+        self.Count(commandName)
+        target, constrained = args[0], args[-1]
+        constraint = _scene.CreateNode(GetFlagValue(kwargs, "n", "name", default=f"{constrained}_{constraintType}1"), constraintType, constrained)
+        _scene.Connect(target, constraint)
+        _scene.Connect(constraint, constrained)
+        return [constraint]
+
+    def orientConstraint(self, *args, **kwargs):
+        return self.CreateConstraint("orientConstraint", "orientConstraint", args, kwargs)
+
+    def parentConstraint(self, *args, **kwargs):
+        return self.CreateConstraint("parentConstraint", "parentConstraint", args, kwargs)
+
+    def pointConstraint(self, *args, **kwargs):
+        return self.CreateConstraint("pointConstraint", "pointConstraint", args, kwargs)
+
+    def poleVectorConstraint(self, *args, **kwargs):
+        return self.CreateConstraint("poleVectorConstraint", "poleVectorConstraint", args, kwargs)
+
+    def ikHandle(self, **kwargs):
+        self.Count("ikHandle")
+        handle = _scene.CreateNode(GetFlagValue(kwargs, "n", "name", default="ikHandle1"), "ikHandle")
+        effector = _scene.CreateNode("effector1", "ikEffector", GetFlagValue(kwargs, "ee", "endEffector"))
+        _scene.Connect(GetFlagValue(kwargs, "sj", "startJoint"), handle)
+        _scene.Connect(effector, handle)
+        return [handle, effector]
+
+    def expression(self, **kwargs):
+        self.Count("expression")
+        return _scene.CreateNode(GetFlagValue(kwargs, "n", "name", default="expression1"), "expression")
+
+    def playbackOptions(self, **kwargs):
+        self.Count("playbackOptions")
+        if GetFlagValue(kwargs, "q", "query"):
+            return _scene.playbackRange[1] if GetFlagValue(kwargs, "max", "maxTime") else _scene.playbackRange[0]
+
+        _scene.playbackRange = [GetFlagValue(kwargs, "min", "minTime", default=_scene.playbackRange[0]),
+                                GetFlagValue(kwargs, "max", "maxTime", default=_scene.playbackRange[1])]
+
+    def undoInfo(self, **kwargs):
+        self.Count("undoInfo")
+        if GetFlagValue(kwargs, "q", "query"):
+            return _scene.undoName if GetFlagValue(kwargs, "un", "undoName") else True
+
+        if kwargs.get("openChunk"):
+            _scene.undoChunkDepth += 1
+            if _scene.undoChunkDepth == 1:
+                _scene.undoChunkCommands = 0
+                _scene.undoChunkName = GetFlagValue(kwargs, "cn", "chunkName", default="")
+        elif kwargs.get("closeChunk"):
+            _scene.undoChunkDepth -= 1
+            # a chunk nothing ran in never makes it onto the undo queue
+            if _scene.undoChunkDepth == 0 and _scene.undoChunkCommands:
+                _scene.undoName = _scene.undoChunkName
+
+    def bakeResults(self, *args, **kwargs):
+        self.Count("bakeResults")
+        startFrame, endFrame = GetFlagValue(kwargs, "t", "time")
+        _scene.evaluatedFrames += int(endFrame - startFrame + 1)
+
+    def keyframe(self, curve, **kwargs):
+        self.Count("keyframe")
+        keys = _scene.animCurveKeys.get(curve, [])
+        if GetFlagValue(kwargs, "tc", "timeChange"):
+            return [time for time, value in keys]
+
+        return [value for time, value in keys]
+
+    def file(self, *args, **kwargs):
+        self.Count("file")
+        if GetFlagValue(kwargs, "q", "query"):
+            return _scene.sceneName
+
+        if args and GetFlagValue(kwargs, "exportAll", "ea"):
+            WriteFakeFile(args[0], len(_scene.nodes))
+
+    def FBXResetExport(self, *args):
+        self.Count("FBXResetExport")
+        _scene.fbxExportOptions = {}
+
+    def FBXExportBakeComplexAnimation(self, *args):
+        self.Count("FBXExportBakeComplexAnimation")
+        _scene.fbxExportOptions["bakeComplex"] = args[-1]
+
+    def FBXExportBakeComplexStart(self, *args):
+        self.Count("FBXExportBakeComplexStart")
+        _scene.fbxExportOptions["bakeStart"] = args[-1]
+
+    def FBXExportBakeComplexEnd(self, *args):
+        self.Count("FBXExportBakeComplexEnd")
+        _scene.fbxExportOptions["bakeEnd"] = args[-1]
+
+    def FBXExportSplitAnimationIntoTakes(self, *args):
+        self.Count("FBXExportSplitAnimationIntoTakes")
+        if args[0] == "-c":
+            _scene.fbxExportOptions.pop("takes", None)
+        else:
+            _scene.fbxExportOptions.setdefault("takes", []).append((args[1], args[2], args[3]))
+
+    def FBXExport(self, *args):
+        self.Count("FBXExport")
+        path = args[list(args).index("-f") + 1]
+        options = _scene.fbxExportOptions
+        frameRange = (options["bakeStart"], options["bakeEnd"]) if options.get("bakeComplex") else _scene.playbackRange
+        if options.get("bakeComplex"):
+            _scene.evaluatedFrames += int(frameRange[1] - frameRange[0] + 1)
+        if options.get("takes"):
+            # a take only copies the keys already on the curves within its range, nothing is evaluated
+            frameRange = options["takes"][-1][1:]
+
+        _scene.exports.append({"path": path, "selection": list(_scene.selection), "undoChunkDepth": _scene.undoChunkDepth,
+                               "bakeComplex": bool(options.get("bakeComplex")), "takes": list(options.get("takes", [])), "frameRange": tuple(frameRange)})
+        WriteFakeFile(path, len(_scene.selection) * int(frameRange[1] - frameRange[0] + 1))
+
+def WriteFakeFile(path, itemCount):
+    # a small file that grows with what was exported, enough for the size bookkeeping in the tools
+    with open(path, 'wb') as fakeFile:
+        fakeFile.write(b"\0" * (64 * max(1, itemCount)))
+
+class FakeMel:
+    def eval(self, command):
+        CountCommand("mel.eval")
+        # curve -n <name> is the one mel command the plugins build nodes with
+        match = re.match(r"\s*curve\s.*?-n\s+(\S+)", command)
+        if match:
+            transform, shape = _scene.CreateTransformWithShape(match.group(1), "nurbsCurve")
+            return transform
+
+###############################################
+#                 OpenMaya                    #
+###############################################
+
+def CountApiCall(callName):
+    _scene.apiCalls[callName] += 1
+
+commandCallbacks = {}
+
+def CountCommand(commandName):
+    _scene.cmdsCalls[commandName] += 1
+    if _scene.undoChunkDepth and commandName != "undoInfo":
+        _scene.undoChunkCommands += 1
+    for callback, clientData in list(commandCallbacks.values()):
+        callback(commandName, clientData)
+
+class MCommandMessage:
+    @staticmethod
+    def addCommandCallback(callback, clientData = None):
+        callbackId = max(commandCallbacks, default=0) + 1
+        commandCallbacks[callbackId] = (callback, clientData)
+        return callbackId
+
+class MMessage:
+    @staticmethod
+    def removeCallback(callbackId):
+        commandCallbacks.pop(callbackId, None)
+
+class MIntArray(list):
+    pass
+
+class MDoubleArray(list):
+    pass
+
+class MFloatArray(list):
+    pass
+
+class MPoint:
+    def __init__(self, x = 0.0, y = 0.0, z = 0.0, w = 1.0):
+        if isinstance(x, (tuple, list, MPoint)):
+            x, y, z = x[0], x[1], x[2]
+        self.x = x
+        self.y = y
+        self.z = z
+        self.w = w
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.z, self.w)[index]
+
+    def __len__(self):
+        return 4
+
+    def __mul__(self, matrix):
+        # row vector times matrix, the way maya moves points
+        values = [sum(self[row] * matrix[row * 4 + column] for row in range(4)) for column in range(4)]
+        return MPoint(values[0] / values[3], values[1] / values[3], values[2] / values[3])
+
+class MMatrix:
+    def __init__(self, values = None):
+        self.values = [float(value) for value in values] if values is not None else [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0]
+
+    def __getitem__(self, index):
+        return self.values[index]
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __len__(self):
+        return 16
+
+    def __mul__(self, other):
+        return MMatrix([sum(self[row * 4 + i] * other[i * 4 + column] for i in range(4)) for row in range(4) for column in range(4)])
+
+    def inverse(self):
+        # gauss jordan, good enough for the transform matrices the tests build
+        rows = [self.values[row * 4:row * 4 + 4] + [1.0 if column == row else 0.0 for column in range(4)] for row in range(4)]
+        for column in range(4):
+            pivot = max(range(column, 4), key=lambda row: abs(rows[row][column]))
+            rows[column], rows[pivot] = rows[pivot], rows[column]
+            pivotValue = rows[column][column]
+            rows[column] = [value / pivotValue for value in rows[column]]
+            for row in range(4):
+                if row != column:
+                    factor = rows[row][column]
+                    rows[row] = [value - factor * pivotRowValue for value, pivotRowValue in zip(rows[row], rows[column])]
+        return MMatrix([value for row in rows for value in row[4:]])
+
+class MSpace:
+    kWorld = 4
+
+class MFn:
+    kMeshVertComponent = 554
+
+class MObject:
+    def __init__(self, name = None):
+        self.name = name
+
+class MDagPath:
+    def __init__(self, name = None):
+        self.name = name
+
+    def extendToShape(self):
+        CountApiCall("MDagPath.extendToShape")
+        self.name = _scene.GetShape(self.name) or self.name
+        return self
+
+    def fullPathName(self):
+        return self.name
+
+    def partialPathName(self):
+        return self.name
+
+    def instanceNumber(self):
+        return 0
+
+    def node(self):
+        return MObject(self.name)
+
+    @staticmethod
+    def getAPathTo(obj):
+        return MDagPath(obj.name)
+
+class MSelectionList:
+    def __init__(self):
+        self.names = []
+
+    def add(self, name):
+        CountApiCall("MSelectionList.add")
+        self.names.append(name)
+        return self
+
+    def getDependNode(self, index):
+        return MObject(self.names[index])
+
+    def getDagPath(self, index):
+        return MDagPath(self.names[index])
+
+class MFnSingleIndexedComponent:
+    def create(self, componentType):
+        return MObject()
+
+    def setCompleteData(self, count):
+        self.count = count
+
+class MFnDependencyNode:
+    def __init__(self, obj = None):
+        self.nodeName = obj.name if obj else None
+
+    def name(self):
+        return self.nodeName
+
+class MFnDagNode:
+    def __init__(self, obj = None):
+        self.name = obj.name if obj else None
+
+    def fullPathName(self):
+        return self.name
+
+class MFnMesh:
+    def __init__(self, path = None):
+        self.shape = _scene.GetShape(path.name) if path is not None else None
+
+    @property
+    def mesh(self) -> FakeMesh:
+        return _scene.meshes[self.shape]
+
+    @property
+    def numVertices(self):
+        return len(self.mesh.points)
+
+    def getVertices(self):
+        CountApiCall("MFnMesh.getVertices")
+        return MIntArray(self.mesh.faceVertCounts), MIntArray(self.mesh.faceVerts)
+
+    def getPoints(self, space = None):
+        CountApiCall("MFnMesh.getPoints")
+        return [MPoint(*point) for point in self.mesh.points]
+
+    def getUVs(self):
+        CountApiCall("MFnMesh.getUVs")
+        return MFloatArray(self.mesh.uValues), MFloatArray(self.mesh.vValues)
+
+    def getAssignedUVs(self):
+        CountApiCall("MFnMesh.getAssignedUVs")
+        return MIntArray(self.mesh.faceUVCounts), MIntArray(self.mesh.faceUVIds)
+
+    def getConnectedShaders(self, instanceNumber):
+        # a mesh without per face shading engines is on initialShadingGroup as a whole
+        CountApiCall("MFnMesh.getConnectedShaders")
+        faceShadingEngines = self.mesh.faceShadingEngines or ["initialShadingGroup"] * len(self.mesh.faceVertCounts)
+        shadingEngines = list(dict.fromkeys(faceShadingEngines))
+        return [MObject(shadingEngine) for shadingEngine in shadingEngines], MIntArray(shadingEngines.index(shadingEngine) for shadingEngine in faceShadingEngines)
+
+    def create(self, points, faceVertCounts, faceVerts, uValues = None, vValues = None):
+        CountApiCall("MFnMesh.create")
+        transform, self.shape = _scene.CreateTransformWithShape("polySurface1", "mesh", "polySurfaceShape1")
+        _scene.meshes[self.shape] = FakeMesh([(point[0], point[1], point[2]) for point in points], faceVertCounts, faceVerts, uValues, vValues)
+        return MObject(transform)
+
+    def assignUVs(self, faceUVCounts, faceUVIds):
+        CountApiCall("MFnMesh.assignUVs")
+        self.mesh.faceUVCounts = list(faceUVCounts)
+        self.mesh.faceUVIds = list(faceUVIds)
+
+class MFnSkinCluster:
+    def __init__(self, obj):
+        self.skin = obj.name
+
+    def influenceObjects(self):
+        CountApiCall("MFnSkinCluster.influenceObjects")
+        return [MDagPath(influence) for influence in _scene.skins[self.skin]["influences"]]
+
+    def indexForInfluenceObject(self, path):
+        return _scene.skins[self.skin]["influences"].index(path.name)
+
+    def getWeights(self, path, components):
+        CountApiCall("MFnSkinCluster.getWeights")
+        skinData = _scene.skins[self.skin]
+        return MDoubleArray(skinData["weights"]), len(skinData["influences"])
+
+    def setWeights(self, path, components, influenceIndices, weights, normalize = True, returnOldWeights = False):
+        CountApiCall("MFnSkinCluster.setWeights")
+        skinData = _scene.skins[self.skin]
+        influenceCount = len(skinData["influences"])
+        vertCount = len(weights) // max(1, len(influenceIndices))
+        for vertId in range(vertCount):
+            for i, influenceIndex in enumerate(influenceIndices):
+                skinData["weights"][vertId * influenceCount + influenceIndex] = weights[vertId * len(influenceIndices) + i]
+
+class MFnGeometryFilter:
+    # the fake deformers edit their shape in place, so the input shape is the output shape
+    def __init__(self, obj):
+        self.deformer = obj.name
+
+    def indexForOutputShape(self, shape):
+        return 0
+
+    def inputShapeAtIndex(self, index):
+        CountApiCall("MFnGeometryFilter.inputShapeAtIndex")
+        return MObject(_scene.skins[self.deformer]["shape"])
+
+class MVector:
+    def __init__(self, x = 0.0, y = 0.0, z = 0.0):
+        self.x = x
+        self.y = y
+        self.z = z
+
+    def __add__(self, other):
+        return MVector(self.x + other.x, self.y + other.y, self.z + other.z)
+
+    def __sub__(self, other):
+        return MVector(self.x - other.x, self.y - other.y, self.z - other.z)
+
+    def __mul__(self, scale):
+        return MVector(self.x * scale, self.y * scale, self.z * scale)
+
+    def __truediv__(self, scale):
+        return MVector(self.x / scale, self.y / scale, self.z / scale)
+
+    def length(self):
+        return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+
+    def normalize(self):
+        length = self.length() or 1.0
+        self.x, self.y, self.z = self.x / length, self.y / length, self.z / length
+        return self
+
+###############################################
+#                 Install                     #
+###############################################
+
+class _StubMeta(type):
+    def __getattr__(cls, name):
+        return _Stub
+
+class _Stub(metaclass=_StubMeta):
+    # stands in for any qt class, the benchmarks never show a window
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name):
+        return _Stub
+
+    def __call__(self, *args, **kwargs):
+        return _Stub()
+
+class _StubModule(types.ModuleType):
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        return _Stub
+
+_scene = FakeScene()
+
+def GetScene() -> FakeScene:
+    return _scene
+
+def SetScene(scene: FakeScene):
+    global _scene
+    _scene = scene
+    return scene
+
+def NewScene() -> FakeScene:
+    return SetScene(FakeScene())
+
+def MakeModule(name, attrs = None, moduleType = types.ModuleType):
+    module = moduleType(name)
+    module.__dict__.update(attrs or {})
+    module.__path__ = []
+    return module
+
+def Install():
+    # puts the fakes in sys.modules, the plugin sources then import them as if they were running in maya
+    srcDir = os.path.join(pluginDir, "src")
+    unrealSDKDir = os.path.join(pluginDir, "vendor", "unrealSDK")
+    for path in (srcDir, unrealSDKDir):
+        if path not in sys.path:
+            sys.path.append(path)
+
+    apiAttrs = {name: value for name, value in globals().items() if name.startswith("M") and isinstance(value, type)}
+    modules = {
+        "maya": MakeModule("maya"),
+        "maya.cmds": FakeCmds(),
+        "maya.mel": FakeMel(),
+        "maya.OpenMaya": MakeModule("maya.OpenMaya", apiAttrs),
+        "maya.OpenMayaUI": MakeModule("maya.OpenMayaUI", {}, _StubModule),
+        "maya.api": MakeModule("maya.api"),
+        "maya.api.OpenMaya": MakeModule("maya.api.OpenMaya", apiAttrs),
+        "maya.api.OpenMayaAnim": MakeModule("maya.api.OpenMayaAnim", {"MFnSkinCluster": MFnSkinCluster, "MFnGeometryFilter": MFnGeometryFilter}),
+        "PySide2": MakeModule("PySide2"),
+        "PySide2.QtCore": MakeModule("PySide2.QtCore", {}, _StubModule),
+        "PySide2.QtGui": MakeModule("PySide2.QtGui", {}, _StubModule),
+        "PySide2.QtWidgets": MakeModule("PySide2.QtWidgets", {}, _StubModule),
+        "shiboken2": MakeModule("shiboken2", {}, _StubModule),
+        "MayaPlugins": MakeModule("MayaPlugins", {"pluginDir": pluginDir, "srcDir": srcDir, "unrealSDKDir": unrealSDKDir}),
+    }
+
+    for moduleName, module in modules.items():
+        sys.modules[moduleName] = module
+        if "." in moduleName:
+            parentName, childName = moduleName.rsplit(".", 1)
+            setattr(sys.modules[parentName], childName, module)
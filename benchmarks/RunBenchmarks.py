@@ -0,0 +1,284 @@
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import math
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import FakeMaya
+
+# Times the plugins against the fake maya backend and reports how they scale with mesh size, joint count and clip count.
+#   python benchmarks/RunBenchmarks.py --output results.json
+#   python benchmarks/RunBenchmarks.py --baseline results.json    exits with 1 when anything got slower or chattier
+
+FakeMaya.Install()
+
+PROXY_MODES = {
+    "legacy": {"useBulkWeights": False, "useSinglePassExtraction": False, "useDirectSkinTransfer": False, "useProxyCache": False},
+    "bulk": {"useBulkWeights": True, "useSinglePassExtraction": True, "useDirectSkinTransfer": True, "useProxyCache": False},
+    "cached": {"useBulkWeights": True, "useSinglePassExtraction": True, "useDirectSkinTransfer": True, "useProxyCache": True},
+    "rigid": {"useBulkWeights": True, "useSinglePassExtraction": True, "useRigidProxies": True, "useProxyCache": False},
+    "reduced": {"useBulkWeights": True, "useSinglePassExtraction": True, "triangleBudget": 500, "useProxyCache": False},
+    "boxes": {"useBulkWeights": True, "useSinglePassExtraction": True, "useRigidProxies": True, "useBoxStandIns": True, "useProxyCache": False},
+}
+
+LIMB_MODES = {
+    "expression": {"useNodeNetwork": False},
+    "nodeNetwork": {"useNodeNetwork": True},
+    "batch": {"useNodeNetwork": True},
+    "melCurves": {"useNodeNetwork": True, "useShapeLibrary": False},
+    "batchMel": {"useNodeNetwork": True, "useShapeLibrary": False},
+}
+
+EXPORT_MODES = {
+    "perClip": {"useSingleBake": False},
+    "singleBake": {"useSingleBake": True},
+}
+
+def ImportTool(moduleName):
+    module = sys.modules.get(moduleName)
+    return importlib.reload(module) if module else importlib.import_module(moduleName)
+
+def SetupProxyGenerator(vertCount, jointCount, mode, cacheDir, warmCache = True):
+    ProxyGenerator = ImportTool("ProxyGenerator")
+    if warmCache and PROXY_MODES[mode].get("useProxyCache"):
+        # one untimed build of the same character, so the timed one loads from the cache
+        with contextlib.redirect_stdout(io.StringIO()):
+            SetupProxyGenerator(vertCount, jointCount, mode, cacheDir, False)()
+
+    scene = FakeMaya.NewScene()
+    model, joints, skin = FakeMaya.BuildSkinnedMesh(scene, "body", vertCount, jointCount)
+    scene.selection = [model]
+
+    generator = ProxyGenerator.ProxyGenerator()
+    generator.cacheDir = cacheDir
+    for flag, value in PROXY_MODES[mode].items():
+        setattr(generator, flag, value)
+
+    return generator.BuildProxyForSelectedMesh
+
+def SetupLimbRigger(limbCount, mode):
+    LimbRigger = ImportTool("LimbRigger")
+    scene = FakeMaya.NewScene()
+    topJnt = scene.CreateNode("skeleton_root", "joint")
+    roots = [FakeMaya.BuildLimbChain(scene, f"limb{i}", topJnt)[0] for i in range(limbCount)]
+
+    def RigAllLimbs():
+        rigger = LimbRigger.LimbRigger()
+        for flag, value in LIMB_MODES[mode].items():
+            setattr(rigger, flag, value)
+
+        if mode.startswith("batch"):
+            rigger.RigLimbs(rigger.FindLimbChains(topJnt))
+            return
+
+        for root in roots:
+            scene.selection = [root]
+            rigger.FindJointsBasedOnSelection()
+            rigger.RigLimb()
+
+    return RigAllLimbs
+
+def SetupMayaToUE(vertCount, jointCount, clipCount, mode, saveDir):
+    MayatoUE = ImportTool("MayatoUE")
+    scene = FakeMaya.NewScene()
+    # neighbouring clips share 10 frames, the way a walk cycle and the transition out of it usually do
+    clipLength = 30
+    clipStep = 20
+    sceneLength = (clipCount - 1) * clipStep + clipLength
+    scene.playbackRange = [1.0, float(sceneLength)]
+    model, joints, skin = FakeMaya.BuildSkinnedMesh(scene, "body", vertCount, jointCount)
+    FakeMaya.BuildAnimCurves(scene, joints, sceneLength)
+
+    mayaToUE = MayatoUE.MayaToUE()
+    mayaToUE.rootJnt = joints[0]
+    mayaToUE.models = {model}
+    mayaToUE.fileName = "body"
+    mayaToUE.saveDir = saveDir
+    for flag, value in EXPORT_MODES[mode].items():
+        setattr(mayaToUE, flag, value)
+
+    for i in range(clipCount):
+        animClip = mayaToUE.AddNewAnimClip()
+        animClip.subfix = f"_clip{i}"
+        animClip.frameMin = float(i * clipStep + 1)
+        animClip.frameMax = float(i * clipStep + clipLength)
+
+    def Export():
+        for _ in mayaToUE.ExportForUnrealSteps():
+            pass
+        mayaToUE.FinishSendToUnreal({})
+
+    return Export
+
+def Measure(setup, repeat):
+    # timed runs and the memory run are kept apart, tracemalloc slows everything it traces
+    seconds = []
+    for _ in range(repeat):
+        run = setup()
+        startTime = time.perf_counter()
+        run()
+        seconds.append(time.perf_counter() - startTime)
+
+    scene = FakeMaya.GetScene()
+    cmdsCalls = dict(scene.cmdsCalls)
+    apiCalls = dict(scene.apiCalls)
+    evaluatedFrames = scene.evaluatedFrames
+
+    run = setup()
+    tracemalloc.start()
+    try:
+        run()
+        peakBytes = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds": min(seconds),
+        "peakBytes": peakBytes,
+        "cmdsCalls": sum(cmdsCalls.values()),
+        "apiCalls": sum(apiCalls.values()),
+        "evaluatedFrames": evaluatedFrames,
+        "topCmds": dict(sorted(cmdsCalls.items(), key=lambda item: item[1], reverse=True)[:5]),
+    }
+
+def RunBenchmark(tool, mode, params, setup, repeat):
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = Measure(setup, repeat)
+
+    row = {"tool": tool, "mode": mode, **params, **result}
+    print(FormatRow(row), flush=True)
+    return row
+
+def RunAll(vertCounts, jointCounts, limbCounts, clipCounts, repeat):
+    rows = []
+    cacheDir = tempfile.mkdtemp(prefix="MayaPluginsBenchCache_")
+    try:
+        for mode in PROXY_MODES:
+            for vertCount in vertCounts:
+                for jointCount in jointCounts:
+                    params = {"verts": vertCount, "joints": jointCount}
+                    rows.append(RunBenchmark("ProxyGenerator", mode, params, lambda: SetupProxyGenerator(vertCount, jointCount, mode, cacheDir), repeat))
+    finally:
+        shutil.rmtree(cacheDir, ignore_errors=True)
+
+    for mode in LIMB_MODES:
+        for limbCount in limbCounts:
+            rows.append(RunBenchmark("LimbRigger", mode, {"limbs": limbCount}, lambda: SetupLimbRigger(limbCount, mode), repeat))
+
+    saveDir = tempfile.mkdtemp(prefix="MayaPluginsBench_")
+    try:
+        for mode in EXPORT_MODES:
+            for clipCount in clipCounts:
+                params = {"verts": vertCounts[0], "joints": jointCounts[-1], "clips": clipCount}
+                # a fresh save dir per run keeps the export cache cold
+                def Setup():
+                    runDir = tempfile.mkdtemp(dir=saveDir)
+                    return SetupMayaToUE(vertCounts[0], jointCounts[-1], clipCount, mode, runDir)
+
+                rows.append(RunBenchmark("MayaToUE", mode, params, Setup, repeat))
+    finally:
+        shutil.rmtree(saveDir, ignore_errors=True)
+
+    return rows
+
+def FormatRow(row):
+    params = ", ".join(f"{key}={row[key]}" for key in ("verts", "joints", "limbs", "clips") if key in row)
+    return f"{row['tool']:<15}{row['mode']:<12}{params:<35}{row['seconds']:>9.3f}s{row['peakBytes'] / 1e6:>9.1f}MB{row['cmdsCalls']:>9} cmds{row['apiCalls']:>7} api{row.get('evaluatedFrames', 0):>7} frames"
+
+def GetRowKey(row):
+    return tuple((key, row.get(key)) for key in ("tool", "mode", "verts", "joints", "limbs", "clips"))
+
+def GetScaling(rows):
+    # exponent k of cost ~ n^k between the smallest and largest run of each series, 1 is linear, 2 is quadratic
+    scaling = []
+    for param in ("verts", "joints", "limbs", "clips"):
+        series = {}
+        for row in rows:
+            if param not in row:
+                continue
+            otherKey = tuple(item for item in GetRowKey(row) if item[0] != param)
+            series.setdefault(otherKey, []).append(row)
+
+        for otherKey, seriesRows in series.items():
+            seriesRows = sorted(seriesRows, key=lambda row: row[param])
+            first, last = seriesRows[0], seriesRows[-1]
+            if first[param] == last[param]:
+                continue
+
+            sizeRatio = math.log(last[param] / first[param])
+            scaling.append({
+                "series": dict(otherKey),
+                "param": param,
+                "secondsExponent": math.log(max(last["seconds"], 1e-9) / max(first["seconds"], 1e-9)) / sizeRatio,
+                "cmdsCallsExponent": math.log(max(last["cmdsCalls"], 1) / max(first["cmdsCalls"], 1)) / sizeRatio,
+            })
+
+    return scaling
+
+def CompareToBaseline(rows, baselineRows, tolerance):
+    baseline = {GetRowKey(row): row for row in baselineRows}
+    regressions = []
+    for row in rows:
+        baselineRow = baseline.get(GetRowKey(row))
+        if not baselineRow:
+            continue
+
+        # call counts are deterministic, so any growth is a regression, time and memory get some slack for noise
+        if row["cmdsCalls"] > baselineRow["cmdsCalls"] or row["apiCalls"] > baselineRow["apiCalls"]:
+            regressions.append(f"{FormatRow(row)}\n    calls went from {baselineRow['cmdsCalls']} cmds, {baselineRow['apiCalls']} api")
+        if row.get("evaluatedFrames", 0) > baselineRow.get("evaluatedFrames", 0):
+            regressions.append(f"{FormatRow(row)}\n    evaluated frames went from {baselineRow.get('evaluatedFrames', 0)}")
+        if row["seconds"] > baselineRow["seconds"] * (1 + tolerance):
+            regressions.append(f"{FormatRow(row)}\n    time went from {baselineRow['seconds']:.3f}s")
+        if row["peakBytes"] > baselineRow["peakBytes"] * (1 + tolerance):
+            regressions.append(f"{FormatRow(row)}\n    peak memory went from {baselineRow['peakBytes'] / 1e6:.1f}MB")
+
+    return regressions
+
+def ParseCounts(text):
+    return [int(count) for count in text.split(",")]
+
+def Main(argv = None):
+    parser = argparse.ArgumentParser(description="Benchmarks the maya plugins against a fake maya backend.")
+    parser.add_argument("--verts", type=ParseCounts, default=[1000, 4000, 16000], help="comma separated mesh vertex counts")
+    parser.add_argument("--joints", type=ParseCounts, default=[10, 40], help="comma separated skin joint counts")
+    parser.add_argument("--limbs", type=ParseCounts, default=[2, 10, 50], help="comma separated limb counts to rig")
+    parser.add_argument("--clips", type=ParseCounts, default=[1, 8], help="comma separated animation clip counts to export")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark, the fastest one is kept")
+    parser.add_argument("--output", help="json file to write the results to")
+    parser.add_argument("--baseline", help="json results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative growth in time and memory")
+    args = parser.parse_args(argv)
+
+    rows = RunAll(args.verts, args.joints, args.limbs, args.clips, args.repeat)
+    scaling = GetScaling(rows)
+    print("\nScaling (cost ~ n^k):")
+    for entry in scaling:
+        series = ", ".join(f"{key}={value}" for key, value in entry["series"].items() if value is not None)
+        print(f"    {series}, over {entry['param']}: time k={entry['secondsExponent']:.2f}, cmds k={entry['cmdsCallsExponent']:.2f}")
+
+    if args.output:
+        with open(args.output, 'w') as outputFile:
+            json.dump({"results": rows, "scaling": scaling}, outputFile, indent=4)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as baselineFile:
+            regressions = CompareToBaseline(rows, json.load(baselineFile)["results"], args.tolerance)
+
+        if regressions:
+            print("\nRegressions against the baseline:")
+            print("\n".join(regressions))
+            return 1
+
+        print("\nNo regressions against the baseline")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(Main())
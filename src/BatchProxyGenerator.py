@@ -0,0 +1,124 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from WorkerPool import GetMayaPyPath, WorkerJob, WorkerPool
+
+# Builds proxies for many scenes without opening maya, each scene in its own mayapy worker:
+#   python BatchProxyGenerator.py chars/*.mb --outputDir proxies --workers 8 --summary proxies/summary.json
+#   python BatchProxyGenerator.py --jobs jobs.json     with jobs.json as [{"scene": ..., "meshes": [...]}, ...]
+
+srcDir = os.path.dirname(os.path.abspath(__file__))
+
+def GetOutputPath(scenePath, outputDir = None, suffix = "_proxy"):
+    sceneName, sceneExt = os.path.splitext(os.path.basename(scenePath))
+    return os.path.join(outputDir or os.path.dirname(scenePath), sceneName + suffix + sceneExt)
+
+def LoadSceneJobs(jobsPath):
+    with open(jobsPath, 'r') as jobsFile:
+        return [(entry["scene"], entry.get("meshes", [])) for entry in json.load(jobsFile)]
+
+class BatchProxyGenerator:
+    def __init__(self, outputDir = None, workerCount = None, workerCommand = None, rigid = False, triangleBudget = 0, boxStandIns = False, reducePercentage = 0):
+        self.outputDir = outputDir
+        self.rigid = rigid
+        self.triangleBudget = triangleBudget
+        self.reducePercentage = reducePercentage
+        self.boxStandIns = boxStandIns
+        self.workerCount = workerCount
+        self.workerCommand = workerCommand or [GetMayaPyPath(), os.path.join(srcDir, "ProxyBuildWorker.py")]
+        self.savedScenes = {}
+
+    def Run(self, sceneJobs):
+        # sceneJobs is a list of (scene path, mesh names), no mesh names builds every skinned mesh in the scene
+        if self.outputDir:
+            os.makedirs(self.outputDir, exist_ok=True)
+
+        workDir = tempfile.mkdtemp(prefix="BatchProxy_")
+        try:
+            jobs = []
+            for i, (scenePath, meshes) in enumerate(sceneJobs):
+                jobPath = os.path.join(workDir, f"job{i}.json")
+                with open(jobPath, 'w') as jobFile:
+                    json.dump({"scene": os.path.abspath(scenePath), "meshes": meshes, "output": os.path.abspath(GetOutputPath(scenePath, self.outputDir)),
+                               "rigid": self.rigid, "triangleBudget": self.triangleBudget, "reducePercentage": self.reducePercentage, "boxStandIns": self.boxStandIns}, jobFile)
+                jobs.append(WorkerJob(scenePath, [jobPath]))
+
+            pool = WorkerPool(self.workerCommand, self.workerCount)
+            pool.onMessage = self.HandleWorkerMessage
+            startTime = time.perf_counter()
+            pool.Run(jobs)
+            return self.GetSummary(jobs, time.perf_counter() - startTime)
+        finally:
+            shutil.rmtree(workDir, ignore_errors=True)
+
+    def HandleWorkerMessage(self, job, message):
+        if message["type"] == "saved":
+            self.savedScenes[job.name] = message["path"]
+        elif message["type"] == "result" and message.get("error"):
+            print(f"{job.name}: {message['mesh']} failed: {message['error']}")
+        elif message["type"] == "result":
+            print(f"{job.name}: {message['mesh']} -> {message['chunks']} chunks in {message['seconds']:.2f}s")
+        elif message["type"] == "error":
+            print(f"{job.name}: {message.get('message', '')}")
+
+    def GetSummary(self, jobs, totalSeconds):
+        scenes = []
+        for job in jobs:
+            scenes.append({
+                "scene": job.name,
+                "output": self.savedScenes.get(job.name),
+                "succeeded": job.Succeeded(),
+                "meshes": [{"mesh": result["mesh"], "chunks": result["chunks"], "seconds": result["seconds"], "error": result.get("error")} for result in job.results],
+                "errors": job.errors,
+            })
+
+        return {
+            "totalSeconds": totalSeconds,
+            "buildSeconds": sum(mesh["seconds"] for scene in scenes for mesh in scene["meshes"]),
+            "chunks": sum(mesh["chunks"] for scene in scenes for mesh in scene["meshes"]),
+            # a scene only fails when it could not be built and saved, meshes that failed in a saved scene are listed on their own
+            "failedScenes": [scene["scene"] for scene in scenes if not scene["succeeded"]],
+            "failedMeshes": [{"scene": scene["scene"], "mesh": mesh["mesh"], "error": mesh["error"]} for scene in scenes for mesh in scene["meshes"] if mesh["error"]],
+            "scenes": scenes,
+        }
+
+def Main(argv = None):
+    parser = argparse.ArgumentParser(description="Builds proxies for many scenes in parallel mayapy workers.")
+    parser.add_argument("scenes", nargs="*", help="scene files to build proxies in")
+    parser.add_argument("--meshes", nargs="*", default=[], help="meshes to build proxies for in every scene, all skinned meshes when left out")
+    parser.add_argument("--jobs", help="json list of {\"scene\": ..., \"meshes\": [...]} entries, added to the scenes given")
+    parser.add_argument("--outputDir", help="where the scenes with proxies are saved, next to each source scene when left out")
+    parser.add_argument("--workers", type=int, default=None, help="how many scenes are built at once, one per cpu by default")
+    parser.add_argument("--summary", help="json file to write the build summary to")
+    parser.add_argument("--rigid", action="store_true", help="constrain each chunk to its joint instead of skinning it")
+    parser.add_argument("--triangleBudget", type=int, default=0, help="total triangles of each proxy, spread across its chunks by area")
+    parser.add_argument("--reducePercentage", type=int, default=0, help="percentage of triangles to remove from every chunk, only used without a triangle budget")
+    parser.add_argument("--boxStandIns", action="store_true", help="replace each chunk with its bounding box")
+    args = parser.parse_args(argv)
+
+    sceneJobs = [(scene, args.meshes) for scene in args.scenes]
+    if args.jobs:
+        sceneJobs += LoadSceneJobs(args.jobs)
+
+    if not sceneJobs:
+        parser.error("no scenes given")
+
+    summary = BatchProxyGenerator(args.outputDir, args.workers, rigid=args.rigid, triangleBudget=args.triangleBudget, boxStandIns=args.boxStandIns, reducePercentage=args.reducePercentage).Run(sceneJobs)
+    print(f"Built {summary['chunks']} chunks across {len(sceneJobs)} scenes in {summary['totalSeconds']:.2f}s")
+    if summary["failedScenes"]:
+        print("Failed: " + ", ".join(summary["failedScenes"]))
+    if summary["failedMeshes"]:
+        print("Failed meshes: " + ", ".join(f"{failed['scene']}: {failed['mesh']}" for failed in summary["failedMeshes"]))
+
+    if args.summary:
+        with open(args.summary, 'w') as summaryFile:
+            json.dump(summary, summaryFile, indent=4)
+
+    return 1 if summary["failedScenes"] or summary["failedMeshes"] else 0
+
+if __name__ == "__main__":
+    sys.exit(Main())
@@ -0,0 +1,81 @@
+import json
+import os
+from contextlib import contextmanager
+import maya.cmds as mc
+
+# Builds each controller shape once per rig as a template curve, new controllers are duplicates of it. Templates only
+# live while a rig is being built and are deleted once it is done, so none are left in the scene or in an fbx export.
+# Shapes are {"name": {"degree": 1, "points": [[x, y, z], ...], "knots": [...]}}, knots are optional.
+
+builtInShapesPath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ControllerShapes.json")
+
+class ControllerShapeLibrary:
+    def __init__(self):
+        self.shapes = {}
+        self.templates = {}
+        self.templateDepth = 0
+        self.LoadShapes(builtInShapesPath)
+
+    def LoadShapes(self, shapesPath):
+        with open(shapesPath, 'r') as shapesFile:
+            shapes = json.load(shapesFile)
+
+        for shapeName, shape in shapes.items():
+            if not shape.get("points"):
+                raise Exception(f"Controller shape {shapeName} in {shapesPath} has no points!")
+            self.shapes[shapeName] = shape
+
+        # a reloaded shape has to rebuild its templates
+        staleTemplates = [template for key, template in self.templates.items() if key[0] in shapes]
+        if staleTemplates:
+            mc.delete(staleTemplates)
+        self.templates = {key: template for key, template in self.templates.items() if key[0] not in shapes}
+        return list(shapes)
+
+    @contextmanager
+    def UseTemplates(self):
+        # templates made inside are shared by every controller until the outermost block ends, then deleted
+        self.templateDepth += 1
+        try:
+            yield self
+        finally:
+            self.templateDepth -= 1
+            if self.templateDepth == 0 and self.templates:
+                mc.delete(list(self.templates.values()))
+                self.templates = {}
+
+    def GetTemplate(self, shapeName, size):
+        # one template per shape and size, the size is baked into the cvs so controllers need no freeze
+        key = (shapeName, float(size))
+        template = self.templates.get(key)
+        if template:
+            return template
+
+        if shapeName not in self.shapes:
+            raise Exception(f"No controller shape named {shapeName}! Known shapes: {', '.join(self.shapes)}")
+
+        shape = self.shapes[shapeName]
+        templateName = f"ctrlTemplate_{shapeName}_{size}".replace(".", "_")
+        curveArgs = {"d": shape.get("degree", 1), "p": [tuple(point) for point in shape["points"]]}
+        if "knots" in shape:
+            curveArgs["k"] = shape["knots"]
+
+        template = mc.curve(n=templateName, **curveArgs)
+        if size != 1:
+            mc.scale(size, size, size, template + ".cv[*]", r=True, p=(0, 0, 0))
+
+        self.templates[key] = template
+        return template
+
+    def CreateController(self, shapeName, name, size = 1):
+        with self.UseTemplates():
+            return mc.duplicate(self.GetTemplate(shapeName, size), n=name)[0]
+
+_controllerShapeLibrary = None
+
+def GetControllerShapeLibrary():
+    global _controllerShapeLibrary
+    if not _controllerShapeLibrary:
+        _controllerShapeLibrary = ControllerShapeLibrary()
+
+    return _controllerShapeLibrary
@@ -0,0 +1,37 @@
+import hashlib
+import json
+import os
+
+def HashInputs(*inputs):
+    return hashlib.sha1(json.dumps(inputs, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+class ExportManifest:
+    def __init__(self, saveDir):
+        self.path = os.path.join(saveDir, "export_manifest.json")
+        self.saveDir = saveDir
+        self.entries = {}
+        self.Load()
+
+    def Load(self):
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, 'r') as manifestFile:
+                self.entries = json.load(manifestFile)
+        except (OSError, ValueError):
+            print(f"Export manifest {self.path} is unreadable, exporting everything again")
+            self.entries = {}
+
+    def Save(self):
+        with open(self.path, 'w') as manifestFile:
+            json.dump(self.entries, manifestFile, indent=4, sort_keys=True)
+
+    def GetKey(self, exportPath):
+        return os.path.relpath(exportPath, self.saveDir).replace("\\", "/")
+
+    def IsUpToDate(self, exportPath, inputHash):
+        return self.entries.get(self.GetKey(exportPath)) == inputHash and os.path.exists(exportPath)
+
+    def Update(self, exportPath, inputHash):
+        self.entries[self.GetKey(exportPath)] = inputHash
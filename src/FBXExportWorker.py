@@ -0,0 +1,47 @@
+import json
+import os
+import sys
+import maya.standalone
+from WorkerPool import EmitWorkerMessage
+
+# Runs inside mayapy: python FBXExportWorker.py <job.json>
+# The job holds the scene snapshot, the objects to export, and the clips this worker should bake.
+
+def ExportClips(job):
+    import maya.cmds as mc
+    mc.loadPlugin("fbxmaya", quiet=True)
+    mc.file(job["scene"], o=True, f=True)
+    mc.select(job["objects"], r=True)
+
+    mc.FBXResetExport()
+    mc.FBXExportSmoothingGroups("-v", True)
+    mc.FBXExportInputConnections("-v", False)
+    mc.FBXExportBakeComplexAnimation('-v', True)
+
+    for clip in job["clips"]:
+        EmitWorkerMessage("progress", clip=clip["subfix"], stage="bake")
+        mc.FBXExportBakeComplexStart('-v', clip["frameMin"])
+        mc.FBXExportBakeComplexEnd('-v', clip["frameMax"])
+        mc.FBXExportBakeComplexStep('-v', 1)
+        mc.playbackOptions(e=True, min=clip["frameMin"], max=clip["frameMax"])
+
+        mc.FBXExport('-f', clip["path"], "-s", True, '-ea', True)
+        EmitWorkerMessage("result", clip=clip["subfix"], path=clip["path"], bytes=os.path.getsize(clip["path"]))
+
+def Main(jobPath):
+    with open(jobPath, 'r') as jobFile:
+        job = json.load(jobFile)
+
+    maya.standalone.initialize(name="python")
+    try:
+        ExportClips(job)
+    except Exception as e:
+        EmitWorkerMessage("error", message=f"{e}")
+        return 1
+    finally:
+        maya.standalone.uninitialize()
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(Main(sys.argv[1]))
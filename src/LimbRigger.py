@@ -2,13 +2,19 @@ import importlib
 import MayaUtils
 importlib.reload(MayaUtils)
 
-from MayaUtils import MayaWindow
+from MayaUtils import BulkEdit, MayaWindow
+from ControllerShapeLibrary import GetControllerShapeLibrary
 from PySide2.QtGui import QColor
-from PySide2.QtWidgets import QColorDialog, QHBoxLayout, QLabel, QLineEdit, QMessageBox, QPushButton, QSlider, QVBoxLayout, QWidget
+from PySide2.QtWidgets import QCheckBox, QColorDialog, QFileDialog, QHBoxLayout, QLabel, QLineEdit, QMessageBox, QPushButton, QSlider, QVBoxLayout, QWidget
 from PySide2.QtCore import Qt, Signal
 from maya.OpenMaya import MVector
 import maya.mel as mel
 import maya.cmds as mc
+import re
+import time
+
+# joints a limb rig ends on, matched against the words of a joint name, "l_wrist_jnt", "hand_r" and "LeftFoot" all count
+LIMB_END_NAMES = ["wrist", "hand", "ankle", "foot"]
 
 class LimbRigger:
     def __init__(self):
@@ -18,6 +24,11 @@ class LimbRigger:
         self.controllerSize = 5
         self.controllerColor = [0,0,0]
         self.createdControllers = []
+        self.useNodeNetwork = True
+        self.useShapeLibrary = True
+        self.rigRegistry = {}
+        self.limbEndNames = list(LIMB_END_NAMES)
+        self.createdNodes = []
 
     def FindJointsBasedOnSelection(self):
         try:
@@ -27,31 +38,102 @@ class LimbRigger:
         except Exception as e:
             raise Exception("Wrong Selection, please select the first joint of the limb!")
 
+    def GetChildJoints(self, jnt):
+        return mc.listRelatives(jnt, c=True, type="joint") or []
+
+    def GetParentJoint(self, jnt):
+        parents = mc.listRelatives(jnt, p=True, type="joint")
+        return parents[0] if parents else None
+
+    def IsLimbEnd(self, jnt):
+        shortName = jnt.split("|")[-1].split(":")[-1]
+        words = re.findall(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])", shortName)
+        return any(word.lower() in self.limbEndNames for word in words)
+
+    def FindLimbChains(self, topJnt):
+        # a limb is a wrist or an ankle and the two joints above it, spines, necks and clavicles never end on one.
+        # finger chains under a hand joint are skipped, their own joints carry the hand's name too
+        allJnts = [topJnt] + (mc.listRelatives(topJnt, ad=True, type="joint") or [])
+        jntSet = set(allJnts)
+        chains = []
+        for end in allJnts:
+            if not self.IsLimbEnd(end):
+                continue
+
+            mid = self.GetParentJoint(end)
+            root = self.GetParentJoint(mid) if mid else None
+            if root not in jntSet or self.IsLimbEnd(mid) or self.IsLimbEnd(root):
+                continue
+
+            if not mc.objExists(f"{root}_rig_grp"):
+                chains.append((root, mid, end))
+
+        return chains
+
+    def RigLimbs(self, chains):
+        # rigs every (root, mid, end) chain as one undo step, with the viewport frozen until the last one is done
+        report = {"limbs": 0, "failed": {}, "nodeCount": 0, "commands": 0, "totalSeconds": 0.0}
+        with BulkEdit("RigLimbs") as bulkEdit, GetControllerShapeLibrary().UseTemplates():
+            for root, mid, end in chains:
+                self.root, self.mid, self.end = root, mid, end
+                limbStartTime = time.perf_counter()
+                try:
+                    self.RigLimb()
+                except Exception as e:
+                    report["failed"][root] = f"{e}"
+                    continue
+
+                self.rigRegistry[root] = {
+                    "chain": [root, mid, end],
+                    "nodes": list(self.createdNodes),
+                    "seconds": time.perf_counter() - limbStartTime,
+                }
+                report["nodeCount"] += len(self.createdNodes)
+                report["limbs"] += 1
+
+        report["commands"] = bulkEdit["commands"]
+        report["totalSeconds"] = bulkEdit["seconds"]
+        print(f"Rigged {report['limbs']} limbs with {report['nodeCount']} nodes in {report['totalSeconds']:.2f}s")
+        return report
+
     def CreateFKControllerForJoint(self, jntName):
         ctrlName = "ac_l_fk_" + jntName
         ctrlGrpName = ctrlName + "_grp"
-        mc.circle(name = ctrlName, radius = self.controllerSize, normal = (1,0,0))
-        mc.group(ctrlName, n=ctrlGrpName)
+        self.createdNodes.extend(mc.circle(name = ctrlName, radius = self.controllerSize, normal = (1,0,0)))
+        self.createdNodes.append(mc.group(ctrlName, n=ctrlGrpName))
         mc.matchTransform(ctrlGrpName, jntName)
-        mc.orientConstraint(ctrlName, jntName)
+        self.createdNodes.extend(mc.orientConstraint(ctrlName, jntName))
         self.createdControllers.append(ctrlName)
         return ctrlName, ctrlGrpName
 
 
     def CreateBoxController(self, name):
+        if self.useShapeLibrary:
+            name = GetControllerShapeLibrary().CreateController("box", name, self.controllerSize)
+            return self.GroupController(name)
+
         mel.eval(f"curve -n {name} -d 1 -p 0.5 0.5 0.5 -p 0.5 0.5 -0.5 -p -0.5 0.5 -0.5 -p -0.5 0.5 0.5 -p 0.5 0.5 0.5 -p 0.5 -0.5 0.5 -p -0.5 -0.5 0.5 -p -0.5 0.5 0.5 -p -0.5 -0.5 0.5 -p -0.5 -0.5 -0.5 -p -0.5 0.5 -0.5 -p -0.5 -0.5 -0.5 -p 0.5 -0.5 -0.5 -p 0.5 0.5 -0.5 -p 0.5 -0.5 -0.5 -p 0.5 -0.5 0.5 -k 0 -k 1 -k 2 -k 3 -k 4 -k 5 -k 6 -k 7 -k 8 -k 9 -k 10 -k 11 -k 12 -k 13 -k 14 -k 15 ;")
+        self.createdNodes.append(name)
         mc.scale(self.controllerSize, self.controllerSize, self.controllerSize, name)
         mc.makeIdentity(name, apply=True) # freeze transformation
         grpName = name + "_grp"
-        mc.group(name, n = grpName)
+        self.createdNodes.append(mc.group(name, n = grpName))
         self.createdControllers.append(name)
         return name, grpName
 
 
     def CreatePlusController(self, name):
+        if self.useShapeLibrary:
+            name = GetControllerShapeLibrary().CreateController("plus", name)
+            return self.GroupController(name)
+
         mel.eval(f"curve -n {name} -d 1 -p 1 1 0 -p 1 3 0 -p -1 3 0 -p -1 1 0 -p -3 1 0 -p -3 -1 0 -p -1 -1 0 -p -1 -3 0 -p 1 -3 0 -p 1 -1 0 -p 3 -1 0 -p 3 1 0 -p 1 1 0 -k 0 -k 1 -k 2 -k 3 -k 4 -k 5 -k 6 -k 7 -k 8 -k 9 -k 10 -k 11 -k 12 ;")
+        return self.GroupController(name)
+
+    def GroupController(self, name):
         grpName = name + "_grp"
-        mc.group(name, n = grpName)
+        self.createdNodes.append(name)
+        self.createdNodes.append(mc.group(name, n = grpName))
         self.createdControllers.append(name)
         return name, grpName
 
@@ -69,7 +151,37 @@ class LimbRigger:
                 mc.setAttr(ctrl + ".overrideRGBColors", 1)
                 mc.setAttr(ctrl + ".overrideColorRGB", rgbColor[0], rgbColor[1], rgbColor[2], type="double3")
 
+    def ConnectIKFKBlend(self, ikfkBlendAttr, ikHandleName, ikCtrlGrps, fkCtrlGrp, endOrientConstraint, endCtrl, ikEndCtrl):
+        # same switch as the expressions, but as plain connections the evaluation graph can run in parallel
+        ikfkReverse = mc.createNode("reverse", n=f"{ikHandleName}_ikfk_reverse")
+        self.createdNodes.append(ikfkReverse)
+        mc.connectAttr(ikfkBlendAttr, ikfkReverse + ".inputX")
+        fkBlendAttr = ikfkReverse + ".outputX"
+
+        mc.connectAttr(ikfkBlendAttr, ikHandleName + ".ikBlend")
+        for ikCtrlGrp in ikCtrlGrps:
+            mc.connectAttr(ikfkBlendAttr, ikCtrlGrp + ".v")
+
+        mc.connectAttr(fkBlendAttr, fkCtrlGrp + ".v")
+        mc.connectAttr(fkBlendAttr, f"{endOrientConstraint}.{endCtrl}W0")
+        mc.connectAttr(ikfkBlendAttr, f"{endOrientConstraint}.{ikEndCtrl}W1")
+        return ikfkReverse
+
     def RigLimb(self):
+        # every node the rig creates is collected as it is made, so a limb that fails part way is deleted again
+        self.createdNodes = []
+        with BulkEdit("RigLimb"), GetControllerShapeLibrary().UseTemplates():
+            try:
+                self.BuildLimbRig()
+            except Exception:
+                createdNodes = [node for node in self.createdNodes if mc.objExists(node)]
+                if createdNodes:
+                    mc.delete(createdNodes)
+                self.createdControllers = [ctrl for ctrl in self.createdControllers if ctrl not in self.createdNodes]
+                self.createdNodes = []
+                raise
+
+    def BuildLimbRig(self):
         rootCtrl, rootCtrlGrp = self.CreateFKControllerForJoint(self.root)
         midCtrl, midCtrlGrp = self.CreateFKControllerForJoint(self.mid)
         endCtrl, endCtrlGrp = self.CreateFKControllerForJoint(self.end)
@@ -81,12 +193,13 @@ class LimbRigger:
         ikEndCtrl, ikEndCtrlGrp = self.CreateBoxController(ikEndCtrl)
         mc.matchTransform(ikEndCtrlGrp, self.end)
         endOrientConstraint = mc.orientConstraint(ikEndCtrl, self.end)[0]
+        self.createdNodes.append(endOrientConstraint)
 
         rootJntLoc = self.GetObjectLocation(self.root)
         self.PrintMVector(rootJntLoc)
 
         ikHandleName = "ikHandle_" + self.end
-        mc.ikHandle(n=ikHandleName, sol="ikRPsolver", sj=self.root, ee=self.end)
+        self.createdNodes.extend(mc.ikHandle(n=ikHandleName, sol="ikRPsolver", sj=self.root, ee=self.end))
 
         poleVectorLocationVals = mc.getAttr(ikHandleName + ".poleVector")[0]
         poleVector = MVector(poleVectorLocationVals[0], poleVectorLocationVals[1], poleVectorLocationVals[2])
@@ -97,12 +210,12 @@ class LimbRigger:
 
         poleVectorCtrlLoc = rootJntLoc + rootToEndVector / 2 + poleVector * rootToEndVector.length()
         poleVectorCtrl = "ac_ik_" + self.mid
-        mc.spaceLocator(n=poleVectorCtrl)
+        self.createdNodes.extend(mc.spaceLocator(n=poleVectorCtrl))
         poleVectorCtrlGrp = poleVectorCtrl + "_grp"
-        mc.group(poleVectorCtrl, n=poleVectorCtrlGrp)
+        self.createdNodes.append(mc.group(poleVectorCtrl, n=poleVectorCtrlGrp))
         mc.setAttr(poleVectorCtrlGrp+".t", poleVectorCtrlLoc.x, poleVectorCtrlLoc.y, poleVectorCtrlLoc.z, typ="double3")
 
-        mc.poleVectorConstraint(poleVectorCtrl, ikHandleName)
+        self.createdNodes.extend(mc.poleVectorConstraint(poleVectorCtrl, ikHandleName))
 
         ikfkBlendCtrl = "ac_ikfk_blend_" + self.root
         ikfkBlendCtrl, ikfkBlendCtrlGrp = self.CreatePlusController(ikfkBlendCtrl)
@@ -112,14 +225,17 @@ class LimbRigger:
         mc.addAttr(ikfkBlendCtrl, ln=ikfkBlendAttrName, min = 0, max = 1, k=True)
         ikfkBlendAttr = ikfkBlendCtrl + "." + ikfkBlendAttrName
 
-        mc.expression(s=f"{ikHandleName}.ikBlend={ikfkBlendAttr}")
-        mc.expression(s=f"{ikEndCtrlGrp}.v={poleVectorCtrlGrp}.v={ikfkBlendAttr}")
-        mc.expression(s=f"{rootCtrlGrp}.v=1-{ikfkBlendAttr}")
-        mc.expression(s=f"{endOrientConstraint}.{endCtrl}W0 = 1-{ikfkBlendAttr}")
-        mc.expression(s=f"{endOrientConstraint}.{ikEndCtrl}W1 = {ikfkBlendAttr}")
+        if self.useNodeNetwork:
+            self.ConnectIKFKBlend(ikfkBlendAttr, ikHandleName, [ikEndCtrlGrp, poleVectorCtrlGrp], rootCtrlGrp, endOrientConstraint, endCtrl, ikEndCtrl)
+        else:
+            self.createdNodes.append(mc.expression(s=f"{ikHandleName}.ikBlend={ikfkBlendAttr}"))
+            self.createdNodes.append(mc.expression(s=f"{ikEndCtrlGrp}.v={poleVectorCtrlGrp}.v={ikfkBlendAttr}"))
+            self.createdNodes.append(mc.expression(s=f"{rootCtrlGrp}.v=1-{ikfkBlendAttr}"))
+            self.createdNodes.append(mc.expression(s=f"{endOrientConstraint}.{endCtrl}W0 = 1-{ikfkBlendAttr}"))
+            self.createdNodes.append(mc.expression(s=f"{endOrientConstraint}.{ikEndCtrl}W1 = {ikfkBlendAttr}"))
 
         topGrpName = f"{self.root}_rig_grp"
-        mc.group([rootCtrlGrp, ikEndCtrlGrp, poleVectorCtrlGrp, ikfkBlendCtrlGrp], n=topGrpName)
+        self.createdNodes.append(mc.group([rootCtrlGrp, ikEndCtrlGrp, poleVectorCtrlGrp, ikfkBlendCtrlGrp], n=topGrpName))
         mc.parent(ikHandleName, ikEndCtrl)
 
         mc.setAttr(topGrpName+".overrideEnabled", 1)
@@ -180,10 +296,26 @@ class LimbRiggerWidget(MayaWindow):
         colorPicker.colorChanged.connect(self.ColorPickerChanged)
         self.masterLayout.addWidget(colorPicker)
 
+        nodeNetworkCheckbox = QCheckBox("Blend IK/FK With Nodes (Faster Playback)")
+        nodeNetworkCheckbox.setChecked(self.rigger.useNodeNetwork)
+        nodeNetworkCheckbox.toggled.connect(self.NodeNetworkCheckboxToggled)
+        self.masterLayout.addWidget(nodeNetworkCheckbox)
+
+        loadShapesBtn = QPushButton("Load Controller Shapes")
+        loadShapesBtn.clicked.connect(self.LoadShapesBtnClicked)
+        self.masterLayout.addWidget(loadShapesBtn)
+
+        self.reportRigCostCheckbox = QCheckBox("Report Rig Cost (Playback Before/After)")
+        self.masterLayout.addWidget(self.reportRigCostCheckbox)
+
         rigLimbBtn = QPushButton("Rig Limb")
-        rigLimbBtn.clicked.connect(lambda : self.rigger.RigLimb())
+        rigLimbBtn.clicked.connect(lambda : self.RunRigTool("RigLimb", self.rigger.RigLimb))
         self.masterLayout.addWidget(rigLimbBtn)
 
+        rigAllLimbsBtn = QPushButton("Rig All Limbs Under Selection")
+        rigAllLimbsBtn.clicked.connect(self.RigAllLimbsBtnClicked)
+        self.masterLayout.addWidget(rigAllLimbsBtn)
+
         changeColorBtn = QPushButton("Change Controller Color")
         changeColorBtn.clicked.connect(self.ChangeControllerColorsClicked)
         self.masterLayout.addWidget(changeColorBtn)
@@ -194,6 +326,48 @@ class LimbRiggerWidget(MayaWindow):
         self.rigger.controllerColor[1] = newColor.greenF()
         self.rigger.controllerColor[2] = newColor.blueF()
 
+    def RunRigTool(self, toolName, toolAction):
+        if not self.reportRigCostCheckbox.isChecked():
+            return toolAction()
+
+        from RigCostReport import RigCostReport
+        return RigCostReport().Compare(toolName, toolAction)
+
+    def RigAllLimbsBtnClicked(self):
+        selection = mc.ls(sl=True, type="joint")
+        if not selection:
+            QMessageBox.critical(self, "Error", "Wrong Selection, please select the top joint of the skeleton!")
+            return
+
+        chains = self.rigger.FindLimbChains(selection[0])
+        if not chains:
+            QMessageBox.critical(self, "Error", f"No unrigged limbs found under {selection[0]}!")
+            return
+
+        chainNames = "\n".join(" > ".join(chain) for chain in chains)
+        if QMessageBox.question(self, "Rig All Limbs", f"Rig these limbs?\n{chainNames}") != QMessageBox.Yes:
+            return
+
+        report = self.RunRigTool("RigLimbs", lambda : self.rigger.RigLimbs(chains))
+        message = f"Rigged {report['limbs']} limbs with {report['nodeCount']} nodes in {report['totalSeconds']:.2f}s"
+        for root, error in report["failed"].items():
+            message += f"\n{root} failed: {error}"
+        QMessageBox.information(self, "Rig All Limbs", message)
+
+    def LoadShapesBtnClicked(self):
+        shapesPath, _ = QFileDialog.getOpenFileName(self, "Load Controller Shapes", "", "Controller Shapes (*.json)")
+        if not shapesPath:
+            return
+
+        try:
+            shapeNames = GetControllerShapeLibrary().LoadShapes(shapesPath)
+            QMessageBox.information(self, "Controller Shapes", f"Loaded: {', '.join(shapeNames)}")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"{e}")
+
+    def NodeNetworkCheckboxToggled(self, checked):
+        self.rigger.useNodeNetwork = checked
+
     def ChangeControllerColorsClicked(self):
         self.rigger.ChangeControllerColors(self.rigger.controllerColor)
 
@@ -210,5 +384,6 @@ class LimbRiggerWidget(MayaWindow):
 
 
 
-limbRiggerWidget = LimbRiggerWidget()
-limbRiggerWidget.show()
\ No newline at end of file
+if not mc.about(batch=True):
+    limbRiggerWidget = LimbRiggerWidget()
+    limbRiggerWidget.show()
\ No newline at end of file
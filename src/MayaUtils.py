@@ -1,9 +1,22 @@
+import bisect
+import hashlib
+import json
+import time
+from array import array
+from contextlib import contextmanager
 from PySide2.QtWidgets import QMainWindow, QWidget
 from PySide2.QtCore import Qt
 import maya.OpenMayaUI as omui
+import maya.api.OpenMaya as om
+import maya.api.OpenMayaAnim as oma
 import shiboken2
 import maya.cmds as mc
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 def IsMesh(obj):
     shapes = mc.listRelatives(obj, s=True)
     if not shapes:
@@ -27,19 +40,72 @@ def GetUpperStream(obj):
 def GetLowerStream(obj):
     return mc.listConnections(obj, s=False, d=True, sh=True)
 
-def GetAllConnectionsIn(obj, nextFunc, filter = None):
+def WalkConnections(obj, nextFunc, searchDepth = 100):
     allFound = set()
     nexts = nextFunc(obj)
-    searchDepth = 100
     while nexts and searchDepth > 0:
         searchDepth -= 1
+        nexts = set(nexts) - allFound
+        allFound.update(nexts)
+        if nexts:
+            nexts = nextFunc(list(nexts))
+
+    return allFound
+
+def CacheNodeTypes(nodes, typeCache):
+    uncached = [node for node in nodes if node not in typeCache]
+    if not uncached:
+        return typeCache
+
+    # ls -showType returns name/type pairs, so the whole batch is typed in one call
+    namesAndTypes = mc.ls(uncached, showType=True) or []
+    for i in range(0, len(namesAndTypes) - 1, 2):
+        typeCache[namesAndTypes[i]] = namesAndTypes[i + 1]
+
+    for node in uncached:
+        if node not in typeCache:
+            typeCache[node] = mc.objectType(node)
+
+    return typeCache
+
+# node types a mesh's deformer stack is built from, used to keep walks off the rest of the rig
+DEFORMER_STACK_TYPES = ["mesh", "skinCluster", "tweak", "groupParts", "groupId", "objectSet", "blendShape",
+                        "cluster", "deltaMush", "wrap", "ffd", "nonLinear", "polySmoothFace"]
+
+def IterConnectionsIn(obj, nextFunc, matchTypes = None, expandTypes = None, maxNodes = None, typeCache = None):
+    # yields matching nodes as soon as they are found, only walking further through nodes of expandTypes
+    if typeCache is None:
+        typeCache = {}
+
+    visited = set()
+    nexts = nextFunc(obj)
+    while nexts:
+        nexts = [next for next in dict.fromkeys(nexts) if next not in visited]
+        if maxNodes is not None:
+            nexts = nexts[:maxNodes - len(visited)]
+
+        visited.update(nexts)
+        CacheNodeTypes(nexts, typeCache)
+
+        toExpand = []
         for next in nexts:
-            allFound.add(next)
+            nextType = typeCache[next]
+            if matchTypes is None or nextType in matchTypes:
+                yield next
 
-        nexts = nextFunc(nexts)
-        if nexts:
-            nexts = [x for x in nexts if x not in allFound]
+            if expandTypes is None or nextType in expandTypes:
+                toExpand.append(next)
+
+        if not toExpand or (maxNodes is not None and len(visited) >= maxNodes):
+            return
+
+        nexts = nextFunc(toExpand)
+
+def FindFirstConnectionIn(obj, nextFunc, matchTypes, expandTypes = None, maxNodes = None):
+    return next(IterConnectionsIn(obj, nextFunc, matchTypes, expandTypes, maxNodes), None)
 
+def GetAllConnectionsIn(obj, nextFunc, filter = None):
+    allFound = WalkConnections(obj, nextFunc)
     if not filter:
         return list(allFound)
     
@@ -50,6 +116,392 @@ def GetAllConnectionsIn(obj, nextFunc, filter = None):
 
     return filtered
 
+def GetMObject(name):
+    selectionList = om.MSelectionList()
+    selectionList.add(name)
+    return selectionList.getDependNode(0)
+
+def GetMeshDagPath(mesh):
+    selectionList = om.MSelectionList()
+    selectionList.add(mesh)
+    dagPath = selectionList.getDagPath(0)
+    dagPath.extendToShape()
+    return dagPath
+
+def GetSkinWeights(skin, mesh):
+    # reads the whole weight matrix in one call, flattened as vertex * influence
+    skinFn = oma.MFnSkinCluster(GetMObject(skin))
+    meshPath = GetMeshDagPath(mesh)
+    vertComponentFn = om.MFnSingleIndexedComponent()
+    vertComponents = vertComponentFn.create(om.MFn.kMeshVertComponent)
+    vertComponentFn.setCompleteData(om.MFnMesh(meshPath).numVertices)
+
+    weights, influenceCount = skinFn.getWeights(meshPath, vertComponents)
+    influences = [influence.partialPathName() for influence in skinFn.influenceObjects()]
+    return weights, influences
+
+def SetSkinWeights(skin, mesh, influences, weights):
+    # weights are laid out vertex by vertex, in the order of the given influences
+    skinFn = oma.MFnSkinCluster(GetMObject(skin))
+    meshPath = GetMeshDagPath(mesh)
+    vertComponentFn = om.MFnSingleIndexedComponent()
+    vertComponents = vertComponentFn.create(om.MFn.kMeshVertComponent)
+    vertComponentFn.setCompleteData(om.MFnMesh(meshPath).numVertices)
+
+    skinInfluences = [influence.partialPathName() for influence in skinFn.influenceObjects()]
+    influenceIndices = om.MIntArray([skinInfluences.index(influence) for influence in influences])
+    skinFn.setWeights(meshPath, vertComponents, influenceIndices, om.MDoubleArray(weights), normalize=False)
+
+def ToWeightMatrix(weights, influenceCount):
+    if np is not None:
+        weightMatrix = np.fromiter(weights, dtype=np.float64, count=len(weights))
+        return weightMatrix.reshape(-1, influenceCount)
+
+    weights = list(weights)
+    return [weights[rowStart:rowStart + influenceCount] for rowStart in range(0, len(weights), influenceCount)]
+
+def GetMaxInfluenceIndices(weightMatrix):
+    if np is not None:
+        return weightMatrix.argmax(axis=1)
+
+    return [row.index(max(row)) for row in weightMatrix]
+
+def GetWeightsForVerts(weightMatrix, vertIds):
+    # returns the influences with any weight on the given verts, and their weights flattened vertex by vertex
+    if np is not None:
+        vertWeights = weightMatrix[np.asarray(vertIds)]
+        influenceIds = np.flatnonzero(vertWeights.any(axis=0))
+        return influenceIds.tolist(), vertWeights[:, influenceIds].ravel().tolist()
+
+    vertWeights = [weightMatrix[vertId] for vertId in vertIds]
+    influenceIds = [i for i in range(len(weightMatrix[0])) if any(row[i] for row in vertWeights)]
+    return influenceIds, [row[i] for row in vertWeights for i in influenceIds]
+
+def GroupIndicesByValue(values, valueCount):
+    if np is not None:
+        values = np.asarray(values)
+        order = np.argsort(values, kind="stable")
+        splits = np.cumsum(np.bincount(values, minlength=valueCount))[:-1]
+        return np.split(order, splits)
+
+    groups = [[] for _ in range(valueCount)]
+    for index, value in enumerate(values):
+        groups[value].append(index)
+
+    return groups
+
+def GetVertFaceAdjacency(mesh):
+    meshFn = om.MFnMesh(GetMeshDagPath(mesh))
+    faceVertCounts, faceVerts = meshFn.getVertices()
+    faceVerts = list(faceVerts)
+
+    vertFaces = [[] for _ in range(meshFn.numVertices)]
+    faceVertStart = 0
+    for faceId, faceVertCount in enumerate(faceVertCounts):
+        faceVertEnd = faceVertStart + faceVertCount
+        for vertId in faceVerts[faceVertStart:faceVertEnd]:
+            vertFaces[vertId].append(faceId)
+        faceVertStart = faceVertEnd
+
+    return vertFaces
+
+class MeshData:
+    def __init__(self, mesh):
+        meshPath = GetMeshDagPath(mesh)
+        meshFn = om.MFnMesh(meshPath)
+        self.points = meshFn.getPoints()
+
+        faceVertCounts, faceVerts = meshFn.getVertices()
+        self.faceVertCounts = list(faceVertCounts)
+        self.faceVerts = list(faceVerts)
+        self.faceVertOffsets = GetOffsets(self.faceVertCounts)
+
+        self.uValues, self.vValues = meshFn.getUVs()
+        faceUVCounts, faceUVIds = meshFn.getAssignedUVs()
+        self.faceUVCounts = list(faceUVCounts)
+        self.faceUVIds = list(faceUVIds)
+        self.faceUVOffsets = GetOffsets(self.faceUVCounts)
+
+        self.shadingEngines, self.faceShaderIds = GetShadingAssignment(meshPath)
+
+def GetShadingAssignment(meshPath):
+    # the shading engines on the mesh, and the one each face uses as an index into them, -1 for faces with none
+    shaders, faceShaderIds = om.MFnMesh(meshPath).getConnectedShaders(meshPath.instanceNumber())
+    return [om.MFnDependencyNode(shader).name() for shader in shaders], list(faceShaderIds)
+
+def AssignShadingEngines(mesh, shadingEngines, faceShaderIds):
+    facesByShadingEngine = {}
+    for faceId, shaderId in enumerate(faceShaderIds):
+        shadingEngine = shadingEngines[shaderId] if shaderId >= 0 else "initialShadingGroup"
+        facesByShadingEngine.setdefault(shadingEngine, []).append(faceId)
+
+    # one material goes on the whole mesh, more are assigned per face range
+    if len(facesByShadingEngine) <= 1:
+        mc.sets(mesh, e=True, forceElement=next(iter(facesByShadingEngine), "initialShadingGroup"))
+        return
+
+    for shadingEngine, faces in facesByShadingEngine.items():
+        mc.sets(RangesToComponentNames(mesh, "f", IndicesToRanges(faces)), e=True, forceElement=shadingEngine)
+
+def GetOffsets(counts):
+    offsets = []
+    offset = 0
+    for count in counts:
+        offsets.append(offset)
+        offset += count
+
+    return offsets
+
+def GetFacesMeshArrays(meshData: MeshData, faces):
+    # the arrays a mesh holding only the given faces is built from, with the source id of each of its vertices
+    vertRemap = {}
+    srcVertIds = []
+    faceVertCounts = []
+    faceVerts = []
+
+    uvRemap = {}
+    uValues = []
+    vValues = []
+    faceUVCounts = []
+    faceUVIds = []
+
+    for face in faces:
+        faceVertStart = meshData.faceVertOffsets[face]
+        faceVertCount = meshData.faceVertCounts[face]
+        faceVertCounts.append(faceVertCount)
+        for srcVertId in meshData.faceVerts[faceVertStart:faceVertStart + faceVertCount]:
+            vertId = vertRemap.get(srcVertId)
+            if vertId is None:
+                vertId = len(srcVertIds)
+                vertRemap[srcVertId] = vertId
+                srcVertIds.append(srcVertId)
+            faceVerts.append(vertId)
+
+        faceUVStart = meshData.faceUVOffsets[face]
+        faceUVCount = meshData.faceUVCounts[face]
+        faceUVCounts.append(faceUVCount)
+        for srcUVId in meshData.faceUVIds[faceUVStart:faceUVStart + faceUVCount]:
+            uvId = uvRemap.get(srcUVId)
+            if uvId is None:
+                uvId = len(uValues)
+                uvRemap[srcUVId] = uvId
+                uValues.append(meshData.uValues[srcUVId])
+                vValues.append(meshData.vValues[srcUVId])
+            faceUVIds.append(uvId)
+
+    return {"points": GetVertPointValues(meshData.points, srcVertIds), "faceVertCounts": faceVertCounts, "faceVerts": faceVerts, "uValues": uValues, "vValues": vValues,
+            "faceUVCounts": faceUVCounts, "faceUVIds": faceUVIds, "srcVertIds": srcVertIds, "srcFaceIds": list(faces)}
+
+def GetVertPointValues(points, vertIds):
+    # points are kept flat as x, y, z so the arrays can be written out as they are
+    pointValues = array("d")
+    for vertId in vertIds:
+        point = points[vertId]
+        pointValues.extend((point.x, point.y, point.z))
+
+    return pointValues
+
+def CreateMeshFromArrays(meshArrays, name, shadingEngines, faceShaderIds):
+    # faceShaderIds are the source mesh's, the new faces pick theirs up through srcFaceIds
+    pointValues = meshArrays["points"]
+    points = [om.MPoint(pointValues[i], pointValues[i + 1], pointValues[i + 2]) for i in range(0, len(pointValues), 3)]
+    meshFn = om.MFnMesh()
+    transform = meshFn.create(points, meshArrays["faceVertCounts"], meshArrays["faceVerts"], meshArrays["uValues"], meshArrays["vValues"])
+    if len(meshArrays["faceUVIds"]) != 0:
+        meshFn.assignUVs(meshArrays["faceUVCounts"], meshArrays["faceUVIds"])
+
+    meshName = mc.rename(om.MFnDagNode(transform).fullPathName(), name)
+    AssignShadingEngines(meshName, shadingEngines, [faceShaderIds[srcFaceId] for srcFaceId in meshArrays["srcFaceIds"]])
+    return meshName
+
+def GetPointBoundsInSpace(mesh, toSpaceMatrix):
+    # min and max corners of the mesh's world points once moved into another space, like a joint's
+    points = om.MFnMesh(GetMeshDagPath(mesh)).getPoints(om.MSpace.kWorld)
+    if np is not None:
+        spacePoints = np.array(points, dtype=np.float64)[:, :4] @ np.array(toSpaceMatrix, dtype=np.float64).reshape(4, 4)
+        spacePoints = spacePoints[:, :3] / spacePoints[:, 3:]
+        return spacePoints.min(axis=0).tolist(), spacePoints.max(axis=0).tolist()
+
+    spacePoints = [point * toSpaceMatrix for point in points]
+    return [min(point[axis] for point in spacePoints) for axis in range(3)], [max(point[axis] for point in spacePoints) for axis in range(3)]
+
+def GetPointBytes(points):
+    if np is not None:
+        return np.array(points, dtype=np.float64)[:, :3].tobytes()
+
+    pointValues = array("d")
+    for point in points:
+        pointValues.extend((point.x, point.y, point.z))
+
+    return pointValues.tobytes()
+
+def GetOrigMeshDagPath(skin, mesh):
+    # the undeformed shape feeding the skin cluster, it stays put whatever pose or frame the scene is on
+    filterFn = oma.MFnGeometryFilter(GetMObject(skin))
+    origShape = filterFn.inputShapeAtIndex(filterFn.indexForOutputShape(GetMeshDagPath(mesh).node()))
+    return om.MDagPath.getAPathTo(origShape)
+
+def GetBindPreMatrices(skin):
+    # the inverse of each influence's world matrix at bind time, by influence name
+    skinFn = oma.MFnSkinCluster(GetMObject(skin))
+    bindPreMatrices = {}
+    for influencePath in skinFn.influenceObjects():
+        influenceIndex = skinFn.indexForInfluenceObject(influencePath)
+        bindPreMatrices[influencePath.partialPathName()] = mc.getAttr(f"{skin}.bindPreMatrix[{influenceIndex}]")
+
+    return bindPreMatrices
+
+def UpdateMeshDigest(meshHash, meshPath):
+    meshFn = om.MFnMesh(meshPath)
+    faceVertCounts, faceVerts = meshFn.getVertices()
+    meshHash.update(GetPointBytes(meshFn.getPoints()))
+    meshHash.update(array("i", faceVertCounts).tobytes())
+    meshHash.update(array("i", faceVerts).tobytes())
+
+def UpdateTopologyDigest(meshHash, meshPath):
+    # the faces and uvs without the points, which move with every pose
+    meshFn = om.MFnMesh(meshPath)
+    for values in (*meshFn.getVertices(), *meshFn.getAssignedUVs()):
+        meshHash.update(array("i", values).tobytes())
+    for values in meshFn.getUVs():
+        meshHash.update(array("f", values).tobytes())
+
+def UpdateSkinDigest(meshHash, skin, weights, influences):
+    meshHash.update(json.dumps(influences).encode("utf-8"))
+    meshHash.update(array("d", weights).tobytes())
+    meshHash.update(json.dumps(GetBindPreMatrices(skin), sort_keys=True).encode("utf-8"))
+
+def GetMeshStateDigest(mesh):
+    # a skinned mesh is hashed by its undeformed shape and its skin, so scrubbing or posing the rig leaves it unchanged
+    meshHash = hashlib.sha1()
+    skin = FindFirstConnectionIn(GetMeshDagPath(mesh).fullPathName(), GetUpperStream, ["skinCluster"], DEFORMER_STACK_TYPES)
+    if not skin:
+        UpdateMeshDigest(meshHash, GetMeshDagPath(mesh))
+        return meshHash.hexdigest()
+
+    weights, influences = GetSkinWeights(skin, mesh)
+    UpdateSkinDigest(meshHash, skin, weights, influences)
+    UpdateMeshDigest(meshHash, GetOrigMeshDagPath(skin, mesh))
+    return meshHash.hexdigest()
+
+def GetSceneState():
+    return [mc.file(q=True, sceneName=True)]
+
+ANIM_CURVE_TYPES = ["animCurveTA", "animCurveTL", "animCurveTT", "animCurveTU", "animCurveUA", "animCurveUL", "animCurveUT", "animCurveUU"]
+
+def GetAnimInputs(nodes):
+    # the keys of the curves driving the given nodes, directly or through the controls, constraints and driven keys in between,
+    # and the values on the way nothing drives, like a static ik/fk switch, a pole vector offset or a constraint weight
+    animCurveKeys = {}
+    staticValues = {}
+    typeCache = {}
+    for node in list(IterConnectionsIn(nodes, GetUpperStream, typeCache=typeCache)) + list(nodes):
+        if typeCache.get(node) not in ANIM_CURVE_TYPES:
+            staticValues[node] = GetStaticAttrValues(node)
+            continue
+
+        times = mc.keyframe(node, q=True, tc=True) or []
+        values = mc.keyframe(node, q=True, vc=True) or []
+        animCurveKeys[node] = list(zip(times, values))
+
+    return animCurveKeys, staticValues
+
+def GetStaticAttrValues(node):
+    # a connected attribute is not settable, so values that change with the current frame are left out
+    attrs = mc.listAttr(node, keyable=True, scalar=True, multi=True, settable=True) or []
+    return {attr: mc.getAttr(f"{node}.{attr}") for attr in attrs}
+
+def GetAnimCurveKeysInRange(animCurveKeys, frameMin, frameMax):
+    # the keys just outside the range are kept too, they shape the curve at the range edges
+    keysInRange = {}
+    for animCurve, keys in animCurveKeys.items():
+        times = [time for time, value in keys]
+        first = max(bisect.bisect_left(times, frameMin) - 1, 0)
+        last = bisect.bisect_right(times, frameMax) + 1
+        if keys:
+            keysInRange[animCurve] = keys[first:last]
+
+    return keysInRange
+
+def MergeFrameRanges(frameRanges):
+    mergedRanges = []
+    for startFrame, endFrame in sorted(frameRanges):
+        if mergedRanges and startFrame <= mergedRanges[-1][1] + 1:
+            mergedRanges[-1][1] = max(mergedRanges[-1][1], endFrame)
+        else:
+            mergedRanges.append([startFrame, endFrame])
+
+    return mergedRanges
+
+def GetComponentIndex(componentName):
+    return int(componentName[componentName.rindex("[") + 1:-1])
+
+def IndicesToRanges(indices):
+    ranges = []
+    for index in sorted(indices):
+        if ranges and index == ranges[-1][1] + 1:
+            ranges[-1][1] = index
+        else:
+            ranges.append([index, index])
+
+    return ranges
+
+def InvertRanges(ranges, count):
+    invertedRanges = []
+    nextStart = 0
+    for start, end in ranges:
+        if start > nextStart:
+            invertedRanges.append([nextStart, start - 1])
+        nextStart = end + 1
+
+    if nextStart < count:
+        invertedRanges.append([nextStart, count - 1])
+
+    return invertedRanges
+
+def RangesToComponentNames(obj, componentType, ranges):
+    componentNames = []
+    for start, end in ranges:
+        if start == end:
+            componentNames.append(f"{obj}.{componentType}[{start}]")
+        else:
+            componentNames.append(f"{obj}.{componentType}[{start}:{end}]")
+
+    return componentNames
+
+bulkEditDepth = 0
+
+@contextmanager
+def BulkEdit(name):
+    # everything run inside undoes as one step with the viewport frozen, the yielded record gets the command count and time
+    global bulkEditDepth
+    record = {"name": name, "commands": 0, "seconds": 0.0}
+
+    def CountCommand(command, clientData):
+        record["commands"] += 1
+
+    mc.undoInfo(openChunk=True, chunkName=name)
+    # nested edits leave the refresh to the outermost one, so the viewport stays frozen until it is done
+    if bulkEditDepth == 0:
+        mc.refresh(suspend=True)
+    bulkEditDepth += 1
+
+    callbackId = om.MCommandMessage.addCommandCallback(CountCommand)
+    startTime = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record["seconds"] = time.perf_counter() - startTime
+        om.MMessage.removeCallback(callbackId)
+
+        bulkEditDepth -= 1
+        if bulkEditDepth == 0:
+            mc.refresh(suspend=False)
+        mc.undoInfo(closeChunk=True)
+
+        if bulkEditDepth == 0:
+            print(f"{name} ran {record['commands']} commands in {record['seconds']:.2f}s")
+
 def GetMayaMainWindow()->QMainWindow:
     mainWindow = omui.MQtUtil.mainWindow()
     return shiboken2.wrapInstance(int(mainWindow), QMainWindow)
@@ -1,11 +1,20 @@
+import json
 import os
+import shutil
+import tempfile
+import threading
 from MayaUtils import *
-from PySide2.QtCore import Signal
+from PySide2.QtCore import QObject, Qt, QTimer, Signal
 from PySide2.QtGui import QIntValidator, QRegExpValidator
-from PySide2.QtWidgets import QCheckBox, QFileDialog, QHBoxLayout, QLabel, QLineEdit, QListWidget, QMessageBox, QPushButton, QVBoxLayout
+from PySide2.QtWidgets import QCheckBox, QFileDialog, QHBoxLayout, QLabel, QLineEdit, QListWidget, QMessageBox, QProgressBar, QPushButton, QVBoxLayout
 import maya.cmds as mc
 import MayaPlugins
-import remote_execution
+from UnrealSession import GetUnrealSession
+from ExportManifest import ExportManifest, HashInputs
+from StageReport import StageReport
+from WorkerPool import GetMayaPyPath, SplitIntoBatches, WorkerJob, WorkerPool
+
+SINGLE_BAKE_CHUNK_NAME = "MayaToUESingleBake"
 
 def TryAction(actionFunc):
     def wrapper(*args, **kwargs):
@@ -16,6 +25,9 @@ def TryAction(actionFunc):
     
     return wrapper
 
+def PrintWorkerMessage(job, message):
+    print(f"{job.name}: {message}")
+
 class AnimClip:
     def __init__(self):
         self.subfix = ""
@@ -31,19 +43,155 @@ class MayaToUE:
         self.animations : list[AnimClip] = []
         self.fileName = ""
         self.saveDir = ""
+        self.useParallelExport = False
+        self.useExportCache = True
+        self.useSingleBake = False
+        self.lastImportResults = {}
+        self.pendingSend = None
+        self.report = StageReport("")
+        self.exportWorkerCount = os.cpu_count() or 1
+        self.exportWorkerCommand = []
+        self.onExportWorkerMessage = None
 
     def SendToUnreal(self):
+        for _ in self.ExportForUnrealSteps():
+            pass
+
+        self.FinishSendToUnreal(self.ImportToUnreal())
+
+    def ExportForUnrealSteps(self):
+        # runs all the maya side work, yielding (stage, step, stepCount) between stages so a caller can keep the ui alive
+        self.pendingSend = None
+        self.report = StageReport(f"Send {self.fileName}")
+        manifest = ExportManifest(self.saveDir) if self.useExportCache else None
+
         # Save the files:
+        meshPath = self.GetSkeletalMeshSavePath()
+        with self.report.Stage("Hash Mesh Inputs", count=len(self.models)):
+            meshHash = self.GetSkeletalMeshInputHash() if manifest else ""
+        shouldImportMesh = not manifest or not manifest.IsUpToDate(meshPath, meshHash)
+        if shouldImportMesh:
+            yield "Export Mesh", 0, 1
+            with self.report.Stage("Export Mesh") as record:
+                self.ExportSkeletalMesh()
+                record["bytes"] = os.path.getsize(meshPath)
+
+        animClipsToExport = []
+        animClipHashes = {}
+        if self.animations:
+            os.makedirs(os.path.join(self.saveDir, "animations"), exist_ok=True)
+            with self.report.Stage("Hash Clip Inputs", count=len(self.animations)):
+                animCurveKeys, staticValues = GetAnimInputs(self.GetJointsToExport()) if manifest else ({}, {})
+                for animClip in self.GetAnimClipsToExport():
+                    if not manifest:
+                        animClipsToExport.append(animClip)
+                        continue
+
+                    animClipHashes[animClip] = self.GetAnimClipInputHash(animClip, animCurveKeys, staticValues)
+                    if not manifest.IsUpToDate(self.GetSavePathForAnimClip(animClip), animClipHashes[animClip]):
+                        animClipsToExport.append(animClip)
+
+            if self.useParallelExport:
+                yield from self.ExportAnimClipsInWorkersSteps(animClipsToExport)
+            elif self.useSingleBake:
+                yield from self.ExportAnimClipsFromSingleBakeSteps(animClipsToExport)
+            else:
+                yield from self.ExportAnimClipsSteps(animClipsToExport)
+
+        if not shouldImportMesh and not animClipsToExport:
+            print("Nothing changed since the last send, skipping the Unreal import")
+            return
+
+        ueUtilPath = os.path.join(MayaPlugins.srcDir, "UnrealUtils.py")
+        ueUtilPath = os.path.normpath(ueUtilPath)
+
+        self.pendingSend = {
+            "manifest": manifest,
+            "ueUtilPath": ueUtilPath,
+            "meshPath": meshPath.replace("\\", "/"),
+            "meshHash": meshHash,
+            "shouldImportMesh": shouldImportMesh,
+            "aimDir": os.path.join(self.saveDir, "animations").replace("\\", "/"),
+            "animPaths": [self.GetSavePathForAnimClip(animClip).replace("\\", "/") for animClip in animClipsToExport],
+            "animClipHashes": [animClipHashes.get(animClip, "") for animClip in animClipsToExport],
+        }
+
+    def ImportToUnreal(self):
+        # no maya calls in here, this is safe to run off the main thread
+        pendingSend = self.pendingSend
+        if not pendingSend:
+            return None
+
+        unrealSession = GetUnrealSession()
+        unrealSession.report = self.report
+        try:
+            importResults = unrealSession.CallModuleFunction(pendingSend["ueUtilPath"], "ImportMeshAndAnimations", 
+                                                              meshPath=pendingSend["meshPath"], 
+                                                              animDir=pendingSend["aimDir"], 
+                                                              animPaths=pendingSend["animPaths"], 
+                                                              importMesh=pendingSend["shouldImportMesh"])
+        finally:
+            unrealSession.report = None
+
+        self.lastImportResults = importResults
+        if pendingSend["shouldImportMesh"]:
+            self.report.Add("Import Mesh", importResults["timings"]["mesh"], "unreal", count=1)
+        self.report.Add("Import Animations", importResults["timings"]["animations"], "unreal", count=len(pendingSend["animPaths"]))
+        print(f"Imported {importResults['mesh']} in {importResults['timings']['mesh']:.2f}s, {len(pendingSend['animPaths'])} animations in {importResults['timings']['animations']:.2f}s")
+
+        failedImports = [animResult["file"] for animResult in importResults["animations"] if not animResult["success"]]
+        if failedImports:
+            self.SaveReport()
+            raise Exception("Unreal failed to import: " + ", ".join(failedImports))
+
+        return importResults
+
+    def FinishSendToUnreal(self, importResults):
+        pendingSend = self.pendingSend
+        self.pendingSend = None
+
+        # only remember what unreal actually got, so a failed import is retried next time
+        manifest = pendingSend["manifest"] if pendingSend and importResults else None
+        if manifest:
+            manifest.Update(pendingSend["meshPath"], pendingSend["meshHash"])
+            for animPath, animClipHash in zip(pendingSend["animPaths"], pendingSend["animClipHashes"]):
+                manifest.Update(animPath, animClipHash)
+            manifest.Save()
+
+        self.SaveReport()
+
+    def SaveReport(self):
+        print(self.report.GetSummary())
+        if os.path.isdir(self.saveDir):
+            self.report.SaveJson(os.path.join(self.saveDir, "send_report.json"))
+            self.report.SaveCsv(os.path.join(self.saveDir, "send_report.csv"))
+
+    def GetSkeletalMeshInputHash(self):
+        objectsToExport = mc.ls(self.GetObjectsToExport(), long=True)
+        meshStates = [GetMeshStateDigest(model) for model in sorted(self.models)]
+        return HashInputs(sorted(objectsToExport), meshStates, GetSceneState())
+
+    def GetAnimClipInputHash(self, animClip: AnimClip, animCurveKeys, staticValues):
+        objectsToExport = mc.ls(self.GetObjectsToExport(), long=True)
+        keysInRange = GetAnimCurveKeysInRange(animCurveKeys, animClip.frameMin, animClip.frameMax)
+        return HashInputs(sorted(objectsToExport), animClip.subfix, animClip.frameMin, animClip.frameMax, keysInRange, staticValues, GetSceneState())
+
+    def GetJointsToExport(self):
         allJnts = []
         allJnts.append(self.rootJnt)
         children = mc.listRelatives(self.rootJnt, c=True, ad=True, type="joint")
         if children:
             allJnts.extend(children)
 
+        return allJnts
+
+    def GetObjectsToExport(self):
+        allJnts = self.GetJointsToExport()
         allMeshes = self.models
-        allObjectsToExport = allJnts + list(allMeshes)
+        return allJnts + list(allMeshes)
 
-        mc.select(allObjectsToExport, r=True)
+    def ExportSkeletalMesh(self):
+        mc.select(self.GetObjectsToExport(), r=True)
         skeletalMeshExportPath = self.GetSkeletalMeshSavePath()
 
         mc.FBXResetExport() # resets all the settings
@@ -53,48 +201,135 @@ class MayaToUE:
         # -f means the file name, -s means export selected, -ea means export animation
         mc.FBXExport('-f', skeletalMeshExportPath, '-s', True, '-ea', False)
 
-        if self.animations:
-            mc.FBXExportBakeComplexAnimation('-v', True)
-            os.makedirs(os.path.join(self.saveDir, "animations"), exist_ok=True)
+    def GetAnimClipsToExport(self):
+        return [animClip for animClip in self.animations if animClip.shouldExport]
 
-            for animClip in self.animations:
-                if not animClip.shouldExport:
-                    continue
+    def ExportAnimClips(self, animClips: list[AnimClip]):
+        for _ in self.ExportAnimClipsSteps(animClips):
+            pass
 
-                animExportPath = self.GetSavePathForAnimClip(animClip)
+    def ExportAnimClipsSteps(self, animClips: list[AnimClip]):
+        if not animClips:
+            return
 
-                startFrame = animClip.frameMin
-                endFrame = animClip.frameMax
+        for i, animClip in enumerate(animClips):
+            yield f"Bake Clip {animClip.subfix}", i, len(animClips)
+            self.ExportAnimClip(animClip)
 
-                mc.FBXExportBakeComplexStart('-v', startFrame)
-                mc.FBXExportBakeComplexEnd('-v', endFrame)
-                mc.FBXExportBakeComplexStep('-v', 1)
+    def ExportAnimClip(self, animClip: AnimClip, fromBakedKeys = False):
+        # the artist can change the selection or the fbx settings between two ticks, so both are set again right before each export
+        animExportPath = self.GetSavePathForAnimClip(animClip)
+        startFrame = animClip.frameMin
+        endFrame = animClip.frameMax
 
-                mc.playbackOptions(e=True, min=startFrame, max=endFrame)
+        mc.select(self.GetObjectsToExport(), r=True)
+        mc.FBXResetExport()
+        mc.FBXExportSmoothingGroups("-v", True)
+        mc.FBXExportInputConnections("-v", False)
+        if fromBakedKeys:
+            # the joints already have a key on every frame, the clip is exported as a take over its slice of them without evaluating the rig again
+            mc.FBXExportBakeComplexAnimation('-v', False)
+            mc.FBXExportSplitAnimationIntoTakes('-v', animClip.subfix, startFrame, endFrame)
+            mc.FBXExportDeleteOriginalTakeOnSplitAnimation('-v', True)
+            stageName = f"Export Clip {animClip.subfix}"
+        else:
+            mc.FBXExportBakeComplexAnimation('-v', True)
+            mc.FBXExportBakeComplexStart('-v', startFrame)
+            mc.FBXExportBakeComplexEnd('-v', endFrame)
+            mc.FBXExportBakeComplexStep('-v', 1)
+            stageName = f"Bake And Export Clip {animClip.subfix}"
 
-                mc.FBXExport('-f', animExportPath, "-s", True, '-ea', True)
-        
-        ueUtilPath = os.path.join(MayaPlugins.srcDir, "UnrealUtils.py")
-        ueUtilPath = os.path.normpath(ueUtilPath)
+        mc.playbackOptions(e=True, min=startFrame, max=endFrame)
 
-        meshPath = self.GetSkeletalMeshSavePath().replace("\\", "/")
-        aimDir = os.path.join(self.saveDir, "animations").replace("\\", "/")
+        with self.report.Stage(stageName, count=int(endFrame - startFrame + 1)) as record:
+            mc.FBXExport('-f', animExportPath, "-s", True, '-ea', True)
+            record["bytes"] = os.path.getsize(animExportPath)
 
-        commandLines = []
-        with open(ueUtilPath, 'r') as ueUtilityFile:
-            commandLines = ueUtilityFile.readlines()
+    def ExportAnimClipsFromSingleBake(self, animClips: list[AnimClip]):
+        for _ in self.ExportAnimClipsFromSingleBakeSteps(animClips):
+            pass
 
-        commandLines.append(f"\nImportMeshAndAnimations(\'{meshPath}\', \'{aimDir}\')")
+    def ExportAnimClipsFromSingleBakeSteps(self, animClips: list[AnimClip]):
+        if not animClips:
+            return
 
-        command = "".join(commandLines)
-        print(command)
+        if not mc.undoInfo(q=True, state=True):
+            print("Undo is turned off, the rig could not be restored after a single bake, baking each clip instead")
+            yield from self.ExportAnimClipsSteps(animClips)
+            return
 
-        remoteExec = remote_execution.RemoteExecution()
-        remoteExec.start()
-        remoteExec.open_command_connection(remoteExec.remote_nodes)
-        remoteExec.run_command(command)
-        remoteExec.stop()
+        allJnts = self.GetJointsToExport()
+        frameRanges = MergeFrameRanges([(animClip.frameMin, animClip.frameMax) for animClip in animClips])
 
+        # bake every unique frame once into plain keys on the joints, then each clip only exports its slice of those keys.
+        # nothing yields while the undo chunk is open, edits the artist made in between ticks would be undone along with the bake
+        yield "Bake And Export Clips", 0, len(animClips)
+        mc.undoInfo(openChunk=True, chunkName=SINGLE_BAKE_CHUNK_NAME)
+        try:
+            for startFrame, endFrame in frameRanges:
+                with self.report.Stage(f"Bake Frames {startFrame}-{endFrame}", count=int(endFrame - startFrame + 1)):
+                    mc.bakeResults(allJnts, t=(startFrame, endFrame), sampleBy=1, simulation=True, preserveOutsideKeys=True, disableImplicitControl=True)
+            mc.delete(allJnts, constraints=True)
+
+            for animClip in animClips:
+                self.ExportAnimClip(animClip, fromBakedKeys=True)
+        finally:
+            mc.undoInfo(closeChunk=True)
+            # puts the rig back the way it was before the bake. a chunk that failed before its first edit never reaches the
+            # undo queue, and undoing then would take back the artist's own last edit
+            if mc.undoInfo(q=True, undoName=True) == SINGLE_BAKE_CHUNK_NAME:
+                mc.undo()
+
+    def ExportAnimClipsInWorkers(self, animClips: list[AnimClip]):
+        for _ in self.ExportAnimClipsInWorkersSteps(animClips):
+            pass
+
+    def ExportAnimClipsInWorkersSteps(self, animClips: list[AnimClip]):
+        if not animClips:
+            return
+
+        # workers load a snapshot of the scene, exportAll leaves the current scene name untouched
+        workDir = tempfile.mkdtemp(prefix="MayaToUE_")
+        snapshotPath = os.path.join(workDir, "snapshot.mb")
+        with self.report.Stage("Save Scene Snapshot") as record:
+            mc.file(snapshotPath, exportAll=True, type="mayaBinary", force=True, preserveReferences=True)
+            record["bytes"] = os.path.getsize(snapshotPath)
+
+        clipCosts = [animClip.frameMax - animClip.frameMin + 1 for animClip in animClips]
+        jobs = []
+        for i, batch in enumerate(SplitIntoBatches(animClips, clipCosts, self.exportWorkerCount)):
+            jobPath = os.path.join(workDir, f"job{i}.json")
+            with open(jobPath, 'w') as jobFile:
+                json.dump({
+                    "scene": snapshotPath,
+                    "objects": self.GetObjectsToExport(),
+                    "clips": [{
+                        "subfix": animClip.subfix,
+                        "frameMin": animClip.frameMin,
+                        "frameMax": animClip.frameMax,
+                        "path": self.GetSavePathForAnimClip(animClip),
+                    } for animClip in batch],
+                }, jobFile)
+            jobs.append(WorkerJob(f"job{i}", [jobPath]))
+
+        pool = WorkerPool(self.exportWorkerCommand or self.GetDefaultExportWorkerCommand(), self.exportWorkerCount)
+        pool.onMessage = self.onExportWorkerMessage or PrintWorkerMessage
+        try:
+            with self.report.Stage(f"Bake Clips In {len(jobs)} Workers", count=len(animClips)) as record:
+                for _ in pool.RunSteps(jobs):
+                    exportedCount = sum(len(job.results) for job in jobs)
+                    yield f"Bake Clips In {len(jobs)} Workers", exportedCount, len(animClips)
+                record["bytes"] = sum(result.get("bytes", 0) for job in jobs for result in job.results)
+        finally:
+            shutil.rmtree(workDir, ignore_errors=True)
+
+        failedJobs = [job for job in jobs if not job.Succeeded()]
+        if failedJobs:
+            errors = [error for job in failedJobs for error in job.errors] or [f"{job.name} exited with {job.returnCode}" for job in failedJobs]
+            raise Exception("Animation export failed! " + "; ".join(errors))
+
+    def GetDefaultExportWorkerCommand(self):
+        return [GetMayaPyPath(), os.path.join(MayaPlugins.srcDir, "FBXExportWorker.py")]
 
     def GetSkeletalMeshSavePath(self):
         savePath = os.path.join(self.saveDir, self.fileName + ".fbx")
@@ -123,6 +358,9 @@ class MayaToUE:
         for sel in selection:
             if IsMesh(sel):
                 meshes.append(sel)
+                meshShapes = mc.listRelatives(sel, s=True, ni=True) or []
+                if not meshShapes or not FindFirstConnectionIn(meshShapes[0], GetUpperStream, ["skinCluster"], DEFORMER_STACK_TYPES, 200):
+                    print(f"{sel} is not bound to any skin, it will export as a static mesh!")
 
         if len(meshes) == 0:
             raise Exception("No mesh selected! Please select all the meshes of your rig!")
@@ -140,10 +378,11 @@ class MayaToUE:
             if currentRootPos[0] == 0 and currentRootPos[1] == 0 and currentRootPos[2] == 0:
                 raise Exception("Current root joint is at origin already! No need to make a new one!")
         
-        mc.select(cl=True)
-        rootJntName = self.rootJnt + "_root"
-        mc.joint(n=rootJntName)
-        mc.parent(self.rootJnt, rootJntName)
+        with BulkEdit("AddRootJoint"):
+            mc.select(cl=True)
+            rootJntName = self.rootJnt + "_root"
+            mc.joint(n=rootJntName)
+            mc.parent(self.rootJnt, rootJntName)
         self.rootJnt = rootJntName
 
     def SetSelectedJointAsRoot(self):
@@ -153,6 +392,82 @@ class MayaToUE:
         
         self.rootJnt = selection[0]
 
+class SendToUnrealJob(QObject):
+    progressChanged = Signal(str, int, int)
+    succeeded = Signal()
+    failed = Signal(str)
+    cancelled = Signal()
+    cancellableChanged = Signal(bool)
+    importDone = Signal(object, str)
+
+    def __init__(self, mayaToUE: MayaToUE):
+        super().__init__()
+        self.mayaToUE = mayaToUE
+        self.steps = None
+        self.isCancelled = False
+
+        # maya commands have to run on the main thread, so the export steps run one per timer tick to let the ui breathe in between
+        self.stepTimer = QTimer()
+        self.stepTimer.setInterval(0)
+        self.stepTimer.timeout.connect(self.RunNextStep)
+        self.importDone.connect(self.ImportDone, Qt.QueuedConnection)
+
+    def Start(self):
+        self.isCancelled = False
+        self.steps = self.mayaToUE.ExportForUnrealSteps()
+        self.stepTimer.start()
+
+    def Cancel(self):
+        self.isCancelled = True
+        if self.stepTimer.isActive():
+            self.stepTimer.stop()
+            self.steps.close() # runs the cleanup of the step that was in flight
+            self.mayaToUE.pendingSend = None
+            self.cancelled.emit()
+
+    def RunNextStep(self):
+        try:
+            stage, step, stepCount = next(self.steps)
+            self.progressChanged.emit(stage, step, stepCount)
+        except StopIteration:
+            self.stepTimer.stop()
+            if not self.mayaToUE.pendingSend:
+                self.mayaToUE.FinishSendToUnreal(None)
+                self.succeeded.emit()
+                return
+
+            threading.Thread(target=self.RunImport, daemon=True).start()
+        except Exception as e:
+            self.stepTimer.stop()
+            self.failed.emit(f"{e}")
+
+    def RunImport(self):
+        try:
+            self.progressChanged.emit("Connect to Unreal", 0, 2)
+            GetUnrealSession().EnsureConnection()
+            if self.isCancelled:
+                self.importDone.emit(None, "")
+                return
+
+            # unreal imports the whole batch in one call, there is nothing to stop in between
+            self.cancellableChanged.emit(False)
+            self.progressChanged.emit("Import into Unreal (can't be cancelled)", 1, 2)
+            self.importDone.emit(self.mayaToUE.ImportToUnreal(), "")
+        except Exception as e:
+            self.importDone.emit(None, f"{e}")
+
+    def ImportDone(self, importResults, error):
+        # a cancel clicked while unreal was importing comes too late, the assets are in and get recorded as sent
+        if importResults is None and self.isCancelled:
+            self.mayaToUE.pendingSend = None
+            self.cancelled.emit()
+        elif error:
+            self.mayaToUE.pendingSend = None
+            self.failed.emit(error)
+        else:
+            self.mayaToUE.FinishSendToUnreal(importResults)
+            self.succeeded.emit()
+
 class AnimClipWidget(QWidget):
     animClipRemoved = Signal(AnimClip)
     animClipSubfixChanged = Signal(str)
@@ -283,9 +598,61 @@ class MayaToUEWidget(MayaWindow):
         self.savePreviewLabel = QLabel("")
         self.masterLayout.addWidget(self.savePreviewLabel)
 
-        sendToUEBtn = QPushButton("Send to Unreal")
-        sendToUEBtn.clicked.connect(self.mayaToUE.SendToUnreal)
-        self.masterLayout.addWidget(sendToUEBtn)
+        parallelExportCheckbox = QCheckBox("Export Clips In Parallel")
+        parallelExportCheckbox.setChecked(self.mayaToUE.useParallelExport)
+        parallelExportCheckbox.toggled.connect(self.ParallelExportCheckboxToggled)
+        self.masterLayout.addWidget(parallelExportCheckbox)
+
+        singleBakeCheckbox = QCheckBox("Bake Overlapping Clips Once")
+        singleBakeCheckbox.setChecked(self.mayaToUE.useSingleBake)
+        singleBakeCheckbox.toggled.connect(self.SingleBakeCheckboxToggled)
+        self.masterLayout.addWidget(singleBakeCheckbox)
+
+        self.sendToUEBtn = QPushButton("Send to Unreal")
+        self.sendToUEBtn.clicked.connect(self.SendToUEBtnClicked)
+        self.masterLayout.addWidget(self.sendToUEBtn)
+
+        self.sendProgressLayout = QHBoxLayout()
+        self.masterLayout.addLayout(self.sendProgressLayout)
+
+        self.sendProgressLabel = QLabel("")
+        self.sendProgressLayout.addWidget(self.sendProgressLabel)
+
+        self.sendProgressBar = QProgressBar()
+        self.sendProgressLayout.addWidget(self.sendProgressBar)
+
+        self.cancelSendBtn = QPushButton("Cancel")
+        self.cancelSendBtn.setEnabled(False)
+        self.sendProgressLayout.addWidget(self.cancelSendBtn)
+
+        self.sendJob = SendToUnrealJob(self.mayaToUE)
+        self.sendJob.progressChanged.connect(self.SendProgressChanged)
+        self.sendJob.succeeded.connect(lambda : self.SendEnded("Sent to Unreal"))
+        self.sendJob.cancelled.connect(lambda : self.SendEnded("Send cancelled"))
+        self.sendJob.failed.connect(self.SendFailed)
+        self.sendJob.cancellableChanged.connect(self.cancelSendBtn.setEnabled)
+        self.cancelSendBtn.clicked.connect(self.sendJob.Cancel)
+
+    def SendToUEBtnClicked(self):
+        self.sendToUEBtn.setEnabled(False)
+        self.cancelSendBtn.setEnabled(True)
+        self.sendJob.Start()
+
+    def SendProgressChanged(self, stage, step, stepCount):
+        self.sendProgressLabel.setText(stage)
+        self.sendProgressBar.setRange(0, stepCount)
+        self.sendProgressBar.setValue(step)
+
+    def SendEnded(self, message):
+        self.sendToUEBtn.setEnabled(True)
+        self.cancelSendBtn.setEnabled(False)
+        self.sendProgressLabel.setText(message)
+        self.sendProgressBar.setRange(0, 1)
+        self.sendProgressBar.setValue(1)
+
+    def SendFailed(self, error):
+        self.SendEnded("Send failed")
+        QMessageBox().critical(None, "Error!", error)
 
     def UpdateSavePreviewLabel(self):
         previewText = self.mayaToUE.GetSkeletalMeshSavePath()
@@ -295,6 +662,12 @@ class MayaToUEWidget(MayaWindow):
 
         self.savePreviewLabel.setText(previewText)
 
+    def ParallelExportCheckboxToggled(self, checked):
+        self.mayaToUE.useParallelExport = checked
+
+    def SingleBakeCheckboxToggled(self, checked):
+        self.mayaToUE.useSingleBake = checked
+
     def PickDirBtnClicked(self):
         pickedPath = QFileDialog().getExistingDirectory()
         self.saveDirLineEdit.setText(pickedPath)
@@ -336,4 +709,5 @@ class MayaToUEWidget(MayaWindow):
             self.rootJntText.setText(self.mayaToUE.rootJnt)
 
 
-MayaToUEWidget().show()
+if not mc.about(batch=True):
+    MayaToUEWidget().show()
@@ -0,0 +1,78 @@
+import json
+import os
+import sys
+import time
+import maya.standalone
+from WorkerPool import EmitWorkerMessage
+
+# Runs inside mayapy: python ProxyBuildWorker.py <job.json>
+# The job holds one scene, the meshes to build proxies for (all skinned meshes when empty), and where to save the result.
+
+def GetSkinnedMeshes():
+    import maya.cmds as mc
+    meshes = []
+    for skin in mc.ls(type="skinCluster") or []:
+        for shape in mc.skinCluster(skin, q=True, g=True) or []:
+            mesh = mc.listRelatives(shape, p=True)[0]
+            if mesh not in meshes:
+                meshes.append(mesh)
+
+    return meshes
+
+def BuildProxiesForMesh(job, mesh):
+    import maya.cmds as mc
+    from ProxyGenerator import ProxyGenerator
+
+    if not mc.objExists(mesh):
+        raise Exception(f"{mesh} is not in {job['scene']}")
+
+    mc.select(mesh, r=True)
+    generator = ProxyGenerator()
+    generator.useRigidProxies = job.get("rigid", False)
+    generator.triangleBudget = job.get("triangleBudget", 0)
+    generator.reducePercentage = job.get("reducePercentage", 0)
+    generator.useBoxStandIns = job.get("boxStandIns", False)
+    chunks = generator.BuildProxyForSelectedMesh()
+    if not chunks:
+        raise Exception(f"{mesh} is not a skinned mesh")
+
+    return chunks
+
+def BuildProxies(job):
+    import maya.cmds as mc
+
+    mc.file(job["scene"], o=True, f=True)
+    for mesh in job["meshes"] or GetSkinnedMeshes():
+        EmitWorkerMessage("progress", mesh=mesh, stage="build")
+        startTime = time.perf_counter()
+        try:
+            chunks = BuildProxiesForMesh(job, mesh)
+        except Exception as e:
+            # a mesh that fails is reported with its result, the other meshes still get built and the scene saved
+            EmitWorkerMessage("result", mesh=mesh, chunks=0, seconds=time.perf_counter() - startTime, error=f"{e}")
+            continue
+
+        EmitWorkerMessage("result", mesh=mesh, chunks=len(chunks), seconds=time.perf_counter() - startTime)
+
+    fileType = "mayaAscii" if job["output"].lower().endswith(".ma") else "mayaBinary"
+    mc.file(rename=job["output"])
+    mc.file(save=True, type=fileType, f=True)
+    EmitWorkerMessage("saved", path=job["output"], bytes=os.path.getsize(job["output"]))
+
+def Main(jobPath):
+    with open(jobPath, 'r') as jobFile:
+        job = json.load(jobFile)
+
+    maya.standalone.initialize(name="python")
+    try:
+        BuildProxies(job)
+    except Exception as e:
+        EmitWorkerMessage("error", message=f"{e}")
+        return 1
+    finally:
+        maya.standalone.uninitialize()
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(Main(sys.argv[1]))
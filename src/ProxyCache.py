@@ -0,0 +1,110 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+from array import array
+from MayaUtils import GetOrigMeshDagPath, UpdateTopologyDigest
+
+# Built proxy chunks saved per source mesh, keyed by a hash of everything they are split by: the faces and uvs of the
+# undeformed shape, the skin influences and their weights. The points are left out and taken from the mesh on every
+# build, so posing the rig does not throw the cache away. A cache file is a json header followed by the raw chunk
+# arrays, read back straight out of a memory map.
+
+CACHE_MAGIC = b"PXC1"
+CACHE_VERSION = 3
+PREFIX_FORMAT = "<4sI"
+PREFIX_SIZE = struct.calcsize(PREFIX_FORMAT)
+ARRAY_TYPES = {"faceVertCounts": "i", "faceVerts": "i", "uValues": "f", "vValues": "f",
+               "faceUVCounts": "i", "faceUVIds": "i", "srcVertIds": "i", "srcFaceIds": "i"}
+
+def AlignTo8(size):
+    return (size + 7) & ~7
+
+def HashProxyInputs(skin, mesh, influences, weights):
+    # weights are the flat vertex * influence array the skin cluster hands back
+    inputHash = hashlib.sha1(f"{CACHE_VERSION}".encode("utf-8"))
+    UpdateTopologyDigest(inputHash, GetOrigMeshDagPath(skin, mesh))
+    inputHash.update(json.dumps(influences).encode("utf-8"))
+    inputHash.update(array("d", weights).tobytes())
+    return inputHash.hexdigest()
+
+class ProxyCache:
+    def __init__(self, cacheDir):
+        self.cacheDir = cacheDir
+
+    def GetPath(self, mesh):
+        return os.path.join(self.cacheDir, mesh.replace("|", "_").replace(":", "_") + ".proxycache")
+
+    def Load(self, mesh, inputHash):
+        # returns the chunk arrays by joint, or None when the mesh has no cache or it was built from other inputs
+        path = self.GetPath(mesh)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'rb') as cacheFile, mmap.mmap(cacheFile.fileno(), 0, access=mmap.ACCESS_READ) as cacheMap:
+                magic, headerSize = struct.unpack_from(PREFIX_FORMAT, cacheMap)
+                if magic != CACHE_MAGIC:
+                    return None
+
+                # only the header is read when the hash does not match
+                header = json.loads(cacheMap[PREFIX_SIZE:PREFIX_SIZE + headerSize])
+                if header["hash"] != inputHash:
+                    print(f"{mesh} changed since its proxies were cached, rebuilding")
+                    return None
+
+                dataStart = AlignTo8(PREFIX_SIZE + headerSize)
+                jntChunkArrays = {}
+                with memoryview(cacheMap) as cacheView:
+                    for chunk in header["chunks"]:
+                        jntChunkArrays[chunk["jnt"]] = {name: self.ReadArray(cacheView, dataStart, *arrayInfo) for name, arrayInfo in chunk["arrays"].items()}
+
+                return jntChunkArrays
+        except (OSError, ValueError, KeyError, TypeError, struct.error):
+            print(f"Proxy cache {path} is unreadable, rebuilding")
+            return None
+
+    def ReadArray(self, cacheView, dataStart, typecode, offset, count):
+        start = dataStart + offset
+        with cacheView[start:start + count * array(typecode).itemsize] as arrayBytes, arrayBytes.cast(typecode) as values:
+            return values.tolist()
+
+    def Save(self, mesh, inputHash, jntChunkArrays):
+        # returns the cache path, or None when it could not be written, the build goes on without it
+        header = {"version": CACHE_VERSION, "mesh": mesh, "hash": inputHash, "chunks": []}
+        arrays = []
+        offset = 0
+        for jnt, chunkArrays in jntChunkArrays.items():
+            arrayInfos = {}
+            for name, typecode in ARRAY_TYPES.items():
+                values = array(typecode, chunkArrays[name])
+                arrayInfos[name] = [typecode, offset, len(values)]
+                arrays.append(values)
+                offset += AlignTo8(len(values) * values.itemsize)
+
+            header["chunks"].append({"jnt": jnt, "arrays": arrayInfos})
+
+        headerBytes = json.dumps(header).encode("utf-8")
+        path = self.GetPath(mesh)
+        # written next to the cache and swapped in, so a build reading it never sees half a file
+        tempPath = path + f".{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cacheDir, exist_ok=True)
+            with open(tempPath, 'wb') as cacheFile:
+                cacheFile.write(struct.pack(PREFIX_FORMAT, CACHE_MAGIC, len(headerBytes)))
+                cacheFile.write(headerBytes)
+                cacheFile.write(bytes(AlignTo8(PREFIX_SIZE + len(headerBytes)) - PREFIX_SIZE - len(headerBytes)))
+                for values in arrays:
+                    arrayBytes = values.tobytes()
+                    cacheFile.write(arrayBytes)
+                    cacheFile.write(bytes(AlignTo8(len(arrayBytes)) - len(arrayBytes)))
+
+            os.replace(tempPath, path)
+        except OSError as e:
+            print(f"Warning: could not save the proxy cache {path}, the proxies are built without it: {e}")
+            if os.path.exists(tempPath):
+                os.remove(tempPath)
+            return None
+
+        return path
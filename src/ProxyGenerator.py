@@ -1,9 +1,18 @@
 import importlib
+import os
+import tempfile
 import MayaUtils
 importlib.reload(MayaUtils)
 
-from MayaUtils import GetUpperStream, IsJoint, IsMesh, IsSkin, GetAllConnectionsIn, MayaWindow
-from PySide2.QtWidgets import QLabel, QPushButton, QVBoxLayout
+from MayaUtils import BulkEdit, GetUpperStream, IsMesh, MayaWindow
+from MayaUtils import DEFORMER_STACK_TYPES, FindFirstConnectionIn, IterConnectionsIn
+from MayaUtils import GetComponentIndex, GetMaxInfluenceIndices, GetSkinWeights, GetVertFaceAdjacency, GroupIndicesByValue
+from MayaUtils import CreateMeshFromArrays, GetFacesMeshArrays, IndicesToRanges, InvertRanges, MeshData, RangesToComponentNames
+from MayaUtils import GetMeshDagPath, GetPointBoundsInSpace, GetShadingAssignment, GetVertPointValues, GetWeightsForVerts, SetSkinWeights, ToWeightMatrix
+from ProxyCache import HashProxyInputs, ProxyCache
+from PySide2.QtGui import QIntValidator
+from PySide2.QtWidgets import QCheckBox, QHBoxLayout, QLabel, QLineEdit, QPushButton, QVBoxLayout
+import maya.api.OpenMaya as om
 import maya.cmds as mc
 
 class ProxyGenerator:
@@ -11,6 +20,22 @@ class ProxyGenerator:
         self.skin = ""
         self.model = ""
         self.jnts = []
+        self.useBulkWeights = True
+        self.useSinglePassExtraction = True
+        self.useDirectSkinTransfer = True
+        self.useRigidProxies = False
+        self.triangleBudget = 0
+        self.reducePercentage = 0
+        self.minChunkTriangles = 12
+        self.useBoxStandIns = False
+        self.useProxyCache = False
+        self.cacheDir = None
+        self.chunkVertIds = {}
+        self.jntChunkArrays = {}
+        self.weights = []
+        self.weightMatrix = []
+        self.influences = []
+        self.vertOwners = []
 
     def BuildProxyForSelectedMesh(self):
         model = mc.ls(sl=True)[0]
@@ -20,90 +45,249 @@ class ProxyGenerator:
         
         self.model = model
         modelShape = mc.listRelatives(self.model,s=True)[0]
-        skin = GetAllConnectionsIn(modelShape, GetUpperStream, IsSkin)
+        skin = FindFirstConnectionIn(modelShape, GetUpperStream, ["skinCluster"], DEFORMER_STACK_TYPES)
         if not skin:
             print(f"{self.model} is not bound!")
             return
         
-        jnts = GetAllConnectionsIn(modelShape, GetUpperStream, IsJoint)
+        jnts = list(IterConnectionsIn(skin, GetUpperStream, ["joint"], expandTypes=[]))
         if not jnts:
             print(f"{self.model} is not bound with any joint!")
             return
         
-        self.skin = skin[0]
+        self.skin = skin
         self.jnts = jnts
+        self.influences = []
+        self.weightMatrix = []
         print(f"found model {self.model} with skin {self.skin} and joints: {self.jnts}")
 
+        with BulkEdit("BuildProxyForSelectedMesh"):
+            jntChunkDict = self.CreateProxyModels()
+            jntChunkDict = self.SimplifyProxyModels(jntChunkDict)
+            chunks = []
+            ctrls = []
+            for jnt, newChunk in jntChunkDict.items():
+                if self.useRigidProxies:
+                    self.ConstrainProxyModel(newChunk, jnt)
+                else:
+                    self.BindProxyModel(newChunk)
+                chunks.append(newChunk)
+
+                # meshes bound to the same skeleton each get their own controls, and maya's names are used in case it renamed one anyway
+                ctrlName = mc.spaceLocator(n="ac_" + self.model + "_" + jnt + "_proxy")[0]
+                ctrlGrpName = mc.group(ctrlName, n=ctrlName + "_grp")
+                mc.matchTransform(ctrlGrpName, jnt)
+
+                visibilityAttr = "vis"
+                mc.addAttr(ctrlName, ln=visibilityAttr, min=0, max=1, dv=1, k=True)
+                mc.connectAttr(ctrlName + "." + visibilityAttr, newChunk + ".v")
+                ctrls.append(ctrlGrpName)
+
+            proxyTopGrp = mc.group(chunks, n=self.model + "_proxy_grp")
+            ctrlTopGrp = mc.group(ctrls, n="ac_" + self.model + "_proxy_grp")
+            globalProxyCtrl = mc.circle(n="ac_" + self.model + "_proxy_global", r=20)[0]
+
+            mc.parent(proxyTopGrp, globalProxyCtrl)
+            mc.parent(ctrlTopGrp, globalProxyCtrl)
+
+            mc.setAttr(proxyTopGrp + ".inheritsTransform", 0)
+
+            mc.addAttr(globalProxyCtrl, ln="vis", min=0, max=1, k=True, dv=1)
+            mc.connectAttr(globalProxyCtrl + ".vis", proxyTopGrp+".v")
+            return chunks
+
+
+
+
+    def CreateProxyModels(self):
+        if not self.useProxyCache or not self.useSinglePassExtraction:
+            jntVertDict = self.GenerateJntVertsDict()
+            jntFacesDict = self.GenerateJntFacesDict(jntVertDict)
+            return self.CreateProxyModelsForJntFaces(jntFacesDict)
+
+        # the chunks only depend on the faces and the weights, so a build from the same inputs is read back from disk
+        self.LoadSkinWeights()
+        proxyCache = self.GetProxyCache()
+        inputHash = HashProxyInputs(self.skin, self.model, self.influences, self.weights)
+        jntChunkArrays = proxyCache.Load(self.model, inputHash)
+        if jntChunkArrays is not None:
+            print(f"loaded proxy chunks for {self.model} from {proxyCache.GetPath(self.model)}")
+            # the points are not cached, the chunks take them from the mesh as it is posed now
+            meshPath = GetMeshDagPath(self.model)
+            points = om.MFnMesh(meshPath).getPoints()
+            for chunkArrays in jntChunkArrays.values():
+                chunkArrays["points"] = GetVertPointValues(points, chunkArrays["srcVertIds"])
+
+            shadingEngines, faceShaderIds = GetShadingAssignment(meshPath)
+            return self.CreateProxyModelsFromArrays(jntChunkArrays, shadingEngines, faceShaderIds)
+
+        meshData = MeshData(self.model)
         jntVertDict = self.GenerateJntVertsDict()
-        chunks = []
-        ctrls = []
-        for jnt, verts in jntVertDict.items():
-            newChunk = self.CreateProxyModelForJntAndVerts(jnt, verts)
-            if not newChunk:
-                continue
+        jntFacesDict = self.GenerateJntFacesDict(jntVertDict)
+        jntChunkDict = self.ExtractProxyModelsForJntFaces(jntFacesDict, meshData)
+        proxyCache.Save(self.model, inputHash, self.jntChunkArrays)
+        return jntChunkDict
+
+    def GetProxyCache(self):
+        # under the temp directory unless told otherwise, so building proxies never writes next to the scenes
+        return ProxyCache(self.cacheDir or os.path.join(tempfile.gettempdir(), "ProxyCache"))
+
+    def SimplifyProxyModels(self, jntChunkDict):
+        if self.useBoxStandIns:
+            return {jnt: self.ReplaceWithBoxStandIn(chunk, jnt) for jnt, chunk in jntChunkDict.items()}
+
+        if self.triangleBudget > 0:
+            chunkAreas = {chunk: mc.polyEvaluate(chunk, wa=True) for chunk in jntChunkDict.values()}
+            chunkTriangles = {chunk: mc.polyEvaluate(chunk, t=True) for chunk in jntChunkDict.values()}
+            for chunk, triangleCount in self.GetChunkTriangleTargets(chunkAreas, chunkTriangles).items():
+                if triangleCount < chunkTriangles[chunk]:
+                    self.ReduceProxyModel(chunk, triangleCount=triangleCount)
+        elif self.reducePercentage > 0:
+            for chunk in jntChunkDict.values():
+                self.ReduceProxyModel(chunk, percentage=self.reducePercentage)
+
+        return jntChunkDict
+
+    def GetChunkTriangleTargets(self, chunkAreas, chunkTriangles):
+        # bigger chunks get a bigger share of the budget, so the silhouette stays even across the body.
+        # a chunk held up at minChunkTriangles takes its extra triangles from the others, and a chunk already under
+        # its share hands the rest back, so the targets only add up to more than the budget when the minimums alone do
+        targets = {}
+        pending = dict(chunkAreas)
+        budget = self.triangleBudget
+        while pending:
+            totalArea = sum(pending.values())
+            shares = {chunk: budget * area / totalArea if totalArea else budget / len(pending) for chunk, area in pending.items()}
+            floors = {chunk: min(self.minChunkTriangles, chunkTriangles[chunk]) for chunk in pending}
+            settled = {chunk: floors[chunk] for chunk, share in shares.items() if share < floors[chunk]}
+            if not settled:
+                settled = {chunk: chunkTriangles[chunk] for chunk, share in shares.items() if share >= chunkTriangles[chunk]}
+            if not settled:
+                targets.update({chunk: int(share) for chunk, share in shares.items()})
+                break
+
+            for chunk, triangleCount in settled.items():
+                targets[chunk] = triangleCount
+                budget -= triangleCount
+                del pending[chunk]
+            budget = max(budget, 0)
+
+        return targets
+
+    def ReduceProxyModel(self, chunk, triangleCount = None, percentage = None):
+        if triangleCount is not None:
+            mc.polyReduce(chunk, ver=1, trm=2, tct=triangleCount, kqw=0, ch=False)
+        else:
+            mc.polyReduce(chunk, ver=1, trm=0, p=percentage, ch=False)
+
+        # the vertex ids no longer match the source mesh, the weights get copied by closest point instead
+        self.chunkVertIds.pop(chunk, None)
+
+    def ReplaceWithBoxStandIn(self, chunk, jnt):
+        # the box is built in its joint's axes, so a limb bent away from the world axes gets a box along the bone
+        jntMatrix = om.MMatrix(mc.xform(jnt, q=True, ws=True, m=True))
+        (minX, minY, minZ), (maxX, maxY, maxZ) = GetPointBoundsInSpace(chunk, jntMatrix.inverse())
+        minSize = max(maxX - minX, maxY - minY, maxZ - minZ) * 0.01 or 0.01
+        mc.delete(chunk)
+        self.chunkVertIds.pop(chunk, None)
+
+        box = mc.polyCube(n=chunk, w=max(maxX - minX, minSize), h=max(maxY - minY, minSize), d=max(maxZ - minZ, minSize), ch=False)[0]
+        centerMatrix = om.MMatrix([1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, (minX + maxX) / 2, (minY + maxY) / 2, (minZ + maxZ) / 2, 1])
+        mc.xform(box, ws=True, m=list(centerMatrix * jntMatrix))
+        return box
+
+    def ConstrainProxyModel(self, chunk, jnt):
+        # no deformer, the chunk just follows its joint, so playback only pays for one transform per chunk
+        return mc.parentConstraint(jnt, chunk, mo=True)[0]
+
+    def BindProxyModel(self, chunk):
+        srcVertIds = self.chunkVertIds.get(chunk)
+        if self.useDirectSkinTransfer and srcVertIds is not None:
+            return self.TransferSkinWeightsToChunk(chunk, srcVertIds)
+
+        newSkinCluster = mc.skinCluster(self.jnts, chunk)[0]
+        mc.copySkinWeights(ss=self.skin, ds=newSkinCluster, nm=True, sa="closestPoint", ia="closestJoint")
+        return newSkinCluster
+
+    def TransferSkinWeightsToChunk(self, chunk, srcVertIds):
+        # every chunk vertex comes from the source mesh, so its weights are written over directly
+        if not self.influences:
+            self.LoadSkinWeights()
+
+        influenceIds, weights = GetWeightsForVerts(self.weightMatrix, srcVertIds)
+        chunkInfluences = [self.influences[influenceId] for influenceId in influenceIds]
+        newSkinCluster = mc.skinCluster(chunkInfluences, chunk, tsb=True)[0]
+        SetSkinWeights(newSkinCluster, chunk, chunkInfluences, weights)
+        return newSkinCluster
+
+    def CreateProxyModelsForJntFaces(self, jntFacesDict):
+        if self.useSinglePassExtraction:
+            return self.ExtractProxyModelsForJntFaces(jntFacesDict)
 
-            newSkinCluster = mc.skinCluster(self.jnts, newChunk)[0]
-            mc.copySkinWeights(ss=self.skin, ds=newSkinCluster, nm=True, sa="closestPoint", ia="closestJoint")
-            chunks.append(newChunk)
-
-            ctrlName = "ac_" + jnt + "_proxy"
-            mc.spaceLocator(n=ctrlName)
-            ctrlGrpName = ctrlName + "_grp"
-            mc.group(ctrlName, n=ctrlGrpName)
-            mc.matchTransform(ctrlGrpName, jnt)
-
-            visibilityAttr = "vis"
-            mc.addAttr(ctrlName, ln=visibilityAttr, min=0, max=1, dv=1, k=True)
-            mc.connectAttr(ctrlName + "." + visibilityAttr, newChunk + ".v")
-            ctrls.append(ctrlGrpName)
-
-        proxyTopGrp = self.model + "_proxy_grp"
-        mc.group(chunks, n=proxyTopGrp)
-
-        ctrlTopGrp = "ac_" + self.model + "_proxy_grp"
-        mc.group(ctrls, n=ctrlTopGrp)
+        dict = {}
+        for jnt, faces in jntFacesDict.items():
+            newChunk = self.CreateProxyModelForJntAndFaces(jnt, faces)
+            if newChunk:
+                dict[jnt] = newChunk
 
-        globalProxyCtrl = "ac_" + self.model + "_proxy_global"
-        mc.circle(n=globalProxyCtrl, r=20)
+        return dict
 
-        mc.parent(proxyTopGrp, globalProxyCtrl)
-        mc.parent(ctrlTopGrp, globalProxyCtrl)
+    def ExtractProxyModelsForJntFaces(self, jntFacesDict, meshData = None):
+        # reads the source mesh once and builds every chunk from its own faces, no full duplicates needed
+        if meshData is None:
+            meshData = MeshData(self.model)
 
-        mc.setAttr(proxyTopGrp + ".inheritsTransform", 0)
+        self.jntChunkArrays = {}
+        for jnt, faces in jntFacesDict.items():
+            if len(faces) != 0:
+                self.jntChunkArrays[jnt] = GetFacesMeshArrays(meshData, faces)
 
-        mc.addAttr(globalProxyCtrl, ln="vis", min=0, max=1, k=True, dv=1)
-        mc.connectAttr(globalProxyCtrl + ".vis", proxyTopGrp+".v")
+        return self.CreateProxyModelsFromArrays(self.jntChunkArrays, meshData.shadingEngines, meshData.faceShaderIds)
 
+    def CreateProxyModelsFromArrays(self, jntChunkArrays, shadingEngines, faceShaderIds):
+        modelMatrix = mc.xform(self.model, q=True, ws=True, m=True)
+        self.chunkVertIds = {}
 
+        dict = {}
+        for jnt, chunkArrays in jntChunkArrays.items():
+            chunkName = self.model + "_" + jnt + "_proxy"
+            newChunk = CreateMeshFromArrays(chunkArrays, chunkName, shadingEngines, faceShaderIds)
+            mc.xform(newChunk, ws=True, m=modelMatrix)
+            self.chunkVertIds[newChunk] = chunkArrays["srcVertIds"]
+            dict[jnt] = newChunk
 
+        return dict
 
-    def CreateProxyModelForJntAndVerts(self, jnt, verts):
-        if not verts:
+    def CreateProxyModelForJntAndFaces(self, jnt, faces):
+        if len(faces) == 0:
             return None
-        
-        faces = mc.polyListComponentConversion(verts, fromVertex=True, toFace=True)
-        faces = mc.ls(faces, fl=True)
-
-        faceNames = set()
-        for face in faces:
-            faceNames.add(face.replace(self.model, ""))
 
         dup = mc.duplicate(self.model)[0]
-        allDupFaces = mc.ls(f"{dup}.f[*]", fl=True)
-        facesToDelete = []
-        for dupFace in allDupFaces:
-            if dupFace.replace(dup, "") not in faceNames:
-                facesToDelete.append(dupFace)
+        faceCount = mc.polyEvaluate(dup, f=True)
+        rangesToDelete = InvertRanges(IndicesToRanges(faces), faceCount)
+        if rangesToDelete:
+            mc.delete(RangesToComponentNames(dup, "f", rangesToDelete))
 
-        mc.delete(facesToDelete)
+        return mc.rename(dup, self.model + "_" + jnt + "_proxy")
 
-        dupName = self.model + "_" + jnt + "_proxy"
-        mc.rename(dup, dupName)
-        return dupName
+    def GenerateJntFacesDict(self, jntVertsDict):
+        vertFaces = GetVertFaceAdjacency(self.model)
 
+        dict = {}
+        for jnt, verts in jntVertsDict.items():
+            faces = set()
+            for vert in verts:
+                if isinstance(vert, str):
+                    vert = GetComponentIndex(vert)
+                faces.update(vertFaces[vert])
+            dict[jnt] = sorted(faces)
 
+        return dict
 
     def GenerateJntVertsDict(self):
+        if self.useBulkWeights:
+            return self.GenerateJntVertIdsDict()
+
         dict = {}
         for jnt in self.jnts:
             dict[jnt] = []
@@ -116,6 +300,29 @@ class ProxyGenerator:
         
         return dict
 
+    def GenerateJntVertIdsDict(self):
+        dict = {}
+        for jnt in self.jnts:
+            dict[jnt] = []
+
+        if not self.influences:
+            self.LoadSkinWeights()
+
+        if not self.influences:
+            return dict
+
+        self.vertOwners = GetMaxInfluenceIndices(self.weightMatrix)
+        ownedVertIds = GroupIndicesByValue(self.vertOwners, len(self.influences))
+        for influence, vertIds in zip(self.influences, ownedVertIds):
+            if len(vertIds) != 0:
+                dict[influence] = vertIds
+
+        return dict
+
+    def LoadSkinWeights(self):
+        self.weights, self.influences = GetSkinWeights(self.skin, self.model)
+        self.weightMatrix = ToWeightMatrix(self.weights, len(self.influences)) if self.influences else []
+
     def GetJntWithMaxInfluence(self, vert, skin):
         weights = mc.skinPercent(skin, vert, q=True, v=True)
         if not weights:
@@ -141,12 +348,67 @@ class ProxyGeneratorWidget(MayaWindow):
         self.setLayout(self.masterLayout)
 
         self.masterLayout.addWidget(QLabel("Please select the rigged model, and press the build button"))
+        rigidProxiesCheckbox = QCheckBox("Rigid Proxies (No Skin, Fastest Playback)")
+        rigidProxiesCheckbox.setChecked(self.generator.useRigidProxies)
+        rigidProxiesCheckbox.toggled.connect(self.RigidProxiesCheckboxToggled)
+        self.masterLayout.addWidget(rigidProxiesCheckbox)
+        proxyCacheCheckbox = QCheckBox("Reuse Cached Proxies When The Mesh And Weights Are Unchanged")
+        proxyCacheCheckbox.setChecked(self.generator.useProxyCache)
+        proxyCacheCheckbox.toggled.connect(self.ProxyCacheCheckboxToggled)
+        self.masterLayout.addWidget(proxyCacheCheckbox)
+        boxStandInsCheckbox = QCheckBox("Box Stand-Ins")
+        boxStandInsCheckbox.setChecked(self.generator.useBoxStandIns)
+        boxStandInsCheckbox.toggled.connect(self.BoxStandInsCheckboxToggled)
+        self.masterLayout.addWidget(boxStandInsCheckbox)
+
+        triangleBudgetLayout = QHBoxLayout()
+        triangleBudgetLayout.addWidget(QLabel("Triangle Budget (0 Keeps Full Detail):"))
+        triangleBudgetLineEdit = QLineEdit(f"{self.generator.triangleBudget}")
+        triangleBudgetLineEdit.setValidator(QIntValidator(0, 100000000))
+        triangleBudgetLineEdit.textChanged.connect(self.TriangleBudgetLineEditChanged)
+        triangleBudgetLayout.addWidget(triangleBudgetLineEdit)
+        self.masterLayout.addLayout(triangleBudgetLayout)
+
+        reducePercentageLayout = QHBoxLayout()
+        reducePercentageLayout.addWidget(QLabel("Reduce Each Chunk By % (Used When There Is No Budget):"))
+        reducePercentageLineEdit = QLineEdit(f"{self.generator.reducePercentage}")
+        reducePercentageLineEdit.setValidator(QIntValidator(0, 99))
+        reducePercentageLineEdit.textChanged.connect(self.ReducePercentageLineEditChanged)
+        reducePercentageLayout.addWidget(reducePercentageLineEdit)
+        self.masterLayout.addLayout(reducePercentageLayout)
+
+        self.reportRigCostCheckbox = QCheckBox("Report Rig Cost (Playback Before/After)")
+        self.masterLayout.addWidget(self.reportRigCostCheckbox)
         buildBtn = QPushButton("Build")
         self.masterLayout.addWidget(buildBtn)
-        buildBtn.clicked.connect(self.generator.BuildProxyForSelectedMesh)
+        buildBtn.clicked.connect(self.BuildBtnClicked)
         self.setWindowTitle("Proxy Generator")
 
+    def ProxyCacheCheckboxToggled(self, checked):
+        self.generator.useProxyCache = checked
+
+    def BoxStandInsCheckboxToggled(self, checked):
+        self.generator.useBoxStandIns = checked
+
+    def TriangleBudgetLineEditChanged(self, newText):
+        self.generator.triangleBudget = int(newText) if newText else 0
+
+    def ReducePercentageLineEditChanged(self, newText):
+        self.generator.reducePercentage = int(newText) if newText else 0
+
+    def RigidProxiesCheckboxToggled(self, checked):
+        self.generator.useRigidProxies = checked
+
+    def BuildBtnClicked(self):
+        if not self.reportRigCostCheckbox.isChecked():
+            self.generator.BuildProxyForSelectedMesh()
+            return
+
+        from RigCostReport import RigCostReport
+        RigCostReport().Compare("BuildProxyForSelectedMesh", self.generator.BuildProxyForSelectedMesh)
+
     def GetWidgetUniqueName(self):
         return "ProxyGeneratorER4152025212"
     
-ProxyGeneratorWidget().show()
\ No newline at end of file
+if not mc.about(batch=True):
+    ProxyGeneratorWidget().show()
\ No newline at end of file
@@ -0,0 +1,144 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import maya.cmds as mc
+from maya.debug.emPerformanceTest import emPerformanceOptions, emPerformanceRun
+from WorkerPool import GetMayaPyPath, WorkerJob, WorkerPool
+
+# Measures what a tool run did to playback: emPerformance playback and refresh timings in DG, serial and parallel
+# evaluation, plus the SkinClusters and Deformers analytics, taken before and after the tool and saved side by side.
+
+srcDir = os.path.dirname(os.path.abspath(__file__))
+
+EVALUATION_MODES = [emPerformanceOptions.EVALUATION_MODE_DG, emPerformanceOptions.EVALUATION_MODE_EM_SERIAL, emPerformanceOptions.EVALUATION_MODE_EM_PARALLEL]
+TEST_TYPES = [emPerformanceOptions.TEST_PLAYBACK, emPerformanceOptions.TEST_REFRESH]
+ANALYTICS = ["SkinClusters", "Deformers"]
+
+def ToNumber(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return value
+
+def FlattenNumbers(data, prefix = ""):
+    # nested analytics json down to {"Deformers.summary.count": 3.0}, only the numbers can be compared
+    numbers = {}
+    if isinstance(data, dict):
+        for key, value in data.items():
+            numbers.update(FlattenNumbers(value, f"{prefix}.{key}" if prefix else f"{key}"))
+    elif isinstance(data, (int, float)) and not isinstance(data, bool):
+        numbers[prefix] = float(data)
+
+    return numbers
+
+def GetPlaybackTiming(timings, evaluationMode):
+    # emPerformance column titles read like "VP2 EMP Playback Avg"
+    for title, value in timings.items():
+        words = title.split()
+        if evaluationMode in words and emPerformanceOptions.TEST_PLAYBACK in words and "Avg" in words and isinstance(value, float):
+            return value
+
+    return None
+
+class RigCostReport:
+    def __init__(self, reportDir = None, iterationCount = 3, workerCommand = None):
+        self.reportDir = reportDir or os.path.join(tempfile.gettempdir(), "RigCostReports")
+        self.iterationCount = iterationCount
+        self.workerCommand = workerCommand or [GetMayaPyPath(), os.path.join(srcDir, "RigCostWorker.py")]
+
+    def MeasurePlayback(self):
+        options = emPerformanceOptions()
+        options.setEvalModes(EVALUATION_MODES)
+        options.setTestTypes(TEST_TYPES)
+        options.setIterationCount(self.iterationCount)
+        options.setReportProgress(False)
+
+        # no file name runs the tests on the scene as it is now
+        timing = emPerformanceRun(options=options)
+        timing.runTests()
+        return {title: ToNumber(value) for title, value in zip(timing.columnTitles(), timing.columns())}
+
+    def MeasureAnalytics(self):
+        workDir = tempfile.mkdtemp(prefix="RigCost_")
+        try:
+            snapshotPath = os.path.join(workDir, "snapshot.mb")
+            mc.file(snapshotPath, exportAll=True, type="mayaBinary", force=True, preserveReferences=True)
+
+            jobPath = os.path.join(workDir, "job.json")
+            with open(jobPath, 'w') as jobFile:
+                json.dump({"scene": snapshotPath, "analytics": ANALYTICS, "resultsDir": os.path.join(workDir, "analytics")}, jobFile)
+
+            job = WorkerJob("RigCostAnalytics", [jobPath])
+            WorkerPool(self.workerCommand, 1).Run([job])
+            if not job.Succeeded():
+                print(f"Rig cost analytics failed: {', '.join(job.errors) or job.returnCode}")
+
+            return job.results[0]["analytics"] if job.results else {}
+        finally:
+            shutil.rmtree(workDir, ignore_errors=True)
+
+    def Measure(self):
+        startTime = time.perf_counter()
+        measurement = {"playback": self.MeasurePlayback(), "analytics": self.MeasureAnalytics()}
+        measurement["seconds"] = time.perf_counter() - startTime
+        return measurement
+
+    def Compare(self, toolName, toolAction):
+        # runs the tool between two measurements, and saves both with their differences
+        before = self.Measure()
+        toolStartTime = time.perf_counter()
+        toolResult = toolAction()
+        toolSeconds = time.perf_counter() - toolStartTime
+        after = self.Measure()
+
+        report = {
+            "tool": toolName,
+            "scene": mc.file(q=True, sceneName=True),
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "toolSeconds": toolSeconds,
+            "before": before,
+            "after": after,
+            "playbackDelta": self.GetDeltas(before["playback"], after["playback"]),
+            "analyticsDelta": self.GetDeltas(FlattenNumbers(before["analytics"]), FlattenNumbers(after["analytics"])),
+            "warnings": self.GetWarnings(before["playback"], after["playback"]),
+        }
+
+        reportPath = self.SaveReport(report)
+        print(f"Rig cost report for {toolName} saved to {reportPath}")
+        for warning in report["warnings"]:
+            print(f"Warning: {warning}")
+
+        return toolResult
+
+    def GetDeltas(self, before, after):
+        deltas = {}
+        for key, afterValue in after.items():
+            beforeValue = before.get(key)
+            if isinstance(afterValue, float) and isinstance(beforeValue, float):
+                deltas[key] = afterValue - beforeValue
+
+        return deltas
+
+    def GetWarnings(self, before, after):
+        warnings = []
+        dgTime = GetPlaybackTiming(after, emPerformanceOptions.EVALUATION_MODE_DG)
+        parallelTime = GetPlaybackTiming(after, emPerformanceOptions.EVALUATION_MODE_EM_PARALLEL)
+        if dgTime and parallelTime and parallelTime > dgTime:
+            warnings.append(f"parallel playback ({parallelTime:.4f}s) is slower than DG ({dgTime:.4f}s), something in the rig is serializing evaluation")
+
+        beforeDGTime = GetPlaybackTiming(before, emPerformanceOptions.EVALUATION_MODE_DG)
+        beforeParallelTime = GetPlaybackTiming(before, emPerformanceOptions.EVALUATION_MODE_EM_PARALLEL)
+        if dgTime and parallelTime and beforeDGTime and beforeParallelTime and dgTime / parallelTime < beforeDGTime / beforeParallelTime * 0.9:
+            warnings.append(f"parallel speedup dropped from {beforeDGTime / beforeParallelTime:.2f}x to {dgTime / parallelTime:.2f}x")
+
+        return warnings
+
+    def SaveReport(self, report):
+        os.makedirs(self.reportDir, exist_ok=True)
+        reportPath = os.path.join(self.reportDir, f"rig_cost_{report['tool']}_{time.strftime('%Y%m%d_%H%M%S')}.json")
+        with open(reportPath, 'w') as reportFile:
+            json.dump(report, reportFile, indent=4, default=str)
+
+        return reportPath
@@ -0,0 +1,41 @@
+import json
+import sys
+import maya.standalone
+from WorkerPool import EmitWorkerMessage
+
+# Runs inside mayapy: python RigCostWorker.py <job.json>
+# The analytics runner opens the scenes it analyzes, so it runs here on a snapshot instead of in the artist's session.
+
+def RunAnalytics(job):
+    from maya.analytics.Runner import Runner
+    runner = Runner()
+    runner.analytics = job["analytics"]
+    runner.paths = [job["scene"]]
+    runner.results_path = job["resultsDir"]
+    runner.force = True
+    runner.return_json = True
+    runner.set_option("summary", True)
+
+    EmitWorkerMessage("progress", stage="analytics", analytics=job["analytics"])
+    results = runner.run() or {}
+    # results are indexed by file then analytic, there is only the one file here
+    analyticResults = next(iter(results.values()), {}) if results else {}
+    EmitWorkerMessage("result", analytics=analyticResults)
+
+def Main(jobPath):
+    with open(jobPath, 'r') as jobFile:
+        job = json.load(jobFile)
+
+    maya.standalone.initialize(name="python")
+    try:
+        RunAnalytics(job)
+    except Exception as e:
+        EmitWorkerMessage("error", message=f"{e}")
+        return 1
+    finally:
+        maya.standalone.uninitialize()
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(Main(sys.argv[1]))
@@ -0,0 +1,59 @@
+import csv
+import json
+import os
+import time
+from contextlib import contextmanager
+
+REPORT_FIELDS = ["source", "stage", "seconds", "bytes", "count"]
+
+class StageReport:
+    def __init__(self, name):
+        self.name = name
+        self.stages = []
+        self.startTime = time.time()
+
+    @contextmanager
+    def Stage(self, stage, source = "maya", count = 0):
+        # the yielded record can have its bytes and count filled in while the stage runs
+        record = {"source": source, "stage": stage, "seconds": 0.0, "bytes": 0, "count": count}
+        startTime = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = time.perf_counter() - startTime
+            self.stages.append(record)
+
+    def Add(self, stage, seconds, source = "maya", bytes = 0, count = 0):
+        self.stages.append({"source": source, "stage": stage, "seconds": seconds, "bytes": bytes, "count": count})
+
+    def GetTotalSeconds(self, source = None):
+        return sum(record["seconds"] for record in self.stages if source is None or record["source"] == source)
+
+    def ToDict(self):
+        return {
+            "name": self.name,
+            "startTime": self.startTime,
+            "totalSeconds": self.GetTotalSeconds(),
+            "stages": self.stages,
+        }
+
+    def SaveJson(self, path):
+        with open(path, 'w') as reportFile:
+            json.dump(self.ToDict(), reportFile, indent=4)
+
+    def SaveCsv(self, path):
+        # appends, so one csv can track a character across many sends
+        writeHeader = not os.path.exists(path)
+        with open(path, 'a', newline='') as reportFile:
+            writer = csv.DictWriter(reportFile, fieldnames=["name", "startTime"] + REPORT_FIELDS)
+            if writeHeader:
+                writer.writeheader()
+            for record in self.stages:
+                writer.writerow({"name": self.name, "startTime": self.startTime, **record})
+
+    def GetSummary(self):
+        lines = [f"{self.name}: {self.GetTotalSeconds():.2f}s"]
+        for record in self.stages:
+            lines.append(f"    [{record['source']}] {record['stage']}: {record['seconds']:.2f}s, {record['bytes']} bytes, {record['count']} items")
+
+        return "\n".join(lines)
@@ -0,0 +1,164 @@
+import ast
+import atexit
+import contextlib
+import hashlib
+import json
+import os
+import threading
+import time
+import remote_execution
+
+# Keeps one remote execution session alive for the whole maya session, so only the first send pays for
+# node discovery and the command socket handshake.
+
+class UnrealSession:
+    def __init__(self, config = None, discoveryTimeout = 10):
+        self.config = config or remote_execution.RemoteExecutionConfig()
+        self.discoveryTimeout = discoveryTimeout
+        self.remoteExec = None
+        self.nodeId = None
+        self.installedModules = {}
+        self.report = None
+        self.lock = threading.RLock()
+
+    def Start(self):
+        with self.lock:
+            if self.remoteExec:
+                return
+
+            self.remoteExec = remote_execution.RemoteExecution(self.config)
+            self.remoteExec.start()
+
+    def Stop(self):
+        with self.lock:
+            if self.remoteExec:
+                self.remoteExec.stop()
+                self.remoteExec = None
+            self.nodeId = None
+
+    def Stage(self, stage):
+        return self.report.Stage(stage, "remote") if self.report else contextlib.nullcontext({})
+
+    def GetNodeIds(self):
+        return [node["node_id"] for node in self.remoteExec.remote_nodes]
+
+    def WaitForNode(self):
+        deadline = time.time() + self.discoveryTimeout
+        while True:
+            nodeIds = self.GetNodeIds()
+            if self.nodeId in nodeIds:
+                return self.nodeId
+
+            if nodeIds:
+                return nodeIds[0]
+
+            if time.time() > deadline:
+                raise Exception("No Unreal editor found! Make sure Unreal is open with remote execution enabled.")
+
+            time.sleep(0.1)
+
+    def EnsureConnection(self):
+        with self.lock:
+            self.Start()
+            if self.nodeId in self.GetNodeIds() and self.remoteExec.has_command_connection():
+                return
+
+            with self.Stage("Unreal Discovery"):
+                nodeId = self.WaitForNode()
+
+            self.remoteExec.close_command_connection()
+            with self.Stage("Unreal Connect") as record:
+                try:
+                    self.remoteExec.open_command_connection(nodeId)
+                finally:
+                    record["count"] = self.remoteExec.command_stats.get("accept_attempts", 0)
+
+            if nodeId != self.nodeId:
+                self.installedModules = {}
+            self.nodeId = nodeId
+
+    def Disconnect(self):
+        with self.lock:
+            if self.remoteExec:
+                self.remoteExec.close_command_connection()
+            self.nodeId = None
+
+    def RunCommand(self, command, execMode = remote_execution.MODE_EXEC_FILE, raiseOnFailure = False):
+        with self.lock:
+            # a dropped socket or a timed out node gets one transparent reconnect before giving up
+            for attempt in range(2):
+                self.EnsureConnection()
+                try:
+                    result = self.remoteExec.run_command(command, exec_mode=execMode)
+                    break
+                except (OSError, RuntimeError):
+                    self.Disconnect()
+                    if attempt:
+                        raise
+
+        if raiseOnFailure and not result["success"]:
+            raise Exception(f"Unreal failed to run the command! {result['result']}")
+
+        return result
+
+    def InstallModule(self, modulePath):
+        # installs the module into the editor's sys.modules once, and again only when its source changes
+        with open(modulePath, 'r') as moduleFile:
+            source = moduleFile.read()
+
+        moduleName = os.path.splitext(os.path.basename(modulePath))[0]
+        sourceHash = hashlib.sha1(source.encode("utf-8")).hexdigest()
+        with self.lock:
+            self.EnsureConnection()
+            if self.installedModules.get(moduleName) == sourceHash:
+                return moduleName
+
+            installedHashCommand = f"getattr(__import__('sys').modules.get({moduleName!r}), '__source_hash__', None)"
+            installedHash = self.RunCommand(installedHashCommand, remote_execution.MODE_EVAL_STATEMENT, True)["result"]
+            if ParseResult(installedHash) != sourceHash:
+                bootstrapCommand = "\n".join([
+                    "import sys, types",
+                    f"_module = types.ModuleType({moduleName!r})",
+                    f"_module.__file__ = {modulePath!r}",
+                    f"_module.__source_hash__ = {sourceHash!r}",
+                    f"exec(compile({source!r}, {modulePath!r}, 'exec'), _module.__dict__)",
+                    f"sys.modules[{moduleName!r}] = _module",
+                    "del _module",
+                ])
+                with self.Stage(f"Install {moduleName}") as record:
+                    record["bytes"] = len(bootstrapCommand)
+                    self.RunCommand(bootstrapCommand, remote_execution.MODE_EXEC_FILE, True)
+                print(f"Installed {moduleName} in Unreal")
+
+            self.installedModules[moduleName] = sourceHash
+
+        return moduleName
+
+    def CallModuleFunction(self, modulePath, functionName, **kwargs):
+        with self.lock:
+            moduleName = self.InstallModule(modulePath)
+            # arguments go over as one json string literal, so paths never need hand quoting
+            callStatement = f"__import__({moduleName!r}).{functionName}(**__import__('json').loads({json.dumps(kwargs)!r}))"
+            with self.Stage(f"Call {moduleName}.{functionName}") as record:
+                statsBefore = self.remoteExec.command_stats
+                result = self.RunCommand(callStatement, remote_execution.MODE_EVAL_STATEMENT, True)
+                statsAfter = self.remoteExec.command_stats
+                record["bytes"] = sum(statsAfter.get(key, 0) - statsBefore.get(key, 0) for key in ("bytes_sent", "bytes_received"))
+
+        return ParseResult(result["result"])
+
+def ParseResult(result):
+    try:
+        return ast.literal_eval(result)
+    except (ValueError, SyntaxError):
+        return result
+
+_unrealSession = None
+
+def GetUnrealSession():
+    global _unrealSession
+    if not _unrealSession:
+        _unrealSession = UnrealSession()
+        atexit.register(_unrealSession.Stop)
+
+    return _unrealSession
@@ -1,4 +1,5 @@
 import os
+import time
 import unreal
 
 def CreateBaseImportTask(importPath):
@@ -30,6 +31,10 @@ def ImportSkeletalMesh(meshPath):
     return importTask.get_objects()[-1]
 
 def ImportAnimation(mesh, animPath):
+    importTask = CreateAnimationImportTask(mesh, animPath)
+    unreal.AssetToolsHelpers.get_asset_tools().import_asset_tasks([importTask])
+
+def CreateAnimationImportTask(mesh, animPath):
     importTask = CreateBaseImportTask(animPath)
     meshDir = os.path.dirname(mesh.get_path_name())
     importTask.destination_path = meshDir + "/animations"
@@ -45,16 +50,53 @@ def ImportAnimation(mesh, animPath):
     importOptions.set_editor_property('mesh_type_to_import', unreal.FBXImportType.FBXIT_ANIMATION)
 
     importTask.options = importOptions
+    return importTask
 
-    unreal.AssetToolsHelpers.get_asset_tools().import_asset_tasks([importTask])
 
+def LoadImportedSkeletalMesh(meshPath):
+    fileName = os.path.basename(meshPath).split('.')[0]
+    assetPath = '/Game/' + fileName + '/' + fileName
+    if not unreal.EditorAssetLibrary.does_asset_exist(assetPath):
+        return None
 
-def ImportMeshAndAnimations(meshPath, animDir):
-    mesh = ImportSkeletalMesh(meshPath)
-    print(mesh)
+    return unreal.EditorAssetLibrary.load_asset(assetPath)
+
+def ImportMeshAndAnimations(meshPath, animDir, animPaths=None, importMesh=True):
+    results = {"mesh": "", "animations": [], "timings": {}}
 
-    for file in os.listdir(animDir):
-        animPath = os.path.join(animDir, file)
-        ImportAnimation(mesh, animPath)
+    startTime = time.perf_counter()
+    mesh = None if importMesh else LoadImportedSkeletalMesh(meshPath)
+    if not mesh:
+        mesh = ImportSkeletalMesh(meshPath)
+    print(mesh)
+    results["mesh"] = mesh.get_path_name()
+    results["timings"]["mesh"] = time.perf_counter() - startTime
+
+    if animPaths is None:
+        animPaths = [os.path.join(animDir, file) for file in sorted(os.listdir(animDir)) if file.lower().endswith(".fbx")]
+
+    importTasks = []
+    for animPath in animPaths:
+        animResult = {"file": animPath, "success": False, "objects": []}
+        results["animations"].append(animResult)
+        if not os.path.isfile(animPath):
+            animResult["error"] = "file not found"
+            continue
+
+        importTasks.append((CreateAnimationImportTask(mesh, animPath), animResult))
+
+    # one batch pays for the registry refresh, package saves and fbx sdk setup once for every animation,
+    # so only the batch as a whole is timed, unreal does not report how long each task took
+    startTime = time.perf_counter()
+    if importTasks:
+        unreal.AssetToolsHelpers.get_asset_tools().import_asset_tasks([importTask for importTask, animResult in importTasks])
+    results["timings"]["animations"] = time.perf_counter() - startTime
+
+    for importTask, animResult in importTasks:
+        importedObjects = [importedObject.get_path_name() for importedObject in importTask.get_objects()]
+        animResult["objects"] = importedObjects
+        animResult["success"] = bool(importedObjects)
+
+    return results
 
 # ImportMeshAndAnimations("D:/profile redirect/ejrubio/Documents/maya/projects/AlexMayaPlugin/unrealExports/Alex.fbx", "D:/profile redirect/ejrubio/Documents/maya/projects/AlexMayaPlugin/unrealExports/animations")
\ No newline at end of file
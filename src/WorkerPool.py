@@ -0,0 +1,114 @@
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+
+# Workers talk back by printing one json message per line on stdout, e.g.
+# {"type": "progress", ...}, {"type": "result", ...} or {"type": "error", "message": ...}
+
+def GetMayaPyPath():
+    mayaPyName = "mayapy.exe" if sys.platform == "win32" else "mayapy"
+    return os.path.join(os.environ.get("MAYA_LOCATION", ""), "bin", mayaPyName)
+
+def EmitWorkerMessage(messageType, **data):
+    data["type"] = messageType
+    print(json.dumps(data), flush=True)
+
+def SplitIntoBatches(items, costs, batchCount):
+    # longest first onto the cheapest batch, keeps the batches close in total cost
+    batches = [[] for _ in range(max(1, min(batchCount, len(items))))]
+    batchCosts = [0] * len(batches)
+    for item, cost in sorted(zip(items, costs), key=lambda pair: pair[1], reverse=True):
+        cheapest = batchCosts.index(min(batchCosts))
+        batches[cheapest].append(item)
+        batchCosts[cheapest] += cost
+
+    return [batch for batch in batches if batch]
+
+class WorkerJob:
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.results = []
+        self.errors = []
+        self.returnCode = None
+
+    def Succeeded(self):
+        return self.returnCode == 0 and not self.errors
+
+class WorkerPool:
+    def __init__(self, workerCommand, workerCount = None):
+        self.workerCommand = workerCommand
+        self.workerCount = workerCount or os.cpu_count() or 1
+        self.onMessage = None
+        self.messages = queue.Queue()
+
+    def Run(self, jobs: list[WorkerJob]):
+        for _ in self.RunSteps(jobs):
+            pass
+
+        return jobs
+
+    def RunSteps(self, jobs: list[WorkerJob]):
+        # yields every time messages were checked, so the caller can keep its ui alive, closing it early kills the workers
+        pending = list(jobs)
+        running = []
+        try:
+            while pending or running:
+                while pending and len(running) < self.workerCount:
+                    running.append(self.StartJob(pending.pop(0)))
+
+                self.HandleMessages()
+                for process, job, readThread in list(running):
+                    if process.poll() is None or readThread.is_alive():
+                        continue
+
+                    job.returnCode = process.returncode
+                    running.remove((process, job, readThread))
+
+                yield jobs
+        finally:
+            for process, job, readThread in running:
+                process.kill()
+                process.wait()
+
+        self.HandleMessages()
+
+    def StartJob(self, job: WorkerJob):
+        process = subprocess.Popen(self.workerCommand + job.args, stdout=subprocess.PIPE, text=True)
+        readThread = threading.Thread(target=self.ReadWorkerOutput, args=(process, job), daemon=True)
+        readThread.start()
+        return process, job, readThread
+
+    def ReadWorkerOutput(self, process, job: WorkerJob):
+        with process.stdout:
+            for line in process.stdout:
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+
+                if isinstance(message, dict) and "type" in message:
+                    self.messages.put((job, message))
+
+    def HandleMessages(self):
+        try:
+            job, message = self.messages.get(timeout=0.05)
+        except queue.Empty:
+            return
+
+        while True:
+            if message["type"] == "result":
+                job.results.append(message)
+            elif message["type"] == "error":
+                job.errors.append(message.get("message", ""))
+
+            if self.onMessage:
+                self.onMessage(job, message)
+
+            try:
+                job, message = self.messages.get_nowait()
+            except queue.Empty:
+                return
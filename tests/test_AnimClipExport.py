@@ -0,0 +1,103 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Runs the in-process clip export steps against the fake maya scene:
+#   python -m unittest discover tests
+
+pluginDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(pluginDir, "benchmarks"))
+
+import FakeMaya
+FakeMaya.Install()
+
+import maya.cmds as mc
+
+class AnimClipExportTest(unittest.TestCase):
+    def setUp(self):
+        self.saveDir = tempfile.mkdtemp(prefix="AnimClipExportTest_")
+        os.makedirs(os.path.join(self.saveDir, "animations"))
+
+        import MayatoUE
+        self.scene = FakeMaya.NewScene()
+        model, joints, skin = FakeMaya.BuildSkinnedMesh(self.scene, "body", 100, 4)
+        FakeMaya.BuildAnimCurves(self.scene, joints, 120)
+
+        self.mayaToUE = MayatoUE.MayaToUE()
+        self.mayaToUE.rootJnt = joints[0]
+        self.mayaToUE.models = {model}
+        self.mayaToUE.fileName = "body"
+        self.mayaToUE.saveDir = self.saveDir
+        for i, (frameMin, frameMax) in enumerate([(1, 40), (30, 80), (100, 120)]):
+            animClip = self.mayaToUE.AddNewAnimClip()
+            animClip.subfix = f"_clip{i}"
+            animClip.frameMin = float(frameMin)
+            animClip.frameMax = float(frameMax)
+
+    def tearDown(self):
+        shutil.rmtree(self.saveDir, ignore_errors=True)
+
+    def RunStepsLikeTheArtist(self, steps):
+        # between two ticks the artist is free to select something else, or to start an edit of their own
+        for _ in steps:
+            self.assertEqual(self.scene.undoChunkDepth, 0)
+            mc.select(cl=True)
+
+    def AssertEveryClipExportedTheRig(self):
+        objectsToExport = self.mayaToUE.GetObjectsToExport()
+        self.assertEqual([export["path"] for export in self.scene.exports], [self.mayaToUE.GetSavePathForAnimClip(animClip) for animClip in self.mayaToUE.animations])
+        for export in self.scene.exports:
+            self.assertEqual(export["selection"], objectsToExport)
+
+    def testPerClipExportSelectsRightBeforeEachExport(self):
+        self.RunStepsLikeTheArtist(self.mayaToUE.ExportAnimClipsSteps(self.mayaToUE.animations))
+        self.AssertEveryClipExportedTheRig()
+
+    def testSingleBakeNeverYieldsWithTheUndoChunkOpen(self):
+        self.RunStepsLikeTheArtist(self.mayaToUE.ExportAnimClipsFromSingleBakeSteps(self.mayaToUE.animations))
+        self.AssertEveryClipExportedTheRig()
+        self.assertTrue(all(export["undoChunkDepth"] == 1 for export in self.scene.exports))
+        self.assertEqual(self.scene.undoChunkDepth, 0)
+        self.assertEqual(self.scene.cmdsCalls["undo"], 1)
+
+    def testSingleBakeEvaluatesEachUniqueFrameOnce(self):
+        # the clips cover frames 1-80 and 100-120, 30-40 twice
+        self.RunStepsLikeTheArtist(self.mayaToUE.ExportAnimClipsFromSingleBakeSteps(self.mayaToUE.animations))
+        self.assertEqual(self.scene.evaluatedFrames, 80 + 21)
+        for export, animClip in zip(self.scene.exports, self.mayaToUE.animations):
+            self.assertFalse(export["bakeComplex"])
+            self.assertEqual(export["frameRange"], (animClip.frameMin, animClip.frameMax))
+
+    def testPerClipExportEvaluatesEveryClipFrame(self):
+        self.RunStepsLikeTheArtist(self.mayaToUE.ExportAnimClipsSteps(self.mayaToUE.animations))
+        self.assertEqual(self.scene.evaluatedFrames, 40 + 51 + 21)
+
+    def testSingleBakeFailingBeforeItsFirstEditUndoesNothing(self):
+        def FailingBake(*args, **kwargs):
+            raise RuntimeError("bake failed")
+
+        import MayatoUE
+        MayatoUE.mc.bakeResults = FailingBake
+        self.addCleanup(delattr, MayatoUE.mc, "bakeResults")
+        with self.assertRaises(RuntimeError):
+            self.RunStepsLikeTheArtist(self.mayaToUE.ExportAnimClipsFromSingleBakeSteps(self.mayaToUE.animations))
+
+        self.assertEqual(self.scene.undoChunkDepth, 0)
+        self.assertEqual(self.scene.cmdsCalls["undo"], 0)
+
+    def testClipHashFollowsUnkeyedRigValues(self):
+        from MayaUtils import GetAnimInputs
+        # a switch on a control driving the rig, set once and never keyed
+        ctrl = self.scene.CreateNode("arm_ikfk_ctrl", "transform")
+        mc.addAttr(ctrl, ln="ikFk", dv=0.0)
+        self.scene.Connect(ctrl, self.mayaToUE.rootJnt)
+        animClip = self.mayaToUE.animations[0]
+        clipHash = self.mayaToUE.GetAnimClipInputHash(animClip, *GetAnimInputs(self.mayaToUE.GetJointsToExport()))
+
+        mc.setAttr(f"{ctrl}.ikFk", 1.0)
+        self.assertNotEqual(self.mayaToUE.GetAnimClipInputHash(animClip, *GetAnimInputs(self.mayaToUE.GetJointsToExport())), clipHash)
+
+if __name__ == "__main__":
+    unittest.main()
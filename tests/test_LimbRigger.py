@@ -0,0 +1,88 @@
+import os
+import sys
+import unittest
+
+# Rigs limbs against the fake maya scene:
+#   python -m unittest discover tests
+
+pluginDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(pluginDir, "benchmarks"))
+
+import FakeMaya
+FakeMaya.Install()
+
+import maya.cmds as mc
+
+class LimbRiggerTest(unittest.TestCase):
+    def setUp(self):
+        import LimbRigger
+        self.scene = FakeMaya.NewScene()
+        self.rigger = LimbRigger.LimbRigger()
+
+        # a humanoid with the chains the old finder mistook for limbs: spine, neck, clavicles and fingers
+        self.hips = self.scene.CreateNode("hips", "joint")
+        spine = FakeMaya.BuildLimbChain(self.scene, "spine", self.hips, ("01", "02", "03"))
+        FakeMaya.BuildLimbChain(self.scene, "neck", spine[-1], ("01", "head", "head_end"))
+        self.arms = []
+        self.legs = []
+        for side in ("l", "r"):
+            clavicle = self.scene.CreateNode(f"{side}_clavicle", "joint", spine[-1])
+            arm = FakeMaya.BuildLimbChain(self.scene, side, clavicle, ("shoulder", "elbow", "wrist"))
+            for finger in ("index", "middle", "thumb"):
+                FakeMaya.BuildLimbChain(self.scene, f"{side}_hand_{finger}", arm[-1], ("01", "02", "03"))
+            self.arms.append(tuple(arm))
+
+            leg = FakeMaya.BuildLimbChain(self.scene, side, self.hips, ("thigh", "knee", "ankle"))
+            FakeMaya.BuildLimbChain(self.scene, side, leg[-1], ("ball", "toe"))
+            self.legs.append(tuple(leg))
+
+    def testFindsOnlyArmsAndLegs(self):
+        chains = self.rigger.FindLimbChains(self.hips)
+        self.assertEqual(sorted(chains), sorted(self.arms + self.legs))
+
+    def testMatchesCommonNamingStyles(self):
+        for name in ("l_wrist_jnt", "hand_r", "LeftHand", "mixamorig:RightFoot", "Ankle_L"):
+            self.assertTrue(self.rigger.IsLimbEnd(name), name)
+        for name in ("l_elbow", "LeftForeArm", "spine_03", "head", "handle"):
+            self.assertFalse(self.rigger.IsLimbEnd(name), name)
+
+    def testRegistryHoldsTheNodesEachLimbCreated(self):
+        nodesBefore = set(self.scene.nodes)
+        report = self.rigger.RigLimbs(self.arms)
+
+        self.assertEqual(report["limbs"], 2)
+        createdNodes = set(self.scene.nodes) - nodesBefore
+        registeredNodes = [node for entry in self.rigger.rigRegistry.values() for node in entry["nodes"]]
+        self.assertEqual(len(registeredNodes), len(set(registeredNodes)))
+        self.assertLessEqual(set(registeredNodes), createdNodes)
+        for root, mid, end in self.arms:
+            self.assertIn(f"{root}_rig_grp", self.rigger.rigRegistry[root]["nodes"])
+
+    def testNoControllerTemplatesAreLeftBehind(self):
+        self.rigger.RigLimbs(self.arms)
+        self.rigger.root, self.rigger.mid, self.rigger.end = self.legs[0]
+        self.rigger.RigLimb()
+
+        self.assertEqual([node for node in self.scene.nodes if node.startswith("ctrlTemplate_")], [])
+        self.assertTrue(mc.objExists(f"ac_ik_{self.legs[0][2]}"))
+
+    def testFailedLimbIsDeletedAgain(self):
+        nodesBefore = set(self.scene.nodes)
+        poleVectorConstraint = FakeMaya.FakeCmds.poleVectorConstraint
+        def FailingPoleVectorConstraint(cmds, *args, **kwargs):
+            raise RuntimeError("pole vector failed")
+
+        FakeMaya.FakeCmds.poleVectorConstraint = FailingPoleVectorConstraint
+        try:
+            report = self.rigger.RigLimbs(self.legs)
+        finally:
+            FakeMaya.FakeCmds.poleVectorConstraint = poleVectorConstraint
+
+        self.assertEqual(report["limbs"], 0)
+        self.assertEqual(sorted(report["failed"]), sorted(leg[0] for leg in self.legs))
+        self.assertEqual(set(self.scene.nodes), nodesBefore)
+        self.assertEqual(self.rigger.rigRegistry, {})
+        self.assertEqual(self.rigger.createdControllers, [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import contextlib
+import io
+import math
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Builds proxies against the fake maya scene:
+#   python -m unittest discover tests
+
+pluginDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(pluginDir, "benchmarks"))
+
+import FakeMaya
+FakeMaya.Install()
+
+import maya.cmds as mc
+from BatchProxyGenerator import BatchProxyGenerator
+from ProxyCache import ProxyCache
+from ProxyGenerator import ProxyGenerator
+from WorkerPool import WorkerJob
+
+class ProxyGeneratorTest(unittest.TestCase):
+    def setUp(self):
+        self.scene = FakeMaya.NewScene()
+        self.body, self.joints, skin = FakeMaya.BuildSkinnedMesh(self.scene, "body", 200, 4)
+
+    def BuildProxies(self, model, **flags):
+        mc.select(model, r=True)
+        generator = ProxyGenerator()
+        for flag, value in flags.items():
+            setattr(generator, flag, value)
+
+        return generator.BuildProxyForSelectedMesh()
+
+    def testMeshesOnTheSameSkeletonGetTheirOwnControls(self):
+        shirt, shirtShape = FakeMaya.BuildGridMesh(self.scene, "shirt", 200)
+        FakeMaya.BuildSkinCluster(self.scene, self.joints, shirtShape, "skinCluster2")
+        bodyChunks = self.BuildProxies(self.body)
+        shirtChunks = self.BuildProxies(shirt)
+
+        for model, chunks in ((self.body, bodyChunks), (shirt, shirtChunks)):
+            self.assertEqual(len(chunks), len(self.joints))
+            for chunk in chunks:
+                visCtrls = [source for source in self.scene.sources[chunk] if self.scene.nodes[source].type == "transform"]
+                self.assertEqual(len(visCtrls), 1)
+                self.assertTrue(visCtrls[0].startswith(f"ac_{model}_"), visCtrls[0])
+                self.assertIn("vis", self.scene.nodes[visCtrls[0]].attrs)
+
+    def testTriangleTargetsStayWithinTheBudget(self):
+        generator = ProxyGenerator()
+        generator.triangleBudget = 1000
+        generator.minChunkTriangles = 100
+        # the two small chunks are held up at the minimum, and the one already under its share keeps what it has
+        chunkAreas = {"torso": 900.0, "arm": 1.0, "hand": 1.0, "head": 98.0}
+        chunkTriangles = {"torso": 5000, "arm": 3000, "hand": 40, "head": 60}
+        targets = generator.GetChunkTriangleTargets(chunkAreas, chunkTriangles)
+
+        self.assertEqual(targets["arm"], 100)
+        self.assertEqual(targets["hand"], 40)
+        self.assertEqual(targets["head"], 60)
+        self.assertEqual(targets["torso"], 800)
+        self.assertLessEqual(sum(targets.values()), generator.triangleBudget)
+
+    def testBoxStandInFollowsItsJoint(self):
+        chunk, chunkShape = FakeMaya.BuildGridMesh(self.scene, "chunk", 100, 100.0)
+        jnt = self.joints[1]
+        halfRoot2 = math.sqrt(0.5)
+        jntMatrix = [halfRoot2, halfRoot2, 0.0, 0.0, -halfRoot2, halfRoot2, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 50.0, 50.0, 0.0, 1.0]
+        mc.xform(jnt, ws=True, m=jntMatrix)
+        generator = ProxyGenerator()
+        box = generator.ReplaceWithBoxStandIn(chunk, jnt)
+
+        # a 100 unit square seen down a 45 degree joint spans its diagonal on both joint axes
+        boxPoints = self.scene.meshes[self.scene.GetShape(box)].points
+        for axis in (0, 1):
+            self.assertAlmostEqual(max(point[axis] for point in boxPoints) - min(point[axis] for point in boxPoints), 100.0 * math.sqrt(2))
+
+        boxMatrix = mc.xform(box, q=True, ws=True, m=True)
+        for boxValue, jntValue in zip(boxMatrix[:12], jntMatrix[:12]):
+            self.assertAlmostEqual(boxValue, jntValue)
+        for boxValue, centerValue in zip(boxMatrix[12:15], (50.0, 50.0, 0.0)):
+            self.assertAlmostEqual(boxValue, centerValue)
+
+    def testCachedChunksFollowThePose(self):
+        cacheDir = tempfile.mkdtemp(prefix="ProxyGeneratorTest_")
+        self.addCleanup(shutil.rmtree, cacheDir, ignore_errors=True)
+        self.BuildProxies(self.body, useProxyCache=True, cacheDir=cacheDir)
+
+        # moving the points is all posing does to the skinned shape, the chunks are still read from the cache
+        bodyMesh = self.scene.meshes[self.scene.GetShape(self.body)]
+        bodyMesh.points = [(x, y, z + 10.0) for x, y, z in bodyMesh.points]
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            chunks = self.BuildProxies(self.body, useProxyCache=True, cacheDir=cacheDir)
+
+        self.assertIn("loaded proxy chunks", output.getvalue())
+        for chunk in chunks:
+            self.assertTrue(all(point[2] == 10.0 for point in self.scene.meshes[self.scene.GetShape(chunk)].points), chunk)
+
+    def testUnwritableCacheStillBuilds(self):
+        cacheDir = tempfile.mkdtemp(prefix="ProxyGeneratorTest_")
+        self.addCleanup(shutil.rmtree, cacheDir, ignore_errors=True)
+        # a directory where the cache file goes makes the final swap fail after the temp file is written
+        os.makedirs(ProxyCache(cacheDir).GetPath(self.body))
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            chunks = self.BuildProxies(self.body, useProxyCache=True, cacheDir=cacheDir)
+
+        self.assertEqual(len(chunks), len(self.joints))
+        self.assertIn("could not save the proxy cache", output.getvalue())
+        self.assertEqual(os.listdir(cacheDir), [os.path.basename(ProxyCache(cacheDir).GetPath(self.body))])
+
+class BatchProxySummaryTest(unittest.TestCase):
+    def testFailedMeshDoesNotFailItsSavedScene(self):
+        job = WorkerJob("chars/hero.mb", [])
+        job.returnCode = 0
+        job.results = [{"mesh": "body", "chunks": 12, "seconds": 1.0},
+                       {"mesh": "cape", "chunks": 0, "seconds": 0.1, "error": "cape is not a skinned mesh"}]
+        summary = BatchProxyGenerator(workerCommand=["mayapy"]).GetSummary([job], 2.0)
+
+        self.assertEqual(summary["failedScenes"], [])
+        self.assertEqual(summary["failedMeshes"], [{"scene": "chars/hero.mb", "mesh": "cape", "error": "cape is not a skinned mesh"}])
+        self.assertEqual(summary["chunks"], 12)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import json
+import os
+import socket
+import sys
+import threading
+import time
+import unittest
+
+# Checks the remote execution transport against RemoteExecutionLoopbackNode, no unreal needed:
+#   python -m unittest discover tests
+
+pluginDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(pluginDir, "vendor", "unrealSDK"))
+
+import remote_execution
+
+largeCommand = "'{\"}\\\\\\n' * 100000"
+largeResultSize = len(repr(eval(largeCommand)))
+
+def SendInChunks(sock, messageBytes, chunkSize):
+    for start in range(0, len(messageBytes), chunkSize):
+        sock.sendall(messageBytes[start:start + chunkSize])
+
+class MessageReaderTest(unittest.TestCase):
+    def setUp(self):
+        self.sender, self.receiver = socket.socketpair()
+
+    def tearDown(self):
+        self.sender.close()
+        self.receiver.close()
+
+    def testJsonMessageSplitAcrossChunks(self):
+        # braces and escaped quotes inside strings must not end the message early
+        message = {"result": 'a } "quoted" \\ { b', "nested": {"list": [{"x": 1}, {"y": "}"}]}}
+        messageBytes = json.dumps(message).encode("utf-8")
+        reader = remote_execution._RemoteExecutionMessageReader(self.receiver, remote_execution._PROTOCOL_VERSION)
+        sendThread = threading.Thread(target=SendInChunks, args=(self.sender, messageBytes, 1))
+        sendThread.start()
+        self.assertEqual(reader.read_message(), messageBytes)
+        sendThread.join()
+
+    def testBackToBackJsonMessages(self):
+        first = json.dumps({"id": 1, "text": "{"}).encode("utf-8")
+        second = json.dumps({"id": 2, "text": "}"}).encode("utf-8")
+        self.sender.sendall(first + second)
+        reader = remote_execution._RemoteExecutionMessageReader(self.receiver, remote_execution._PROTOCOL_VERSION)
+        self.assertEqual(reader.read_message(), first)
+        self.assertEqual(reader.read_message(), second)
+
+    def testClosedConnectionReturnsNone(self):
+        self.sender.sendall(b'{"id": 1, "text": "cut')
+        self.sender.close()
+        reader = remote_execution._RemoteExecutionMessageReader(self.receiver, remote_execution._PROTOCOL_VERSION)
+        self.assertIsNone(reader.read_message())
+
+    def testLargeFramedMessageIsCompressed(self):
+        messageBytes = json.dumps({"result": "x" * 500000}).encode("utf-8")
+        sendThread = threading.Thread(target=remote_execution._send_message_bytes, args=(self.sender, messageBytes, remote_execution._PROTOCOL_VERSION_FRAMED))
+        sendThread.start()
+        reader = remote_execution._RemoteExecutionMessageReader(self.receiver, remote_execution._PROTOCOL_VERSION_FRAMED)
+        self.assertEqual(reader.read_message(), messageBytes)
+        sendThread.join()
+        self.assertLess(reader.bytes_received, len(messageBytes) // 10)
+
+class LoopbackNodeTest(unittest.TestCase):
+    def RunOverCommandConnection(self, protocolVersion, command, execMode):
+        # the loopback node connects back to a listening socket the way the editor does after open_connection
+        node = remote_execution.RemoteExecutionLoopbackNode(protocol_version=protocolVersion)
+        node._running = True
+        with socket.socket() as listenSocket:
+            listenSocket.bind(("127.0.0.1", 0))
+            listenSocket.listen(1)
+            serveThread = threading.Thread(target=node._serve_command_connection, args=("session", *listenSocket.getsockname(), protocolVersion))
+            serveThread.daemon = True
+            serveThread.start()
+            commandSocket = listenSocket.accept()[0]
+
+        with commandSocket:
+            message = remote_execution._RemoteExecutionMessage(remote_execution._TYPE_COMMAND, "session", node.node_id, {"command": command, "unattended": True, "exec_mode": execMode})
+            message.version = protocolVersion
+            remote_execution._send_message_bytes(commandSocket, message.to_json_bytes(), protocolVersion)
+            reader = remote_execution._RemoteExecutionMessageReader(commandSocket, protocolVersion)
+            result = remote_execution._RemoteExecutionMessage(None, None)
+            self.assertTrue(result.from_json_bytes(reader.read_message()))
+
+        node._running = False
+        node._close_command_socket()
+        serveThread.join(5)
+        return result
+
+    def testLargeResultOverJsonConnection(self):
+        result = self.RunOverCommandConnection(remote_execution._PROTOCOL_VERSION, largeCommand, remote_execution.MODE_EVAL_STATEMENT)
+        self.assertEqual(result.type_, remote_execution._TYPE_COMMAND_RESULT)
+        self.assertTrue(result.data["success"])
+        self.assertEqual(len(result.data["result"]), largeResultSize)
+
+    def testLargeResultOverFramedConnection(self):
+        result = self.RunOverCommandConnection(remote_execution._PROTOCOL_VERSION_FRAMED, largeCommand, remote_execution.MODE_EVAL_STATEMENT)
+        self.assertTrue(result.data["success"])
+        self.assertEqual(len(result.data["result"]), largeResultSize)
+
+    def testFailedCommandReportsTraceback(self):
+        result = self.RunOverCommandConnection(remote_execution._PROTOCOL_VERSION_FRAMED, "raise ValueError('nope')", remote_execution.MODE_EXEC_FILE)
+        self.assertFalse(result.data["success"])
+        self.assertIn("ValueError: nope", result.data["result"])
+
+    def testDiscoveryAndCommands(self):
+        # needs multicast on the loopback adapter, which containers and some ci machines do not have
+        config = remote_execution.RemoteExecutionConfig()
+        config.multicast_group_endpoint = ("239.0.0.1", 6767)
+        config.command_endpoint = ("127.0.0.1", 6777)
+        node = remote_execution.RemoteExecutionLoopbackNode(config)
+        session = remote_execution.RemoteExecution(config)
+        node.start()
+        session.start()
+        try:
+            startTime = time.perf_counter()
+            while not any(remoteNode["node_id"] == node.node_id for remoteNode in session.remote_nodes):
+                if time.perf_counter() - startTime > 3:
+                    self.skipTest("multicast discovery is not available here")
+                time.sleep(0.05)
+
+            session.open_command_connection(node.node_id)
+            result = session.run_command(largeCommand, exec_mode=remote_execution.MODE_EVAL_STATEMENT)
+            self.assertEqual(len(result["result"]), largeResultSize)
+        finally:
+            session.stop()
+            node.stop()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+# Runs the worker pool and the parallel clip export against FakeExportWorker.py, no maya needed:
+#   python -m unittest discover tests
+
+pluginDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+benchmarksDir = os.path.join(pluginDir, "benchmarks")
+sys.path.append(benchmarksDir)
+
+import FakeMaya
+FakeMaya.Install()
+
+from WorkerPool import SplitIntoBatches, WorkerJob, WorkerPool
+
+fakeWorkerCommand = [sys.executable, os.path.join(benchmarksDir, "FakeExportWorker.py")]
+
+class WorkerPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.workDir = tempfile.mkdtemp(prefix="WorkerPoolTest_")
+        self.environ = dict(os.environ)
+        os.environ["FAKE_WORKER_SECONDS_PER_FRAME"] = "0.002"
+
+    def tearDown(self):
+        os.environ.clear()
+        os.environ.update(self.environ)
+        shutil.rmtree(self.workDir, ignore_errors=True)
+
+    def WriteJob(self, name, frameCounts):
+        jobPath = os.path.join(self.workDir, f"{name}.json")
+        clips = [{"subfix": f"_{name}_{i}", "frameMin": 1, "frameMax": frameCount, "path": os.path.join(self.workDir, f"{name}_{i}.fbx")}
+                 for i, frameCount in enumerate(frameCounts)]
+        with open(jobPath, 'w') as jobFile:
+            json.dump({"scene": "", "objects": ["root_jnt"], "clips": clips}, jobFile)
+
+        return WorkerJob(name, [jobPath])
+
+    def GetWorkerSpans(self):
+        spans = {}
+        def OnMessage(job, message):
+            if message.get("stage") in ("start", "end"):
+                spans.setdefault(job.name, {})[message["stage"]] = message["time"]
+
+        return spans, OnMessage
+
+    def testSplitIntoBatchesBalancesCost(self):
+        batches = SplitIntoBatches(["a", "b", "c", "d", "e"], [100, 60, 50, 40, 10], 2)
+        costs = {"a": 100, "b": 60, "c": 50, "d": 40, "e": 10}
+        self.assertEqual(len(batches), 2)
+        self.assertEqual(sorted(item for batch in batches for item in batch), ["a", "b", "c", "d", "e"])
+        self.assertEqual(sorted(sum(costs[item] for item in batch) for batch in batches), [120, 140])
+
+    def testSplitIntoBatchesNeverMakesEmptyBatches(self):
+        self.assertEqual(SplitIntoBatches(["a"], [5], 8), [["a"]])
+        self.assertEqual(SplitIntoBatches([], [], 4), [])
+
+    def testRunsEveryJobAndCollectsResults(self):
+        jobs = [self.WriteJob(f"job{i}", [10, 20]) for i in range(5)]
+        WorkerPool(fakeWorkerCommand, 2).Run(jobs)
+
+        for job in jobs:
+            self.assertTrue(job.Succeeded(), job.errors)
+            self.assertEqual([result["clip"] for result in job.results], [f"_{job.name}_0", f"_{job.name}_1"])
+            for result in job.results:
+                self.assertTrue(os.path.exists(result["path"]))
+
+    def testNeverRunsMoreWorkersThanAsked(self):
+        jobs = [self.WriteJob(f"job{i}", [50]) for i in range(6)]
+        pool = WorkerPool(fakeWorkerCommand, 2)
+        spans, pool.onMessage = self.GetWorkerSpans()
+        pool.Run(jobs)
+
+        self.assertEqual(len(spans), 6)
+        for span in spans.values():
+            overlapping = [other for other in spans.values() if other["start"] < span["end"] and span["start"] < other["end"]]
+            # the span itself plus at most one other worker
+            self.assertLessEqual(len(overlapping), 2)
+
+    def testRunsWorkersInParallel(self):
+        jobs = [self.WriteJob(f"job{i}", [100]) for i in range(4)]
+        startTime = time.perf_counter()
+        WorkerPool(fakeWorkerCommand, 1).Run(jobs)
+        serialSeconds = time.perf_counter() - startTime
+
+        jobs = [self.WriteJob(f"job{i}", [100]) for i in range(4)]
+        startTime = time.perf_counter()
+        WorkerPool(fakeWorkerCommand, 4).Run(jobs)
+        parallelSeconds = time.perf_counter() - startTime
+
+        self.assertLess(parallelSeconds, serialSeconds * 0.75)
+
+    def testFailedWorkerIsReported(self):
+        os.environ["FAKE_WORKER_FAIL_CLIP"] = "_bad_1"
+        good = self.WriteJob("good", [10])
+        bad = self.WriteJob("bad", [10, 10])
+        WorkerPool(fakeWorkerCommand, 2).Run([good, bad])
+
+        self.assertTrue(good.Succeeded())
+        self.assertFalse(bad.Succeeded())
+        self.assertEqual(bad.returnCode, 1)
+        self.assertEqual(len(bad.results), 1)
+        self.assertIn("_bad_1", bad.errors[0])
+
+    def testClosingStepsKillsWorkers(self):
+        os.environ["FAKE_WORKER_SECONDS_PER_FRAME"] = "0.1"
+        jobs = [self.WriteJob(f"job{i}", [100]) for i in range(2)]
+        steps = WorkerPool(fakeWorkerCommand, 2).RunSteps(jobs)
+        next(steps)
+        startTime = time.perf_counter()
+        steps.close()
+
+        self.assertLess(time.perf_counter() - startTime, 5)
+        self.assertTrue(all(not job.results for job in jobs))
+
+class ParallelClipExportTest(unittest.TestCase):
+    def setUp(self):
+        self.saveDir = tempfile.mkdtemp(prefix="ParallelClipExportTest_")
+        self.environ = dict(os.environ)
+        os.environ["FAKE_WORKER_SECONDS_PER_FRAME"] = "0.0005"
+
+    def tearDown(self):
+        os.environ.clear()
+        os.environ.update(self.environ)
+        shutil.rmtree(self.saveDir, ignore_errors=True)
+
+    def CreateMayaToUE(self, clipLengths):
+        import MayatoUE
+        scene = FakeMaya.NewScene()
+        scene.playbackRange = [1.0, float(sum(clipLengths))]
+        model, joints, skin = FakeMaya.BuildSkinnedMesh(scene, "body", 100, 4)
+
+        mayaToUE = MayatoUE.MayaToUE()
+        mayaToUE.rootJnt = joints[0]
+        mayaToUE.models = {model}
+        mayaToUE.fileName = "body"
+        mayaToUE.saveDir = self.saveDir
+        mayaToUE.useParallelExport = True
+        mayaToUE.exportWorkerCommand = fakeWorkerCommand
+        mayaToUE.exportWorkerCount = 3
+        mayaToUE.onExportWorkerMessage = lambda job, message: None
+        os.makedirs(os.path.join(self.saveDir, "animations"), exist_ok=True)
+
+        frameStart = 1
+        for i, clipLength in enumerate(clipLengths):
+            animClip = mayaToUE.AddNewAnimClip()
+            animClip.subfix = f"_clip{i}"
+            animClip.frameMin = float(frameStart)
+            animClip.frameMax = float(frameStart + clipLength - 1)
+            frameStart += clipLength
+
+        return mayaToUE
+
+    def testExportsEveryClipThroughTheWorkers(self):
+        mayaToUE = self.CreateMayaToUE([30, 120, 60, 10, 90])
+        steps = list(mayaToUE.ExportAnimClipsInWorkersSteps(mayaToUE.animations))
+
+        for animClip in mayaToUE.animations:
+            self.assertTrue(os.path.exists(mayaToUE.GetSavePathForAnimClip(animClip)), animClip.subfix)
+
+        self.assertEqual(steps[-1][1:], (5, 5))
+        stage = next(record for record in mayaToUE.report.stages if record["stage"].startswith("Bake Clips In"))
+        self.assertEqual(stage["stage"], "Bake Clips In 3 Workers")
+        self.assertEqual(stage["count"], 5)
+
+    def testWorkerFailureRaises(self):
+        os.environ["FAKE_WORKER_FAIL_CLIP"] = "_clip1"
+        mayaToUE = self.CreateMayaToUE([30, 120, 60])
+        with self.assertRaises(Exception) as context:
+            list(mayaToUE.ExportAnimClipsInWorkersSteps(mayaToUE.animations))
+
+        self.assertIn("_clip1", f"{context.exception}")
+
+if __name__ == "__main__":
+    unittest.main()